@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+
+from app.api.deps import get_current_user
+
+router = APIRouter(prefix="/api/bitmaps", tags=["bitmaps"])
+
+
+def _library(request: Request):
+    library = getattr(request.app.state, "bitmap_library", None)
+    if library is None:
+        raise HTTPException(status_code=503, detail="bitmap library unavailable")
+    return library
+
+
+@router.get("")
+async def list_bitmaps(request: Request, _: str = Depends(get_current_user)):
+    library = _library(request)
+    return {
+        "bitmaps": library.listing(),
+        "library": library.get_stats(),
+        "cache": library.loader.get_stats(),
+    }
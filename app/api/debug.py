@@ -1,3 +1,5 @@
+import asyncio
+
 from fastapi import APIRouter, Depends, HTTPException, Request
 
 from app.api.deps import get_current_user
@@ -122,10 +124,11 @@ async def status(request: Request, _: str = Depends(get_current_user)):
 
 @router.get("/preview")
 async def preview(request: Request, _: str = Depends(get_current_user)):
-    frame = _display(request).get_preview_frame()
+    service = _display(request)
+    frame = service.get_preview_frame()
     lit_pixels = sum(sum(1 for px in row if px) for row in frame)
-    colors = _display(request).get_preview_colors()
-    return {"width": 32, "height": 8, "lit_pixels": lit_pixels, "frame": frame, "colors": colors}
+    colors = service.get_preview_colors()
+    return {"width": service.width, "height": service.height, "lit_pixels": lit_pixels, "frame": frame, "colors": colors}
 
 
 @router.get("/mapping/coordinate")
@@ -171,7 +174,9 @@ async def clear_runtime_mapping(request: Request, _: str = Depends(get_current_u
 async def infer_runtime_mapping(payload: MappingInferenceRequest, request: Request, _: str = Depends(get_current_user)):
     mapper = _mapper(request)
     try:
-        result = mapper.infer_runtime_overrides(
+        # CPU-bound search; keeps the render loop and other requests running meanwhile.
+        result = await asyncio.to_thread(
+            mapper.infer_runtime_overrides,
             observations=[item.model_dump() for item in payload.observations],
             max_solutions=payload.max_solutions,
         )
@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
 
 from app.api.deps import get_current_user
-from app.schemas import BrightnessRequest, DrawRequest, ManualTextRequest
+from app.schemas import BrightnessRequest, DisplayLayoutRequest, DrawRequest, ManualTextRequest, NotificationRequest
+from app.services.display import MODULE_REGISTRY
+from app.services.zones import normalize_layout
 
 router = APIRouter(prefix="/api/display", tags=["display"])
 
@@ -28,9 +30,10 @@ async def show_text(payload: ManualTextRequest, request: Request, _: str = Depen
 
 @router.post("/draw")
 async def draw(payload: DrawRequest, request: Request, _: str = Depends(get_current_user)):
-    if len(payload.pixels) != 8 or any(len(row) != 32 for row in payload.pixels):
-        raise HTTPException(status_code=400, detail="pixels must be 8x32")
-    _display(request).set_manual_pixels(payload.pixels, payload.seconds)
+    service = _display(request)
+    if len(payload.pixels) != service.height or any(len(row) != service.width for row in payload.pixels):
+        raise HTTPException(status_code=400, detail=f"pixels must be {service.height}x{service.width}")
+    service.set_manual_pixels(payload.pixels, payload.seconds)
     return {"ok": True}
 
 
@@ -44,3 +47,31 @@ async def brightness(payload: BrightnessRequest, request: Request, _: str = Depe
 async def clear_manual_override(request: Request, _: str = Depends(get_current_user)):
     _display(request).clear_manual_override()
     return {"ok": True}
+
+
+@router.post("/notification")
+async def show_notification(payload: NotificationRequest, request: Request, _: str = Depends(get_current_user)):
+    _display(request).set_notification(payload.color, payload.seconds, payload.corner)
+    return {"ok": True}
+
+
+@router.delete("/notification")
+async def clear_notification(request: Request, _: str = Depends(get_current_user)):
+    _display(request).clear_notification()
+    return {"ok": True}
+
+
+@router.get("/layout")
+async def get_layout(request: Request, _: str = Depends(get_current_user)):
+    return {"zones": _display(request).zones.spec}
+
+
+@router.put("/layout")
+async def set_layout(payload: DisplayLayoutRequest, request: Request, _: str = Depends(get_current_user)):
+    service = _display(request)
+    try:
+        zones = normalize_layout(payload.zones, set(MODULE_REGISTRY), service.width, service.height)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    service.set_zone_layout(zones)
+    return {"zones": zones}
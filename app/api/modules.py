@@ -5,7 +5,10 @@ from app.api.deps import get_current_user
 from app.database import get_db
 from app.models import ModuleConfig
 from app.schemas import ModuleConfigResponse, ModuleConfigUpdate
+from app.services.expressions import MAX_EXPRESSION_LENGTH, ExpressionError, compile_expression
 from app.services.module_manager import list_modules
+from app.services.postprocess import normalize_effects
+from app.services.timeline import MAX_PRIORITY, MAX_WEIGHT, normalize_weekdays, parse_time_of_day
 
 router = APIRouter(prefix="/api/modules", tags=["modules"])
 
@@ -30,6 +33,7 @@ MODULE_SETTING_DEFAULTS = {
         "color_down": "#e63c3c",
         "color_flat": "#dcdc50",
         "color_fallback": "#9ca3af",
+        "show_icon": False,
         "transition_direction": "down",
         "transition_ms": 350,
     },
@@ -44,6 +48,7 @@ MODULE_SETTING_DEFAULTS = {
         "color_humidity": "#6ed2ff",
         "color_fallback": "#9ca3af",
         "screen_seconds": 4,
+        "show_icons": False,
         "transition_direction": "down",
         "transition_ms": 350,
     },
@@ -69,11 +74,58 @@ MODULE_SETTING_DEFAULTS = {
         "transition_direction": "down",
         "transition_ms": 0,
     },
+    "expression": {
+        "expression": "sin(x*0.3+t)+cos(y-t)",
+        "speed": 1.0,
+        "palette": "neon",
+        "intensity": 0.8,
+        "color_scale": 0.25,
+        "mirror_mode": "none",
+        "transition_direction": "down",
+        "transition_ms": 0,
+    },
+    "automata": {
+        "rule": "life",
+        "wolfram_rule": 30,
+        "world_width": 32,
+        "world_height": 8,
+        "density": 0.3,
+        "generations_per_second": 8,
+        "pan_speed": 0.0,
+        "palette": "neon",
+        "intensity": 0.8,
+        "transition_direction": "down",
+        "transition_ms": 0,
+    },
+    "bitmap": {
+        "file": "sample_gradient.ppm",
+        "scroll_direction": "top_to_bottom",
+        "scroll_speed": 2.0,
+        "color": "#f4f4f5",
+        "color_mode": "bitmap",
+        "fit_mode": "contain",
+        "playback_speed": 1.0,
+        "transition_direction": "down",
+        "transition_ms": 250,
+    },
+    "video": {
+        "file": "sample_waves.y4m",
+        "fit_mode": "cover",
+        "playback_speed": 1.0,
+        "loop": True,
+        "drop_frames": True,
+        "raw_width": 32,
+        "raw_height": 8,
+        "raw_fps": 25.0,
+        "transition_direction": "down",
+        "transition_ms": 250,
+    },
 }
 
 
 ALLOWED_FONT_SIZES = {"small", "normal"}
 ALLOWED_TRANSITIONS = {"down", "up"}
+ALLOWED_TRANSITION_EFFECTS = {"slide", "slide_left", "slide_right", "wipe", "crossfade", "dissolve"}
 ALLOWED_TEXT_MODES = {"static", "scroll"}
 ALLOWED_TEXTBOX_PRESETS = {"welcome", "status", "alert", "ticker"}
 ALLOWED_ANIMATION_PRESETS = {
@@ -84,9 +136,17 @@ ALLOWED_ANIMATION_PRESETS = {
     "matrix_rain",
     "lava_lamp",
     "pixel_snake",
+    "fireworks",
+    "snow",
+    "sparks",
+    "rain",
 }
 ALLOWED_ANIMATION_PALETTES = {"neon", "rainbow", "fire", "ocean", "matrix"}
 ALLOWED_MIRROR_MODES = {"none", "horizontal", "vertical", "quad"}
+ALLOWED_AUTOMATA_RULES = {"life", "brians_brain", "wolfram"}
+ALLOWED_BITMAP_SCROLL_DIRECTIONS = {"top_to_bottom", "bottom_to_top", "left_to_right", "right_to_left", "pan"}
+ALLOWED_BITMAP_COLOR_MODES = {"bitmap", "solid"}
+ALLOWED_BITMAP_FIT_MODES = {"contain", "cover", "stretch"}
 
 
 def _clamp_int(value: object, minimum: int, maximum: int, fallback: int) -> int:
@@ -151,6 +211,13 @@ def _normalize_allowed_string(value: object, allowed: set[str], fallback: str) -
     return fallback
 
 
+def _normalize_time_of_day(value: object) -> str:
+    seconds = parse_time_of_day(value)
+    if seconds is None:
+        return ""
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}"
+
+
 def sanitize_settings(module_key: str, settings: dict) -> dict:
     defaults = MODULE_SETTING_DEFAULTS.get(module_key, {})
     merged = {**defaults, **(settings or {})}
@@ -176,6 +243,7 @@ def sanitize_settings(module_key: str, settings: dict) -> dict:
         merged["color_down"] = _normalize_hex_color(merged.get("color_down"), defaults["color_down"])
         merged["color_flat"] = _normalize_hex_color(merged.get("color_flat"), defaults["color_flat"])
         merged["color_fallback"] = _normalize_hex_color(merged.get("color_fallback"), defaults["color_fallback"])
+        merged["show_icon"] = bool(merged.get("show_icon", defaults["show_icon"]))
         merged["transition_direction"] = _normalize_transition_direction(
             merged.get("transition_direction"), defaults["transition_direction"]
         )
@@ -192,6 +260,7 @@ def sanitize_settings(module_key: str, settings: dict) -> dict:
         merged["color_humidity"] = _normalize_hex_color(merged.get("color_humidity"), defaults["color_humidity"])
         merged["color_fallback"] = _normalize_hex_color(merged.get("color_fallback"), defaults["color_fallback"])
         merged["screen_seconds"] = _clamp_int(merged.get("screen_seconds"), 1, 60, defaults["screen_seconds"])
+        merged["show_icons"] = bool(merged.get("show_icons", defaults["show_icons"]))
         merged["transition_direction"] = _normalize_transition_direction(
             merged.get("transition_direction"), defaults["transition_direction"]
         )
@@ -229,6 +298,89 @@ def sanitize_settings(module_key: str, settings: dict) -> dict:
         )
         merged["transition_ms"] = _clamp_int(merged.get("transition_ms"), 0, 2000, defaults["transition_ms"])
 
+    elif module_key == "expression":
+        expression = str(merged.get("expression", "")).strip()[:MAX_EXPRESSION_LENGTH]
+        merged["expression"] = expression or defaults["expression"]
+        merged["speed"] = _clamp_float(merged.get("speed"), 0.1, 5.0, defaults["speed"])
+        merged["palette"] = _normalize_allowed_string(
+            merged.get("palette"), ALLOWED_ANIMATION_PALETTES, defaults["palette"]
+        )
+        merged["intensity"] = _clamp_float(merged.get("intensity"), 0.1, 1.0, defaults["intensity"])
+        merged["color_scale"] = _clamp_float(merged.get("color_scale"), 0.01, 4.0, defaults["color_scale"])
+        merged["mirror_mode"] = _normalize_allowed_string(
+            merged.get("mirror_mode"), ALLOWED_MIRROR_MODES, defaults["mirror_mode"]
+        )
+        merged["transition_direction"] = _normalize_transition_direction(
+            merged.get("transition_direction"), defaults["transition_direction"]
+        )
+        merged["transition_ms"] = _clamp_int(merged.get("transition_ms"), 0, 2000, defaults["transition_ms"])
+
+    elif module_key == "automata":
+        merged["rule"] = _normalize_allowed_string(merged.get("rule"), ALLOWED_AUTOMATA_RULES, defaults["rule"])
+        merged["wolfram_rule"] = _clamp_int(merged.get("wolfram_rule"), 0, 255, defaults["wolfram_rule"])
+        merged["world_width"] = _clamp_int(merged.get("world_width"), 32, 256, defaults["world_width"])
+        merged["world_height"] = _clamp_int(merged.get("world_height"), 8, 64, defaults["world_height"])
+        merged["density"] = _clamp_float(merged.get("density"), 0.05, 0.8, defaults["density"])
+        merged["generations_per_second"] = _clamp_float(
+            merged.get("generations_per_second"), 1.0, 30.0, defaults["generations_per_second"]
+        )
+        merged["pan_speed"] = _clamp_float(merged.get("pan_speed"), -10.0, 10.0, defaults["pan_speed"])
+        merged["palette"] = _normalize_allowed_string(
+            merged.get("palette"), ALLOWED_ANIMATION_PALETTES, defaults["palette"]
+        )
+        merged["intensity"] = _clamp_float(merged.get("intensity"), 0.1, 1.0, defaults["intensity"])
+        merged["transition_direction"] = _normalize_transition_direction(
+            merged.get("transition_direction"), defaults["transition_direction"]
+        )
+        merged["transition_ms"] = _clamp_int(merged.get("transition_ms"), 0, 2000, defaults["transition_ms"])
+
+    elif module_key == "bitmap":
+        merged["file"] = str(merged.get("file") or defaults["file"]).strip() or defaults["file"]
+        merged["scroll_direction"] = _normalize_allowed_string(
+            merged.get("scroll_direction"), ALLOWED_BITMAP_SCROLL_DIRECTIONS, defaults["scroll_direction"]
+        )
+        merged["scroll_speed"] = _clamp_float(merged.get("scroll_speed"), 0.25, 20.0, defaults["scroll_speed"])
+        merged["color"] = _normalize_hex_color(merged.get("color"), defaults["color"])
+        merged["color_mode"] = _normalize_allowed_string(
+            merged.get("color_mode"), ALLOWED_BITMAP_COLOR_MODES, defaults["color_mode"]
+        )
+        merged["fit_mode"] = _normalize_allowed_string(
+            merged.get("fit_mode"), ALLOWED_BITMAP_FIT_MODES, defaults["fit_mode"]
+        )
+        merged["playback_speed"] = _clamp_float(merged.get("playback_speed"), 0.25, 4.0, defaults["playback_speed"])
+        merged["transition_direction"] = _normalize_transition_direction(
+            merged.get("transition_direction"), defaults["transition_direction"]
+        )
+        merged["transition_ms"] = _clamp_int(merged.get("transition_ms"), 0, 2000, defaults["transition_ms"])
+
+    elif module_key == "video":
+        merged["file"] = str(merged.get("file") or defaults["file"]).strip() or defaults["file"]
+        merged["fit_mode"] = _normalize_allowed_string(
+            merged.get("fit_mode"), ALLOWED_BITMAP_FIT_MODES, defaults["fit_mode"]
+        )
+        merged["playback_speed"] = _clamp_float(merged.get("playback_speed"), 0.25, 4.0, defaults["playback_speed"])
+        merged["loop"] = bool(merged.get("loop", defaults["loop"]))
+        merged["drop_frames"] = bool(merged.get("drop_frames", defaults["drop_frames"]))
+        merged["raw_width"] = _clamp_int(merged.get("raw_width"), 1, 1920, defaults["raw_width"])
+        merged["raw_height"] = _clamp_int(merged.get("raw_height"), 1, 1080, defaults["raw_height"])
+        merged["raw_fps"] = _clamp_float(merged.get("raw_fps"), 1.0, 60.0, defaults["raw_fps"])
+        merged["transition_direction"] = _normalize_transition_direction(
+            merged.get("transition_direction"), defaults["transition_direction"]
+        )
+        merged["transition_ms"] = _clamp_int(merged.get("transition_ms"), 0, 2000, defaults["transition_ms"])
+
+    merged["effects"] = normalize_effects(merged.get("effects"))
+    merged["schedule_start"] = _normalize_time_of_day(merged.get("schedule_start"))
+    merged["schedule_end"] = _normalize_time_of_day(merged.get("schedule_end"))
+    merged["schedule_weekdays"] = normalize_weekdays(merged.get("schedule_weekdays"))
+    merged["weight"] = _clamp_int(merged.get("weight"), 1, MAX_WEIGHT, 1)
+    merged["priority"] = _clamp_int(merged.get("priority"), 0, MAX_PRIORITY, 0)
+
+    if "transition_ms" in defaults:
+        merged["transition_effect"] = _normalize_allowed_string(
+            merged.get("transition_effect"), ALLOWED_TRANSITION_EFFECTS, "slide"
+        )
+
     return merged
 
 
@@ -251,7 +403,13 @@ async def update_module(
     module.enabled = payload.enabled
     module.duration_seconds = payload.duration_seconds
     module.sort_order = payload.sort_order
-    module.settings = sanitize_settings(module.key, payload.settings)
+    settings = sanitize_settings(module.key, payload.settings)
+    if module.key == "expression":
+        try:
+            compile_expression(settings["expression"])
+        except ExpressionError as exc:
+            raise HTTPException(status_code=422, detail=f"invalid expression: {exc}") from exc
+    module.settings = settings
 
     await db.commit()
     await db.refresh(module)
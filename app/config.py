@@ -34,10 +34,15 @@ class Settings(BaseSettings):
     led_serial_write_timeout: float = 0.1
     led_serial_ack_timeout: float = 0.05
     led_serial_startup_delay: float = 2.0
+    led_record_file: str = "frames.pdrec"
 
     panel_rows: int = 8
     panel_columns: int = 32
     chain_panels: int = 4
+    # Panels stacked vertically; chain_panels / panel_grid_rows panels per row.
+    panel_grid_rows: int = 1
+    # Chain runs back along every second panel row (snake through the grid).
+    panel_grid_serpentine: bool = True
     panel_width: int = 8
     panel_height: int = 8
     data_starts_right: bool = True
@@ -46,6 +51,7 @@ class Settings(BaseSettings):
     panel_order: list[int] = Field(default_factory=lambda: [0, 1, 2, 3])
     panel_rotations: list[int] = Field(default_factory=lambda: [0, 0, 0, 0])
     mapping_state_file: str = "mapping_state.json"
+    display_layout_file: str = "display_layout.json"
 
     btc_api_url: str = "https://api.coingecko.com/api/v3/simple/price"
     btc_block_height_api_url: str = "https://blockstream.info/api/blocks/tip/height"
@@ -62,6 +68,14 @@ class Settings(BaseSettings):
     poll_btc_seconds: int = Field(default=60, ge=15)
     poll_weather_seconds: int = Field(default=300, ge=60)
     render_fps: int = Field(default=20, ge=1)
+    render_frame_cache_kb: int = Field(default=512, ge=0)
+    render_module_budget_ms: float = Field(default=0.0, ge=0.0)
+    bitmap_cache_kb: int = Field(default=4096, ge=0)
+    bitmap_scan_seconds: float = Field(default=10.0, gt=0.0)
+    overlay_status_dots: bool = False
+    render_clock: str = "real"
+    render_clock_start: float = 0.0
+    render_clock_factor: float = Field(default=1.0, gt=0.0)
 
 
     @field_validator("led_transport", mode="before")
@@ -70,11 +84,22 @@ class Settings(BaseSettings):
         if value is None:
             return "auto"
         normalized = str(value).strip().lower()
-        allowed = {"auto", "rpi", "serial"}
+        allowed = {"auto", "rpi", "serial", "record"}
         if normalized not in allowed:
             raise ValueError(f"led_transport must be one of: {', '.join(sorted(allowed))}")
         return normalized
 
+    @field_validator("render_clock", mode="before")
+    @classmethod
+    def validate_render_clock(cls, value):
+        if value is None:
+            return "real"
+        normalized = str(value).strip().lower()
+        allowed = {"real", "fixed", "accelerated"}
+        if normalized not in allowed:
+            raise ValueError(f"render_clock must be one of: {', '.join(sorted(allowed))}")
+        return normalized
+
     @field_validator("panel_order", mode="before")
     @classmethod
     def parse_panel_order(cls, value):
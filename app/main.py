@@ -5,14 +5,16 @@ from fastapi import FastAPI
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 
-from app.api import auth, debug, display, modules
+from app.api import auth, bitmaps, debug, display, modules
 from app.config import get_settings
 from app.database import SessionLocal, Base, engine
 from app.services.display import DisplayService
 from app.services.external_data import ExternalDataService
+from app.services.frame_clock import make_clock
 from app.services.led_driver import LEDDriver
 from app.services.led_mapper import LEDMapper
 from app.services.module_manager import ensure_default_modules
+from app.services.bitmap_library import BitmapLibrary
 from app.services.bitmap_loader import BitmapLoader
 
 settings = get_settings()
@@ -31,24 +33,39 @@ async def lifespan(app: FastAPI):
     mapper = LEDMapper(settings)
     bitmap_dir = Path(__file__).parent / "bitmaps"
     bitmap_dir.mkdir(parents=True, exist_ok=True)
+    bitmap_library = BitmapLibrary(
+        BitmapLoader(bitmap_dir, cache_bytes=settings.bitmap_cache_kb * 1024),
+        scan_interval_s=settings.bitmap_scan_seconds,
+    )
     display_service = DisplayService(
         session_factory=SessionLocal,
         led_driver=led_driver,
         mapper=mapper,
         cache_provider=lambda: ext_service.cache,
         fps=settings.render_fps,
-        bitmap_loader=BitmapLoader(bitmap_dir),
+        bitmap_loader=bitmap_library.loader,
+        bitmap_library=bitmap_library,
+        frame_cache_bytes=settings.render_frame_cache_kb * 1024,
+        render_budget_ms=settings.render_module_budget_ms,
+        overlay_status_dots=settings.overlay_status_dots,
+        layout_file=settings.display_layout_file,
+        clock=make_clock(settings.render_clock, settings.render_clock_start, settings.render_clock_factor),
+        width=mapper.width,
+        height=mapper.height,
     )
 
     app.state.external_data_service = ext_service
     app.state.display_service = display_service
+    app.state.bitmap_library = bitmap_library
 
     await ext_service.start()
+    await bitmap_library.start()
     await display_service.start()
 
     yield
 
     await display_service.stop()
+    await bitmap_library.stop()
     await ext_service.stop()
 
 
@@ -57,6 +74,7 @@ app.include_router(auth.router)
 app.include_router(modules.router)
 app.include_router(display.router)
 app.include_router(debug.router)
+app.include_router(bitmaps.router)
 
 static_dir = Path(__file__).parent / "static"
 app.mount("/static", StaticFiles(directory=static_dir), name="static")
@@ -1,7 +1,10 @@
 import math
-import time
+import zlib
 
-from app.modules.base import ModuleBase, ModulePayload
+from app.modules.base import ModuleBase, ModulePayload, frame_time
+from app.services import bitplane, particles, vector_animations
+from app.services.colors import lut_lookup, palette_lut, scale_color, scaled_palette
+from app.services.frame_cache import PeriodicSpec
 
 WIDTH = 32
 HEIGHT = 8
@@ -14,6 +17,10 @@ PRESETS = {
     "matrix_rain",
     "lava_lamp",
     "pixel_snake",
+    "fireworks",
+    "snow",
+    "sparks",
+    "rain",
 }
 
 PALETTES: dict[str, list[tuple[int, int, int]]] = {
@@ -24,6 +31,21 @@ PALETTES: dict[str, list[tuple[int, int, int]]] = {
     "matrix": [(0, 40, 0), (0, 150, 35), (70, 255, 100), (210, 255, 210)],
 }
 
+# Presets that repeat exactly after ``period`` animation-time units; ``step`` is the
+# smallest interval in which their output can change.
+PERIODIC_PRESETS: dict[str, PeriodicSpec] = {
+    "bit_invaders": PeriodicSpec(period=WIDTH / 6, step=1 / 6),
+    "pixel_snake": PeriodicSpec(period=WIDTH * HEIGHT / 10, step=0.1),
+}
+
+# Cheaper look-alike presets used when the render budget degrades a heavy preset.
+CHEAP_VARIANTS: dict[str, str] = {
+    "psychedelic_plasma": "neon_equalizer",
+    "lava_lamp": "neon_equalizer",
+    "retro_rainbow_tunnel": "matrix_rain",
+    "neon_equalizer": "matrix_rain",
+}
+
 ALIEN = [
     "01100110",
     "11111111",
@@ -36,8 +58,7 @@ ALIEN = [
 ]
 
 
-def _clamp(value: float, minimum: int = 0, maximum: int = 255) -> int:
-    return max(minimum, min(maximum, int(round(value))))
+SNAKE_PATH = vector_animations.snake_path(WIDTH, HEIGHT)
 
 
 def _blank() -> tuple[list[list[int]], list[list[tuple[int, int, int] | None]]]:
@@ -48,25 +69,71 @@ def _palette(name: object) -> list[tuple[int, int, int]]:
     return PALETTES.get(str(name).strip().lower(), PALETTES["neon"])
 
 
-def _mix(a: tuple[int, int, int], b: tuple[int, int, int], amount: float) -> tuple[int, int, int]:
-    amount = max(0.0, min(1.0, amount))
-    return tuple(_clamp(a[i] + (b[i] - a[i]) * amount) for i in range(3))
-
+def mirror_frame(frame, color_frame, mode: str):
+    """Mirror on bitplanes: the lit mask via bit reversal / row OR, colors per lit source row.
 
-def _palette_color(colors: list[tuple[int, int, int]], value: float) -> tuple[int, int, int]:
-    value %= 1.0
-    scaled = value * len(colors)
-    idx = int(scaled) % len(colors)
-    return _mix(colors[idx], colors[(idx + 1) % len(colors)], scaled - int(scaled))
-
-
-def _scale(color: tuple[int, int, int], intensity: float) -> tuple[int, int, int]:
-    return tuple(_clamp(channel * intensity) for channel in color)
+    When several sources land on the same pixel, the one that comes last in
+    row-major order wins (same as the NumPy ``vector_animations.mirror``).
+    """
+    if mode == "none":
+        return frame, color_frame
+    rows = list(bitplane.pack(frame))
+    colors = list(color_frame)
+    horizontal = mode in {"horizontal", "quad"}
+    if horizontal:
+        half = WIDTH // 2
+        for y, bits in enumerate(rows):
+            if not bits:
+                colors[y] = [None] * WIDTH
+                continue
+            own = colors[y]
+            rows[y] = bits | bitplane.reverse_bits(bits, WIDTH)
+            if bits.bit_count() <= 8:
+                # Sparse row: write each lit source to both targets in column order, later wins.
+                row = [None] * WIDTH
+                for x, _ in bitplane.lit((bits,)):
+                    row[x] = row[WIDTH - 1 - x] = own[x]
+                colors[y] = row
+                continue
+            own_lit = bitplane.row_bits(bits, WIDTH)
+            flip_lit = own_lit[::-1]
+            flip = own[::-1]
+            # Right-half columns are visited after their mirror image, so they win when lit.
+            colors[y] = [
+                f if fl else (o if ol else None)
+                for o, f, ol, fl in zip(own[:half], flip[:half], own_lit[:half], flip_lit[:half])
+            ] + [
+                o if ol else (f if fl else None)
+                for o, f, ol, fl in zip(own[half:], flip[half:], own_lit[half:], flip_lit[half:])
+            ]
+    if mode in {"vertical", "quad"}:
+        for top in range(HEIGHT // 2):
+            bottom = HEIGHT - 1 - top
+            top_lit = bitplane.row_bits(rows[top], WIDTH)
+            bottom_lit = bitplane.row_bits(rows[bottom], WIDTH)
+            merged = [
+                b if bl else (t if tl else None)
+                for t, b, tl, bl in zip(colors[top], colors[bottom], top_lit, bottom_lit)
+            ]
+            colors[top], colors[bottom] = merged, merged[:]
+            rows[top] = rows[bottom] = rows[top] | rows[bottom]
+        if HEIGHT % 2 and not horizontal:
+            middle = HEIGHT // 2
+            colors[middle] = bitplane.masked_colors(colors[middle], rows[middle], WIDTH)
+    return bitplane.unpack(tuple(rows), WIDTH), colors
 
 
 class AnimationsModule(ModuleBase):
     key = "animations"
 
+    def __init__(self):
+        self._vector = vector_animations.VectorPresetRenderer(WIDTH, HEIGHT, ALIEN) if vector_animations.HAS_NUMPY else None
+        self._particles: dict[tuple[str, str], particles.ParticleSimulation] = {}
+
+    @property
+    def backend(self) -> str:
+        return "numpy" if self._vector is not None else "python"
+
     async def render(self, settings: dict, cache: dict) -> ModulePayload:
         preset = str(settings.get("preset", "psychedelic_plasma")).strip().lower()
         if preset not in PRESETS:
@@ -76,45 +143,76 @@ class AnimationsModule(ModuleBase):
         mirror_mode = str(settings.get("mirror_mode", "none")).strip().lower()
         if mirror_mode not in {"none", "horizontal", "vertical", "quad"}:
             mirror_mode = "none"
-        colors = _palette(settings.get("palette", "neon"))
-        t = time.monotonic() * speed
+        palette_name = str(settings.get("palette", "neon")).strip().lower()
+        colors = _palette(palette_name)
+        t = frame_time(cache) * speed
 
+        spec = PERIODIC_PRESETS.get(preset)
+        if spec is not None and self.frame_cache is not None:
+            cached = self.frame_cache.lookup(
+                (self.key, preset, palette_name, speed, intensity, mirror_mode),
+                spec,
+                t,
+                lambda cycle_t: self.render_frame(preset, cycle_t, colors, intensity, mirror_mode, {}),
+                speed=speed,
+            )
+            if cached is not None:
+                return ModulePayload(text="", frame=cached[0], color_frame=cached[1])
+
+        frame, color_frame = self.render_frame(preset, t, colors, intensity, mirror_mode, cache)
+        return ModulePayload(text="", frame=frame, color_frame=color_frame)
+
+    def cheaper_settings(self, settings: dict) -> dict | None:
+        preset = str(settings.get("preset", "psychedelic_plasma")).strip().lower()
+        cheaper = CHEAP_VARIANTS.get(preset if preset in PRESETS else "psychedelic_plasma")
+        if cheaper is None:
+            return None
+        return {**settings, "preset": cheaper, "mirror_mode": "none"}
+
+    def render_frame(self, preset: str, t: float, colors, intensity: float, mirror_mode: str, cache: dict, backend: str | None = None):
+        if preset in particles.EFFECTS:
+            return self._render_particles(preset, t, colors, intensity, mirror_mode, backend or self.backend)
+        if (backend or self.backend) == "numpy" and self._vector is not None:
+            mask, rgb = self._vector.render(preset, t, colors, intensity)
+            mask, rgb = self._vector.mirror(mask, rgb, mirror_mode)
+            return vector_animations.to_frames(mask, rgb)
         renderer = getattr(self, f"_{preset}")
         frame, color_frame = renderer(t, colors, intensity, cache)
-        frame, color_frame = self._mirror(frame, color_frame, mirror_mode)
-        return ModulePayload(text="", frame=frame, color_frame=color_frame)
+        return self._mirror(frame, color_frame, mirror_mode)
+
+    def _render_particles(self, preset: str, t: float, colors, intensity: float, mirror_mode: str, backend: str):
+        vectorized = backend == "numpy" and particles.HAS_NUMPY
+        key = (preset, "numpy" if vectorized else "python")
+        simulation = self._particles.get(key)
+        # A fixed seed and a restart when the frame time goes backwards keep replays reproducible.
+        if simulation is None or (simulation.last_t is not None and t < simulation.last_t):
+            seed = zlib.crc32(preset.encode())
+            simulation = self._particles[key] = particles.ParticleSimulation(preset, WIDTH, HEIGHT, vectorized=vectorized, seed=seed)
+        if vectorized:
+            mask, rgb = simulation.render(t, vector_animations.palette_lut_array(colors, intensity))
+            return vector_animations.to_frames(*vector_animations.mirror(mask, rgb, mirror_mode))
+        frame, color_frame = simulation.render(t, palette_lut(colors, intensity))
+        return mirror_frame(frame, color_frame, mirror_mode)
+
+    def particle_stats(self) -> list[dict]:
+        return [simulation.get_stats() for simulation in self._particles.values()]
 
     def _mirror(self, frame, color_frame, mode: str):
-        if mode == "none":
-            return frame, color_frame
-        out, out_colors = _blank()
-        for y in range(HEIGHT):
-            for x in range(WIDTH):
-                if not frame[y][x]:
-                    continue
-                targets = {(x, y)}
-                if mode in {"horizontal", "quad"}:
-                    targets.add((WIDTH - 1 - x, y))
-                if mode in {"vertical", "quad"}:
-                    targets.add((x, HEIGHT - 1 - y))
-                if mode == "quad":
-                    targets.add((WIDTH - 1 - x, HEIGHT - 1 - y))
-                for tx, ty in targets:
-                    out[ty][tx] = 1
-                    out_colors[ty][tx] = color_frame[y][x]
-        return out, out_colors
+        return mirror_frame(frame, color_frame, mode)
 
     def _psychedelic_plasma(self, t, colors, intensity, cache):
         frame, color_frame = _blank()
+        lut = palette_lut(colors, intensity)
         for y in range(HEIGHT):
             for x in range(WIDTH):
                 v = math.sin(x * 0.34 + t) + math.cos(y * 0.95 - t * 1.2) + math.sin((x + y) * 0.22 + t * 0.7)
-                color_frame[y][x] = _scale(_palette_color(colors, (v + 3.0) / 6.0), intensity)
+                color_frame[y][x] = lut_lookup(lut, (v + 3.0) / 6.0)
                 frame[y][x] = 1
         return frame, color_frame
 
     def _retro_rainbow_tunnel(self, t, colors, intensity, cache):
         frame, color_frame = _blank()
+        lut = palette_lut(colors, intensity)
         cx, cy = (WIDTH - 1) / 2, (HEIGHT - 1) / 2
         for y in range(HEIGHT):
             for x in range(WIDTH):
@@ -123,46 +221,50 @@ class AnimationsModule(ModuleBase):
                 pulse = (math.sin(dist * 4.2 - t * 3.0) + 1) / 2
                 if pulse > 0.18:
                     frame[y][x] = 1
-                    color_frame[y][x] = _scale(_palette_color(colors, dist * 0.18 - t * 0.08), intensity * (0.45 + pulse * 0.55))
+                    color_frame[y][x] = scale_color(lut_lookup(lut, dist * 0.18 - t * 0.08), 0.45 + pulse * 0.55)
         return frame, color_frame
 
     def _bit_invaders(self, t, colors, intensity, cache):
         frame, color_frame = _blank()
         offset = int(t * 6) % WIDTH - 7
-        bob = int(math.sin(t * 2.0) > 0)
+        bob = int(t * 0.75) % 2
+        scaled = scaled_palette(colors, intensity)
         for base_x in (offset - 16, offset, offset + 16):
             for y, row in enumerate(ALIEN):
                 for x, pixel in enumerate(row):
                     sx, sy = base_x + x, y + bob
                     if pixel == "1" and 0 <= sx < WIDTH and 0 <= sy < HEIGHT:
                         frame[sy][sx] = 1
-                        color_frame[sy][sx] = _scale(colors[(x + y) % len(colors)], intensity)
+                        color_frame[sy][sx] = scaled[(x + y) % len(scaled)]
         return frame, color_frame
 
     def _neon_equalizer(self, t, colors, intensity, cache):
         frame, color_frame = _blank()
+        lut = palette_lut(colors, intensity)
         for x in range(WIDTH):
             wave = math.sin(t * 2.5 + x * 0.55) + math.sin(t * 1.3 + x * 1.1) * 0.6
             height = max(1, min(HEIGHT, int((wave + 1.6) / 3.2 * HEIGHT)))
             for y in range(HEIGHT - height, HEIGHT):
                 level = (HEIGHT - y) / HEIGHT
                 frame[y][x] = 1
-                color_frame[y][x] = _scale(_palette_color(colors, x / WIDTH + level * 0.2), intensity * (0.45 + level))
+                color_frame[y][x] = scale_color(lut_lookup(lut, x / WIDTH + level * 0.2), 0.45 + level)
         return frame, color_frame
 
     def _matrix_rain(self, t, colors, intensity, cache):
         frame, color_frame = _blank()
+        scaled = scaled_palette(colors, intensity)
         for x in range(WIDTH):
             head = int((t * (1.5 + (x % 5) * 0.28) + x * 3) % (HEIGHT + 8)) - 4
             for trail in range(5):
                 y = head - trail
                 if 0 <= y < HEIGHT:
                     frame[y][x] = 1
-                    color_frame[y][x] = _scale(colors[min(len(colors) - 1, 3 - min(trail, 3))], intensity * (1 - trail * 0.16))
+                    color_frame[y][x] = scale_color(scaled[min(len(scaled) - 1, 3 - min(trail, 3))], 1 - trail * 0.16)
         return frame, color_frame
 
     def _lava_lamp(self, t, colors, intensity, cache):
         frame, color_frame = _blank()
+        lut = palette_lut(colors, intensity)
         blobs = [
             (8 + math.sin(t * 0.55) * 6, 3.5 + math.cos(t * 0.8) * 2.2),
             (19 + math.cos(t * 0.42) * 7, 3.5 + math.sin(t * 0.65) * 2.0),
@@ -173,15 +275,16 @@ class AnimationsModule(ModuleBase):
                 energy = sum(6.0 / (((x - bx) / 2.8) ** 2 + (y - by) ** 2 + 1.0) for bx, by in blobs)
                 if energy > 0.55:
                     frame[y][x] = 1
-                    color_frame[y][x] = _scale(_palette_color(colors, energy * 0.13 + t * 0.03), intensity * min(1.0, energy / 2.2))
+                    color_frame[y][x] = scale_color(lut_lookup(lut, energy * 0.13 + t * 0.03), min(1.0, energy / 2.2))
         return frame, color_frame
 
     def _pixel_snake(self, t, colors, intensity, cache):
         frame, color_frame = _blank()
-        path = [(x, 0) for x in range(WIDTH)] + [(WIDTH - 1 - x, 1) for x in range(WIDTH)] + [(x, 2) for x in range(WIDTH)] + [(WIDTH - 1 - x, 3) for x in range(WIDTH)] + [(x, 4) for x in range(WIDTH)] + [(WIDTH - 1 - x, 5) for x in range(WIDTH)] + [(x, 6) for x in range(WIDTH)] + [(WIDTH - 1 - x, 7) for x in range(WIDTH)]
+        path = SNAKE_PATH
+        lut = palette_lut(colors, intensity)
         head = int(t * 10) % len(path)
         for trail in range(28):
             x, y = path[(head - trail) % len(path)]
             frame[y][x] = 1
-            color_frame[y][x] = _scale(_palette_color(colors, (trail / 28) + t * 0.05), intensity * (1 - trail / 34))
+            color_frame[y][x] = scale_color(lut_lookup(lut, (trail / 28) + t * 10 / len(path)), 1 - trail / 34)
         return frame, color_frame
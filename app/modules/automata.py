@@ -0,0 +1,85 @@
+import zlib
+
+from app.modules.animations import HEIGHT, WIDTH, _blank, _palette
+from app.modules.base import ModuleBase, ModulePayload, frame_time
+from app.services.automata import AGE_LEVELS, RULES, BitboardAutomaton
+from app.services.colors import lut_lookup, palette_lut, scale_color
+
+
+class AutomataModule(ModuleBase):
+    """Game of Life, Brian's Brain or a 1D Wolfram rule on a bit-packed toroidal world.
+
+    The world can be larger than the display; ``pan_speed`` scrolls the 32x8
+    window across it. Generations advance at ``generations_per_second``
+    independent of the display FPS.
+    """
+
+    key = "automata"
+
+    def __init__(self):
+        self._world: BitboardAutomaton | None = None
+        self._world_key: tuple | None = None
+        self._last_step: float | None = None
+        self._age_colors: dict[tuple, list[tuple[int, int, int]]] = {}
+        self._frame_key: tuple | None = None
+        self._frame: tuple | None = None
+
+    def _age_palette(self, palette_name: str, intensity: float) -> list[tuple[int, int, int]]:
+        key = (palette_name, intensity)
+        colors = self._age_colors.get(key)
+        if colors is None:
+            lut = palette_lut(_palette(palette_name), intensity)
+            # Newborn cells start at the palette's first color and walk it as they age.
+            colors = self._age_colors[key] = [lut_lookup(lut, age / AGE_LEVELS) for age in range(AGE_LEVELS)]
+        return colors
+
+    async def render(self, settings: dict, cache: dict) -> ModulePayload:
+        rule = str(settings.get("rule", "life")).strip().lower()
+        if rule not in RULES:
+            rule = "life"
+        wolfram_rule = max(0, min(255, int(settings.get("wolfram_rule", 30))))
+        world_width = max(WIDTH, min(256, int(settings.get("world_width", WIDTH))))
+        world_height = max(HEIGHT, min(64, int(settings.get("world_height", HEIGHT))))
+        density = max(0.05, min(0.8, float(settings.get("density", 0.3))))
+        rate = max(1.0, min(30.0, float(settings.get("generations_per_second", 8))))
+        pan_speed = max(-10.0, min(10.0, float(settings.get("pan_speed", 0.0))))
+        intensity = max(0.1, min(1.0, float(settings.get("intensity", 0.8))))
+        palette_name = str(settings.get("palette", "neon")).strip().lower()
+
+        world_key = (rule, wolfram_rule, world_width, world_height, density)
+        now = frame_time(cache)
+        # Frame time going backwards (replay, offline render) restarts the world so the same times give the same frames.
+        if self._world is None or self._world_key != world_key or (self._last_step is not None and now < self._last_step):
+            seed = zlib.crc32(repr(world_key).encode())
+            self._world = BitboardAutomaton(rule, world_width, world_height, wolfram_rule, density, seed=seed)
+            self._world_key = world_key
+            self._last_step = None
+
+        if self._last_step is None:
+            self._last_step = now
+        steps = int((now - self._last_step) * rate)
+        if steps:
+            # A long pause (module not shown) must not trigger a burst of catch-up generations.
+            for _ in range(min(steps, 4)):
+                self._world.step()
+            self._last_step = now if steps > 4 else self._last_step + steps / rate
+
+        world = self._world
+        x0 = int(now * pan_speed) % world_width
+        # 1D rules keep their newest generation in the bottom world row.
+        y0 = world_height - HEIGHT if rule == "wolfram" else (world_height - HEIGHT) // 2
+        frame_key = (world.generation, world.reseeds, x0, y0, palette_name, intensity)
+        if frame_key != self._frame_key:
+            # Most display ticks fall between generations; only rebuild when something moved.
+            ages = self._age_palette(palette_name, intensity)
+            frame, color_frame = _blank()
+            for y, x, age, dying in world.window(x0, y0, WIDTH, HEIGHT):
+                frame[y][x] = 1
+                color_frame[y][x] = scale_color(ages[-1], 0.3) if dying else ages[age]
+            self._frame_key = frame_key
+            self._frame = (frame, color_frame)
+        frame, color_frame = self._frame
+        return ModulePayload(text="", frame=frame, color_frame=color_frame)
+
+    def get_stats(self) -> dict | None:
+        return self._world.get_stats() if self._world is not None else None
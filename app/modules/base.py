@@ -1,9 +1,23 @@
+import time
 from dataclasses import dataclass, field
 
+from app.services.rendering import measure_text_width
+
 
 ColorFrame = list[list[tuple[int, int, int] | None]]
 
 
+@dataclass
+class SpriteRef:
+    """Atlas sprite drawn over the payload: ``name`` is ``"<atlas>:<sprite or animation>"``."""
+
+    name: str
+    x: int = 0
+    y: int = 0
+    # Recolors every lit sprite pixel; None keeps the atlas colors.
+    color: tuple[int, int, int] | None = None
+
+
 @dataclass
 class ModulePayload:
     text: str
@@ -15,10 +29,45 @@ class ModulePayload:
     default_color: tuple[int, int, int] = (80, 80, 80)
     char_colors: list[tuple[int, int, int]] = field(default_factory=list)
     char_spacing: int = 1
+    sprites: list[SpriteRef] = field(default_factory=list)
+
+
+def frame_time(cache: dict) -> float:
+    """Frame time of the current display tick (epoch seconds); wall clock outside the display loop."""
+    now = cache.get("now")
+    if isinstance(now, (int, float)):
+        return float(now)
+    return time.time()
+
+
+def zone_size(cache: dict) -> tuple[int, int] | None:
+    """Width and height of the zone being rendered; None when the module fills the whole canvas."""
+    size = cache.get("zone_size")
+    if isinstance(size, tuple) and len(size) == 2:
+        return size
+    return None
+
+
+def fit_text(candidates: list[str], font_size: str, char_spacing: int, width: int) -> tuple[str, str]:
+    """First of ``candidates`` (longest first) that fits ``width`` columns, trying the small font second.
+
+    Falls back to the last candidate in the small font, which the renderer clips.
+    """
+    for size in dict.fromkeys([font_size, "small"]):
+        for text in candidates:
+            if measure_text_width(text, size, char_spacing) <= width:
+                return text, size
+    return candidates[-1], "small"
 
 
 class ModuleBase:
     key: str = "base"
+    # Set by DisplayService; modules with periodic output may replay cached cycles from it.
+    frame_cache = None
 
     async def render(self, settings: dict, cache: dict) -> ModulePayload:
         raise NotImplementedError
+
+    def cheaper_settings(self, settings: dict) -> dict | None:
+        """Return settings for a cheaper render variant, or None if the module has none."""
+        return None
@@ -1,7 +1,11 @@
-from app.modules.base import ModuleBase, ModulePayload
+from app.modules.base import ModuleBase, ModulePayload, SpriteRef, fit_text, frame_time, zone_size
 from app.services.colors import clamp, parse_hex_color
 
 
+# Icon width plus one column gap; with ``show_icon`` the atlas icon replaces the leading "B"/"H".
+ICON_ADVANCE = 6
+
+
 class BTCModule(ModuleBase):
     key = "btc"
 
@@ -16,6 +20,7 @@ class BTCModule(ModuleBase):
         char_spacing = clamp(int(settings.get("char_spacing", 1)), 0, 4)
 
         show_block_height = bool(settings.get("show_block_height", False))
+        show_icon = bool(settings.get("show_icon", False))
         screen_seconds = clamp(int(settings.get("screen_seconds", 4)), 1, 60)
 
         base_b_color = parse_hex_color(settings.get("color_b"), (255, 140, 0))
@@ -24,39 +29,50 @@ class BTCModule(ModuleBase):
         flat_color = parse_hex_color(settings.get("color_flat"), (220, 220, 80))
         fallback_color = parse_hex_color(settings.get("color_fallback"), (120, 120, 120))
 
+        size = zone_size(cache)
+
+        def fit(candidates: list[str], with_icon: bool = False) -> tuple[str, str]:
+            """Shorter text / small font inside a narrow zone; unchanged on the full canvas."""
+            if size is None:
+                return candidates[0], font_size
+            width = size[0] - max(0, x_offset) - (ICON_ADVANCE if with_icon else 0)
+            return fit_text(candidates, font_size, char_spacing, width)
+
         show_block_screen = show_block_height and block_height is not None
         if show_block_screen:
-            now = cache.get("now")
-            if not isinstance(now, (int, float)):
-                import time
-
-                now = time.time()
+            now = frame_time(cache)
             screen_slot = int(now / screen_seconds) % 2
             if screen_slot == 1:
-                block_text = f"H{int(block_height)}"
+                if show_icon:
+                    block_text, block_font = fit([f"{int(block_height)}"], with_icon=True)
+                    return self._with_icon("icons:block", block_text, flat_color, base_b_color, block_font, x_offset, y_offset, char_spacing)
+                block_text, block_font = fit([f"H{int(block_height)}", f"{int(block_height)}"])
                 return ModulePayload(
                     text=block_text,
-                    font_size=font_size,
+                    font_size=block_font,
                     x_offset=x_offset,
                     y_offset=y_offset,
                     default_color=flat_color,
-                    char_colors=[base_b_color] + [flat_color] * max(0, len(block_text) - 1),
+                    char_colors=self._lead_colors(block_text, "H", base_b_color, flat_color),
                     char_spacing=char_spacing,
                 )
 
         if price is None:
+            if show_icon:
+                wait_text, wait_font = fit(["...k"], with_icon=True)
+                return self._with_icon("icons:hourglass", wait_text, fallback_color, None, wait_font, x_offset, y_offset, char_spacing)
+            wait_text, wait_font = fit(["B...k", "...k"])
             return ModulePayload(
-                text="B...k",
-                font_size=font_size,
+                text=wait_text,
+                font_size=wait_font,
                 x_offset=x_offset,
                 y_offset=y_offset,
                 default_color=fallback_color,
-                char_colors=[base_b_color] + [fallback_color] * 4,
+                char_colors=self._lead_colors(wait_text, "B", base_b_color, fallback_color),
                 char_spacing=char_spacing,
             )
 
         value_k = float(price) / 1000.0
-        text = f"B{value_k:.1f}k"
 
         if trend == "up":
             price_color = up_color
@@ -65,12 +81,50 @@ class BTCModule(ModuleBase):
         else:
             price_color = flat_color
 
+        if show_icon:
+            text, text_font = fit([f"{value_k:.1f}k", f"{value_k:.0f}k"], with_icon=True)
+            return self._with_icon("icons:btc", text, price_color, base_b_color, text_font, x_offset, y_offset, char_spacing)
+
+        text, text_font = fit([f"B{value_k:.1f}k", f"B{value_k:.0f}k", f"{value_k:.0f}k"])
         return ModulePayload(
             text=text,
-            font_size=font_size,
+            font_size=text_font,
             x_offset=x_offset,
             y_offset=y_offset,
             default_color=price_color,
-            char_colors=[base_b_color] + [price_color] * max(0, len(text) - 1),
+            char_colors=self._lead_colors(text, "B", base_b_color, price_color),
+            char_spacing=char_spacing,
+        )
+
+    @staticmethod
+    def _lead_colors(
+        text: str,
+        lead: str,
+        lead_color: tuple[int, int, int],
+        color: tuple[int, int, int],
+    ) -> list[tuple[int, int, int]]:
+        """Per-char colors with the leading "B"/"H" highlighted; a zone may have dropped it."""
+        if text.startswith(lead):
+            return [lead_color] + [color] * (len(text) - 1)
+        return [color] * len(text)
+
+    @staticmethod
+    def _with_icon(
+        sprite: str,
+        text: str,
+        color: tuple[int, int, int],
+        icon_color: tuple[int, int, int] | None,
+        font_size: str,
+        x_offset: int,
+        y_offset: int,
+        char_spacing: int,
+    ) -> ModulePayload:
+        return ModulePayload(
+            text=text,
+            font_size=font_size,
+            x_offset=x_offset + ICON_ADVANCE,
+            y_offset=y_offset,
+            default_color=color,
             char_spacing=char_spacing,
+            sprites=[SpriteRef(sprite, x=x_offset, y=1 + y_offset, color=icon_color)],
         )
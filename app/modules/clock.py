@@ -2,7 +2,7 @@ from datetime import datetime
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from app.config import get_settings
-from app.modules.base import ModuleBase, ModulePayload
+from app.modules.base import ModuleBase, ModulePayload, fit_text, frame_time, zone_size
 from app.services.colors import clamp, parse_hex_color
 
 
@@ -13,10 +13,11 @@ class ClockModule(ModuleBase):
         tz_name = settings.get("timezone", get_settings().tz)
         show_seconds = bool(settings.get("show_seconds", True))
 
+        t = frame_time(cache)
         try:
-            now = datetime.now(ZoneInfo(tz_name))
+            now = datetime.fromtimestamp(t, ZoneInfo(tz_name))
         except ZoneInfoNotFoundError:
-            now = datetime.now(ZoneInfo(get_settings().tz))
+            now = datetime.fromtimestamp(t, ZoneInfo(get_settings().tz))
 
         fmt = "%H:%M:%S" if show_seconds else "%H:%M"
         font_size = settings.get("font_size", "normal")
@@ -24,8 +25,13 @@ class ClockModule(ModuleBase):
         x_offset = clamp(int(settings.get("x_offset", 0)), -16, 16)
         y_offset = clamp(int(settings.get("y_offset", 0)), -4, 4)
         char_spacing = clamp(int(settings.get("char_spacing", 1)), 0, 4)
+        text = now.strftime(fmt)
+        size = zone_size(cache)
+        if size is not None:
+            # In a narrow zone the seconds go first, then the large font.
+            text, font_size = fit_text([text, now.strftime("%H:%M")], font_size, char_spacing, size[0] - max(0, x_offset))
         return ModulePayload(
-            text=now.strftime(fmt),
+            text=text,
             font_size=font_size,
             x_offset=x_offset,
             y_offset=y_offset,
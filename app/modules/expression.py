@@ -0,0 +1,63 @@
+from app.modules.animations import HEIGHT, WIDTH, _blank, _palette, mirror_frame
+from app.modules.base import ModuleBase, ModulePayload, frame_time
+from app.services import expressions, vector_animations
+from app.services.colors import lut_lookup, palette_lut
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency, the expression is evaluated per pixel instead
+    np = None
+
+DEFAULT_EXPRESSION = "sin(x*0.3+t)+cos(y-t)"
+
+
+class ExpressionModule(ModuleBase):
+    """Colors every pixel from a user-defined expression over ``x``, ``y`` and ``t``.
+
+    The expression value is multiplied by ``color_scale`` and wrapped onto the
+    palette, so a range of 1 / ``color_scale`` walks the palette once.
+    """
+
+    key = "expression"
+
+    def __init__(self):
+        self._grid_env = expressions.grid_env(WIDTH, HEIGHT, 0.0) if np is not None else None
+        self._pixel_envs = [
+            [expressions.scalar_env(WIDTH, HEIGHT, x, y, 0.0) for x in range(WIDTH)] for y in range(HEIGHT)
+        ]
+
+    async def render(self, settings: dict, cache: dict) -> ModulePayload:
+        try:
+            compiled = expressions.compile_expression(str(settings.get("expression", DEFAULT_EXPRESSION)))
+        except expressions.ExpressionError:
+            return ModulePayload(text="ERR", default_color=(255, 60, 60))
+        speed = max(0.1, min(5.0, float(settings.get("speed", 1.0))))
+        intensity = max(0.1, min(1.0, float(settings.get("intensity", 0.8))))
+        color_scale = max(0.01, min(4.0, float(settings.get("color_scale", 0.25))))
+        mirror_mode = str(settings.get("mirror_mode", "none")).strip().lower()
+        if mirror_mode not in vector_animations.MIRROR_MODES:
+            mirror_mode = "none"
+        colors = _palette(settings.get("palette", "neon"))
+        t = frame_time(cache) * speed
+
+        frame, color_frame = self.render_frame(compiled, t, colors, intensity, color_scale, mirror_mode)
+        return ModulePayload(text="", frame=frame, color_frame=color_frame)
+
+    def render_frame(self, compiled, t: float, colors, intensity: float, color_scale: float, mirror_mode: str):
+        if self._grid_env is not None:
+            values = compiled.evaluate_grid({**self._grid_env, "t": t})
+            lut = vector_animations.palette_lut_array(colors, intensity)
+            size = len(lut)
+            rgb = lut[(np.mod(values * color_scale, 1.0) * size).astype(np.intp) % size].astype(np.uint8)
+            mask = np.ones((HEIGHT, WIDTH), dtype=bool)
+            mask, rgb = vector_animations.mirror(mask, rgb, mirror_mode)
+            return vector_animations.to_frames(mask, rgb)
+
+        frame, color_frame = _blank()
+        lut = palette_lut(colors, intensity)
+        for y, row in enumerate(self._pixel_envs):
+            for x, env in enumerate(row):
+                env["t"] = t
+                frame[y][x] = 1
+                color_frame[y][x] = lut_lookup(lut, compiled.evaluate_scalar(env) * color_scale)
+        return mirror_frame(frame, color_frame, mirror_mode)
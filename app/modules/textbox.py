@@ -1,6 +1,4 @@
-import time
-
-from app.modules.base import ModuleBase, ModulePayload
+from app.modules.base import ModuleBase, ModulePayload, frame_time
 from app.services.colors import clamp, parse_hex_color
 from app.services.rendering import measure_text_width
 
@@ -21,8 +19,9 @@ class TextBoxModule(ModuleBase):
         if not lines:
             lines = ["..."]
 
+        now = frame_time(cache)
         line_seconds = max(1, _safe_int(settings.get("line_seconds", 2), 2))
-        idx = int(time.time() / line_seconds) % len(lines)
+        idx = int(now / line_seconds) % len(lines)
         text = lines[idx]
 
         font_size = settings.get("font_size", "small")
@@ -39,7 +38,7 @@ class TextBoxModule(ModuleBase):
             speed = max(1, _safe_int(settings.get("scroll_speed", 35), 35))
             text_width = measure_text_width(text, font_size=font_size, char_spacing=char_spacing)
             cycle = text_width + 32
-            offset = 32 - (int(time.time() * speed / 10) % cycle)
+            offset = 32 - (int(now * speed / 10) % cycle)
             x_offset = clamp(offset, -text_width, 32)
 
         return ModulePayload(
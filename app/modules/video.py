@@ -0,0 +1,122 @@
+from pathlib import Path
+
+from app.modules.base import ModuleBase, ModulePayload, frame_time
+from app.services.animated_bitmap import FIT_MODES
+from app.services.rendering import blank_color_frame, blank_frame, unpack_rgb
+from app.services.video_clip import ClipPlayer, probe_clip
+
+VIDEO_DIR = Path(__file__).resolve().parent.parent / "videos"
+# A gap this long between two renders means the module was off screen; playback restarts.
+RESTART_GAP_S = 1.0
+
+
+class VideoModule(ModuleBase):
+    """Short video loops (Y4M or raw RGB) streamed from ``app/videos``.
+
+    Playback position follows the display frame clock: ``playback_speed``
+    scales it, frames the clock skips are never decoded (``drop_frames``) or,
+    with dropping off, every frame is shown once and the clip runs slower.
+    """
+
+    key = "video"
+    base_dir = VIDEO_DIR
+    # Offline rendering decodes on the render thread so the same times always give the same frames.
+    prefetch = True
+
+    def __init__(self):
+        self._player: ClipPlayer | None = None
+        self._player_key: tuple | None = None
+        self._settings_key: tuple | None = None
+        self._started_at: float | None = None
+        self._last_render: float | None = None
+        self._shown: int | None = None
+        self.last_error: str | None = None
+
+    def _resolve(self, relative_path: str) -> Path:
+        base_dir = self.base_dir.resolve()
+        requested = (base_dir / relative_path).resolve()
+        if base_dir not in requested.parents:
+            raise ValueError("video path must stay inside video directory")
+        if not requested.is_file():
+            raise ValueError(f"video file not found: {relative_path}")
+        return requested
+
+    def _player_for(self, settings_key: tuple) -> ClipPlayer:
+        file_path, fit_mode, loop, raw_width, raw_height, raw_fps = settings_key
+        path = self._resolve(file_path)
+        player_key = (*settings_key, path.stat().st_mtime)
+        if self._player is None or player_key != self._player_key:
+            self.shutdown()
+            clip = probe_clip(path, raw_width, raw_height, raw_fps)
+            self._player = ClipPlayer(path, clip, fit_mode, loop=loop, prefetch=self.prefetch)
+            self._player_key = player_key
+        return self._player
+
+    async def render(self, settings: dict, cache: dict) -> ModulePayload:
+        fit_mode = str(settings.get("fit_mode", "cover"))
+        settings_key = (
+            str(settings.get("file", "")).strip(),
+            fit_mode if fit_mode in FIT_MODES else "cover",
+            bool(settings.get("loop", True)),
+            max(1, int(settings.get("raw_width", 32))),
+            max(1, int(settings.get("raw_height", 8))),
+            max(0.1, float(settings.get("raw_fps", 25.0))),
+        )
+        speed = max(0.25, min(4.0, float(settings.get("playback_speed", 1.0))))
+        drop_frames = bool(settings.get("drop_frames", True))
+        now = frame_time(cache)
+
+        restart = (
+            self._started_at is None
+            or now < self._last_render
+            or now - self._last_render > RESTART_GAP_S
+            or settings_key != self._settings_key
+        )
+        self._last_render = now
+        if restart:
+            self._started_at = now
+            self._shown = None
+            self._settings_key = settings_key
+        try:
+            # The file is only looked at (stat, probe) when playback (re)starts, not per frame.
+            player = self._player_for(settings_key) if restart or self._player is None else self._player
+        except (ValueError, OSError) as exc:
+            self.last_error = str(exc)
+            self.shutdown()
+            return ModulePayload(text="", frame=blank_frame(32, 8), color_frame=blank_color_frame(32, 8))
+        self.last_error = None
+
+        position = int((now - self._started_at) * player.clip.fps * speed)
+        if not drop_frames and self._shown is not None:
+            position = min(position, self._shown + 1)
+        rgb = player.frame_at(position)
+        if rgb is None:
+            # First frame still being decoded.
+            return ModulePayload(text="", frame=blank_frame(32, 8), color_frame=blank_color_frame(32, 8))
+        self._shown = player.position
+        frame, color_frame = unpack_rgb(rgb, 96)
+        return ModulePayload(text="", frame=frame, color_frame=color_frame)
+
+    def shutdown(self) -> None:
+        if self._player is not None:
+            self._player.stop()
+        self._player = None
+        self._player_key = None
+
+    def get_stats(self) -> dict:
+        player = self._player
+        if player is None:
+            return {"active": False, "error": self.last_error}
+        clip = player.clip
+        return {
+            "active": True,
+            "file": player.path.name,
+            "format": clip.kind,
+            "source_size": [clip.width, clip.height],
+            "fps": clip.fps,
+            "frames": clip.frame_count,
+            "fit_mode": player.fit_mode,
+            "loop": player.loop,
+            **player.get_stats(),
+            "error": player.error or self.last_error,
+        }
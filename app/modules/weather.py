@@ -1,6 +1,4 @@
-import time
-
-from app.modules.base import ModuleBase, ModulePayload
+from app.modules.base import ModuleBase, ModulePayload, SpriteRef, frame_time
 from app.services.colors import clamp, lerp_color, parse_hex_color
 
 
@@ -10,6 +8,12 @@ def temperature_to_rgb(temp_c: float, cold: tuple[int, int, int], warm: tuple[in
     return lerp_color(cold, warm, ratio)
 
 
+# Atlas icons shown instead of the "Out"/"In"/"H" prefixes with ``show_icons``.
+SCREEN_ICONS = {"out": "icons:thermometer", "in": "icons:house", "humidity": "icons:drop"}
+# Icon width plus one column gap.
+ICON_ADVANCE = 6
+
+
 class WeatherModule(ModuleBase):
     key = "weather"
 
@@ -18,6 +22,11 @@ class WeatherModule(ModuleBase):
         separator = "" if value < 0 else " "
         return f"{prefix}{separator}{value:.1f}C"
 
+    @staticmethod
+    def _icon_temp(value: float) -> str:
+        # Next to an icon there is no room for a decimal on two-digit frost.
+        return f"{value:.1f}C" if value > -10 else f"{value:.0f}C"
+
     async def render(self, settings: dict, cache: dict) -> ModulePayload:
         outdoor_temp = cache.get("weather_outdoor_temp")
         indoor_temp = cache.get("weather_indoor_temp")
@@ -28,24 +37,28 @@ class WeatherModule(ModuleBase):
         y_offset = clamp(int(settings.get("y_offset", 0)), -4, 4)
         char_spacing = clamp(int(settings.get("char_spacing", 1)), 0, 4)
         screen_seconds = clamp(int(settings.get("screen_seconds", 4)), 1, 60)
+        show_icons = bool(settings.get("show_icons", False))
 
         cold_color = parse_hex_color(settings.get("color_cold"), (50, 120, 255))
         warm_color = parse_hex_color(settings.get("color_warm"), (255, 100, 70))
         humidity_color = parse_hex_color(settings.get("color_humidity"), (110, 210, 255))
         fallback_color = parse_hex_color(settings.get("color_fallback"), (120, 120, 120))
 
-        screens: list[tuple[str, tuple[int, int, int]]] = []
+        screens: list[tuple[str, str, tuple[int, int, int]]] = []
 
         if outdoor_temp is not None:
             outdoor_value = float(outdoor_temp)
-            screens.append((self._format_temp("Out", outdoor_value), temperature_to_rgb(outdoor_value, cold_color, warm_color)))
+            text = self._icon_temp(outdoor_value) if show_icons else self._format_temp("Out", outdoor_value)
+            screens.append(("out", text, temperature_to_rgb(outdoor_value, cold_color, warm_color)))
 
         if indoor_temp is not None:
             indoor_value = float(indoor_temp)
-            screens.append((self._format_temp("In", indoor_value), temperature_to_rgb(indoor_value, cold_color, warm_color)))
+            text = self._icon_temp(indoor_value) if show_icons else self._format_temp("In", indoor_value)
+            screens.append(("in", text, temperature_to_rgb(indoor_value, cold_color, warm_color)))
 
         if indoor_humidity is not None:
-            screens.append((f"H{float(indoor_humidity):.0f}%", humidity_color))
+            prefix = "" if show_icons else "H"
+            screens.append(("humidity", f"{prefix}{float(indoor_humidity):.0f}%", humidity_color))
 
         if not screens:
             return ModulePayload(
@@ -57,11 +70,20 @@ class WeatherModule(ModuleBase):
                 char_spacing=char_spacing,
             )
 
-        now = cache.get("now")
-        if not isinstance(now, (int, float)):
-            now = time.time()
+        now = frame_time(cache)
         screen_slot = int(now / screen_seconds) % len(screens)
-        text, color = screens[screen_slot]
+        screen, text, color = screens[screen_slot]
+
+        if show_icons:
+            return ModulePayload(
+                text=text,
+                font_size=font_size,
+                x_offset=x_offset + ICON_ADVANCE,
+                y_offset=y_offset,
+                default_color=color,
+                char_spacing=char_spacing,
+                sprites=[SpriteRef(SCREEN_ICONS[screen], x=x_offset, y=1 + y_offset)],
+            )
 
         return ModulePayload(
             text=text,
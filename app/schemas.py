@@ -45,5 +45,15 @@ class DrawRequest(BaseModel):
     seconds: int = Field(default=8, ge=1, le=7200)
 
 
+class NotificationRequest(BaseModel):
+    color: str = Field(default="#ff3c3c", pattern="^#?[0-9a-fA-F]{6}$")
+    seconds: int = Field(default=30, ge=1, le=3600)
+    corner: str = Field(default="top_right", pattern="^(top|bottom)_(left|right)$")
+
+
+class DisplayLayoutRequest(BaseModel):
+    zones: list[dict] = Field(default_factory=list)
+
+
 class BrightnessRequest(BaseModel):
     brightness: int = Field(ge=0, le=255)
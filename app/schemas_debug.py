@@ -27,19 +27,20 @@ class MappingOverrideRequest(BaseModel):
     first_pixel_offset: int = Field(default=0, ge=-4096, le=4096)
     data_starts_right: bool = Field(default=True)
     serpentine: bool = Field(default=True)
-    panel_order: list[int] = Field(min_length=1, max_length=16)
-    panel_rotations: list[int] = Field(min_length=1, max_length=16)
+    panel_order: list[int] = Field(min_length=1, max_length=64)
+    panel_rotations: list[int] = Field(min_length=1, max_length=64)
 
 
 class MappingObservation(BaseModel):
-    logical_x: int = Field(ge=0, le=31)
-    logical_y: int = Field(ge=0, le=7)
-    observed_x: int = Field(ge=0, le=31)
-    observed_y: int = Field(ge=0, le=7)
+    # Upper bounds against the configured display size are checked by the mapper.
+    logical_x: int = Field(ge=0, le=1023)
+    logical_y: int = Field(ge=0, le=255)
+    observed_x: int = Field(ge=0, le=1023)
+    observed_y: int = Field(ge=0, le=255)
 
 
 class MappingInferenceRequest(BaseModel):
-    observations: list[MappingObservation] = Field(min_length=1, max_length=256)
+    observations: list[MappingObservation] = Field(min_length=1, max_length=1024)
     max_solutions: int = Field(default=8, ge=1, le=32)
 
 
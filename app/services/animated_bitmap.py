@@ -0,0 +1,215 @@
+"""Animated bitmaps (GIF, PNG/APNG) for the bitmap module.
+
+An image is decoded once, every frame is fitted onto the 32x8 canvas and
+stored as a 768-byte RGB string (black = off); consecutive identical frames
+are merged into one longer frame. The render loop then only maps the frame
+time to a frame index (bisect over the cumulative delays) and unpacks 256
+pixels. Pillow is used when installed, otherwise the pure-Python GIF and
+PNG decoders.
+"""
+
+from __future__ import annotations
+
+import io
+import math
+import struct
+from bisect import bisect_right
+from dataclasses import dataclass, field, replace
+from itertools import accumulate
+from pathlib import Path
+
+from app.services import apng, gif
+from app.services.rendering import lit_mask, unpack_rgb
+
+try:
+    from PIL import Image, ImageSequence
+except ImportError:  # optional dependency, the pure-Python decoders are used instead
+    Image = None
+    ImageSequence = None
+
+Color = tuple[int, int, int]
+
+ANIMATION_SUFFIXES = {".gif", ".png", ".apng"}
+FIT_MODES = {"contain", "cover", "stretch"}
+MAX_FRAMES = 600
+MAX_SOURCE_PIXELS = 2048 * 2048
+# Source samples per output pixel and axis when shrinking.
+SAMPLES_PER_AXIS = 3
+# Averaged colors darker than this stay off instead of glowing faintly.
+DARK_THRESHOLD = 8
+
+
+@dataclass
+class AnimatedBitmap:
+    frames: list[bytes]
+    delays_ms: list[int]
+    source_size: tuple[int, int]
+    fit_mode: str
+    width: int = 32
+    height: int = 8
+    _ends: list[int] = field(default_factory=list, repr=False)
+
+    def __post_init__(self):
+        self._ends = list(accumulate(self.delays_ms))
+
+    @property
+    def duration_ms(self) -> int:
+        return self._ends[-1]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(frame) for frame in self.frames) + 8 * len(self.delays_ms)
+
+    def index_at(self, t: float) -> int:
+        """Frame shown at time ``t`` (seconds) of an endlessly looping playback."""
+        if len(self.frames) == 1:
+            return 0
+        return bisect_right(self._ends, int(t * 1000) % self.duration_ms)
+
+    def recolored(self, color: Color) -> "AnimatedBitmap":
+        """Copy with every lit pixel in ``color``."""
+        tables = [bytes([0]) + bytes([value]) * 255 for value in color]
+        frames = []
+        for data in self.frames:
+            mask = lit_mask(data)
+            recolored = bytearray(len(data))
+            for channel, table in enumerate(tables):
+                recolored[channel::3] = mask.translate(table)
+            frames.append(bytes(recolored))
+        return replace(self, frames=frames, delays_ms=list(self.delays_ms))
+
+    def render(self, index: int) -> tuple[list[list[int]], list[list[Color | None]]]:
+        return unpack_rgb(self.frames[index], self.width * 3, self.width, self.height)
+
+
+def is_animation_file(path: str | Path) -> bool:
+    return Path(path).suffix.lower() in ANIMATION_SUFFIXES
+
+
+def _image_size(data: bytes) -> tuple[int, int]:
+    if data[:6] in {b"GIF87a", b"GIF89a"}:
+        return struct.unpack_from("<HH", data, 6)
+    if data.startswith(apng.SIGNATURE) and len(data) >= 24:
+        return struct.unpack_from(">II", data, 16)
+    raise ValueError("unsupported image format (expected GIF or PNG)")
+
+
+def _pillow_frames(data: bytes, max_frames: int):
+    with Image.open(io.BytesIO(data)) as image:
+        for idx, frame in enumerate(ImageSequence.Iterator(image)):
+            if idx >= max_frames:
+                return
+            rgba = frame.convert("RGBA")
+            delay_ms = int(frame.info.get("duration") or 0)
+            yield rgba.width, rgba.height, rgba.tobytes(), delay_ms if delay_ms >= gif.MIN_DELAY_MS else gif.DEFAULT_DELAY_MS
+
+
+def _decoded_frames(data: bytes, max_frames: int):
+    if Image is not None:
+        return _pillow_frames(data, max_frames)
+    if data.startswith(apng.SIGNATURE):
+        return apng.decode_frames(data, max_frames)
+    return gif.decode_frames(data, max_frames)
+
+
+def decode_still(data: bytes) -> tuple[int, int, bytes]:
+    """``(width, height, rgba)`` of the first frame of a GIF or PNG."""
+    try:
+        for width, height, rgba, _ in _decoded_frames(data, 1):
+            return width, height, rgba
+    except (struct.error, IndexError, OSError) as exc:
+        raise ValueError(f"corrupt image: {exc}") from exc
+    raise ValueError("image contains no frames")
+
+
+def sampling_index(src_width: int, src_height: int, fit_mode: str, width: int = 32, height: int = 8) -> list[tuple[int, ...]]:
+    """Per output pixel (row-major), the RGBA byte offsets of the source samples averaged into it."""
+    if fit_mode == "stretch":
+        dst = (0, 0, width, height)
+        src = (0.0, 0.0, float(src_width), float(src_height))
+    elif fit_mode == "cover":
+        scale = max(width / src_width, height / src_height)
+        visible_w, visible_h = width / scale, height / scale
+        dst = (0, 0, width, height)
+        src = ((src_width - visible_w) / 2, (src_height - visible_h) / 2, visible_w, visible_h)
+    else:
+        scale = min(width / src_width, height / src_height)
+        dst_w = max(1, min(width, round(src_width * scale)))
+        dst_h = max(1, min(height, round(src_height * scale)))
+        dst = ((width - dst_w) // 2, (height - dst_h) // 2, dst_w, dst_h)
+        src = (0.0, 0.0, float(src_width), float(src_height))
+
+    dx, dy, dw, dh = dst
+    sx, sy, sw, sh = src
+    step_x, step_y = sw / dw, sh / dh
+    samples_x = max(1, min(SAMPLES_PER_AXIS, math.ceil(step_x)))
+    samples_y = max(1, min(SAMPLES_PER_AXIS, math.ceil(step_y)))
+
+    def points(origin: float, step: float, count: int, limit: int) -> list[int]:
+        return [min(limit - 1, max(0, int(origin + (idx + 0.5) * step / count))) for idx in range(count)]
+
+    index: list[tuple[int, ...]] = []
+    for y in range(height):
+        for x in range(width):
+            if not (dx <= x < dx + dw and dy <= y < dy + dh):
+                index.append(())
+                continue
+            cols = points(sx + (x - dx) * step_x, step_x, samples_x, src_width)
+            rows = points(sy + (y - dy) * step_y, step_y, samples_y, src_height)
+            index.append(tuple((row * src_width + col) * 4 for row in rows for col in cols))
+    return index
+
+
+def fit_frame(rgba: bytes, index: list[tuple[int, ...]]) -> bytes:
+    """Average the opaque samples per output pixel; mostly transparent or near-black pixels stay off."""
+    out = bytearray(len(index) * 3)
+    for pos, offsets in enumerate(index):
+        if not offsets:
+            continue
+        r = g = b = lit = 0
+        for offset in offsets:
+            if rgba[offset + 3] >= 128:
+                r += rgba[offset]
+                g += rgba[offset + 1]
+                b += rgba[offset + 2]
+                lit += 1
+        if lit * 2 < len(offsets):
+            continue
+        color = (r // lit, g // lit, b // lit)
+        if max(color) >= DARK_THRESHOLD:
+            out[pos * 3:pos * 3 + 3] = bytes(color)
+    return bytes(out)
+
+
+def decode_animation(path: Path, fit_mode: str, width: int = 32, height: int = 8) -> AnimatedBitmap:
+    """Decode and fit all frames of ``path``; raises ``ValueError`` for unsupported or broken files."""
+    if fit_mode not in FIT_MODES:
+        fit_mode = "contain"
+    data = path.read_bytes()
+    src_width, src_height = _image_size(data)
+    if not src_width or not src_height or src_width * src_height > MAX_SOURCE_PIXELS:
+        raise ValueError(f"image size {src_width}x{src_height} not supported")
+
+    index = sampling_index(src_width, src_height, fit_mode, width, height)
+    frames: list[bytes] = []
+    delays: list[int] = []
+    try:
+        for frame_width, frame_height, rgba, delay_ms in _decoded_frames(data, MAX_FRAMES):
+            if (frame_width, frame_height) != (src_width, src_height):
+                raise ValueError("frame size differs from image size")
+            fitted = fit_frame(rgba, index)
+            if frames and fitted == frames[-1]:
+                delays[-1] += delay_ms
+                continue
+            frames.append(fitted)
+            delays.append(delay_ms)
+    except (struct.error, IndexError, OSError) as exc:
+        # Truncated or corrupt data surfaces as low-level errors in the decoders.
+        raise ValueError(f"corrupt image: {exc}") from exc
+    if not frames:
+        raise ValueError("image contains no frames")
+    return AnimatedBitmap(frames=frames, delays_ms=delays, source_size=(src_width, src_height), fit_mode=fit_mode, width=width, height=height)
+
+
+def decoder_backend() -> str:
+    return "pillow" if Image is not None else "python"
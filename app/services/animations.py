@@ -1,25 +1,19 @@
-import colorsys
 import math
 from collections.abc import Callable
 
+from app.services.colors import hue_lut, lut_lookup, scale_color
+from app.services.frame_cache import PeriodicSpec
+
 Frame = list[list[int]]
 Color = tuple[int, int, int]
 ColorFrame = list[list[Color | None]]
 AnimationFrame = tuple[Frame, ColorFrame]
 
-
-def hsv_to_rgb(h: float, s: float, v: float) -> Color:
-    """Convert HSV values to an RGB tuple with 8-bit channels.
-
-    ``h`` wraps around the unit color wheel, while ``s`` and ``v`` are clamped
-    to the 0..1 range so callers can feed in continuous animation math without
-    having to guard the values first.
-    """
-    hue = float(h) % 1.0
-    saturation = max(0.0, min(1.0, float(s)))
-    value = max(0.0, min(1.0, float(v)))
-    r, g, b = colorsys.hsv_to_rgb(hue, saturation, value)
-    return (round(r * 255), round(g * 255), round(b * 255))
+RAINBOW_HUE_RATE = 0.18
+# Two shimmer cycles per hue cycle keeps rainbow_wave exactly periodic.
+RAINBOW_SHIMMER_RATE = 2 * math.tau * RAINBOW_HUE_RATE
+COMET_SPEED = 24.0
+COMET_HUE_RATE = COMET_SPEED / 256
 
 
 def blank_color_frame(width: int = 32, height: int = 8) -> ColorFrame:
@@ -32,19 +26,21 @@ def frame_from_color_frame(color_frame: ColorFrame) -> Frame:
 
 def rainbow_wave(tick: float, width: int = 32, height: int = 8) -> AnimationFrame:
     color_frame = blank_color_frame(width, height)
-    phase = float(tick) * 0.18
+    wheel = hue_lut(1.0)
+    phase = float(tick) * RAINBOW_HUE_RATE
     for y in range(height):
         for x in range(width):
             hue = (x / max(width, 1)) + (y / max(height, 1)) * 0.12 + phase
-            shimmer = 0.72 + 0.28 * math.sin((x * 0.45) + (y * 0.9) + (float(tick) * 2.0))
-            color_frame[y][x] = hsv_to_rgb(hue, 1.0, shimmer)
+            shimmer = 0.72 + 0.28 * math.sin((x * 0.45) + (y * 0.9) + (float(tick) * RAINBOW_SHIMMER_RATE))
+            color_frame[y][x] = scale_color(lut_lookup(wheel, hue), shimmer)
     return frame_from_color_frame(color_frame), color_frame
 
 
 def color_comet(tick: float, width: int = 32, height: int = 8) -> AnimationFrame:
     color_frame = blank_color_frame(width, height)
+    wheel = hue_lut(0.9)
     total = max(width * height, 1)
-    head = (float(tick) * 24.0) % total
+    head = (float(tick) * COMET_SPEED) % total
     tail_length = 42.0
     for y in range(height):
         for x in range(width):
@@ -53,8 +49,8 @@ def color_comet(tick: float, width: int = 32, height: int = 8) -> AnimationFrame
             if distance > tail_length:
                 continue
             brightness = (1.0 - (distance / tail_length)) ** 1.8
-            hue = (float(tick) * 0.12 + idx / total) % 1.0
-            color_frame[y][x] = hsv_to_rgb(hue, 0.9, max(0.08, brightness))
+            hue = float(tick) * COMET_HUE_RATE + idx / total
+            color_frame[y][x] = scale_color(lut_lookup(wheel, hue), max(0.08, min(1.0, brightness)))
     return frame_from_color_frame(color_frame), color_frame
 
 
@@ -62,3 +58,9 @@ ANIMATION_FACTORIES: dict[str, Callable[[float], AnimationFrame]] = {
     "rainbow_wave": lambda tick: rainbow_wave(tick),
     "color_comet": lambda tick: color_comet(tick),
 }
+
+# Periods (in seconds of ``tick``) for the default 32x8 canvas.
+ANIMATION_PERIODS: dict[str, PeriodicSpec] = {
+    "rainbow_wave": PeriodicSpec(period=1 / RAINBOW_HUE_RATE),
+    "color_comet": PeriodicSpec(period=256 / COMET_SPEED, step=1 / COMET_SPEED),
+}
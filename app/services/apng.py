@@ -0,0 +1,234 @@
+"""PNG / APNG decoding without Pillow.
+
+Covers non-interlaced images of every color type at bit depths 1 to 16
+(16-bit samples keep their high byte). Animated PNGs are composited like in
+browsers (``dispose_op`` / ``blend_op``); a plain PNG is one frame. Interlaced
+files need Pillow.
+"""
+
+from __future__ import annotations
+
+import struct
+import zlib
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+SIGNATURE = b"\x89PNG\r\n\x1a\n"
+CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+DEFAULT_DELAY_MS = 100
+MIN_DELAY_MS = 20
+
+
+@dataclass
+class _Header:
+    width: int
+    height: int
+    bit_depth: int
+    color_type: int
+
+
+@dataclass
+class _FrameControl:
+    width: int
+    height: int
+    x: int
+    y: int
+    delay_ms: int
+    dispose_op: int
+    blend_op: int
+
+
+def _chunks(data: bytes) -> Iterator[tuple[bytes, bytes]]:
+    if not data.startswith(SIGNATURE):
+        raise ValueError("not a PNG file")
+    pos = len(SIGNATURE)
+    while pos + 8 <= len(data):
+        length, kind = struct.unpack_from(">I4s", data, pos)
+        body = data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        yield kind, body
+        if kind == b"IEND":
+            return
+
+
+def _unfilter(raw: bytes, width: int, height: int, header: _Header) -> bytes:
+    bits_per_pixel = CHANNELS[header.color_type] * header.bit_depth
+    stride = (width * bits_per_pixel + 7) // 8
+    bpp = max(1, bits_per_pixel // 8)
+    out = bytearray(stride * height)
+    prior = bytearray(stride)
+    pos = 0
+    for y in range(height):
+        filter_type = raw[pos]
+        line = bytearray(raw[pos + 1:pos + 1 + stride])
+        pos += 1 + stride
+        if filter_type == 1:
+            for i in range(bpp, stride):
+                line[i] = (line[i] + line[i - bpp]) & 0xFF
+        elif filter_type == 2:
+            for i in range(stride):
+                line[i] = (line[i] + prior[i]) & 0xFF
+        elif filter_type == 3:
+            for i in range(stride):
+                left = line[i - bpp] if i >= bpp else 0
+                line[i] = (line[i] + ((left + prior[i]) >> 1)) & 0xFF
+        elif filter_type == 4:
+            for i in range(stride):
+                a = line[i - bpp] if i >= bpp else 0
+                b = prior[i]
+                c = prior[i - bpp] if i >= bpp else 0
+                p = a + b - c
+                pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+                predictor = a if pa <= pb and pa <= pc else (b if pb <= pc else c)
+                line[i] = (line[i] + predictor) & 0xFF
+        elif filter_type != 0:
+            raise ValueError("corrupt PNG filter type")
+        out[y * stride:(y + 1) * stride] = line
+        prior = line
+    return bytes(out)
+
+
+def _samples(row: bytes, count: int, bit_depth: int) -> list[int]:
+    """The first ``count`` raw samples of one scanline (16-bit samples: high byte only)."""
+    if bit_depth == 8:
+        return list(row[:count])
+    if bit_depth == 16:
+        return list(row[0:count * 2:2])
+    mask = (1 << bit_depth) - 1
+    values = []
+    for byte in row:
+        for shift in range(8 - bit_depth, -1, -bit_depth):
+            values.append((byte >> shift) & mask)
+        if len(values) >= count:
+            break
+    return values[:count]
+
+
+def _to_rgba(pixels: bytes, width: int, height: int, header: _Header, palette: list[bytes], trns: bytes) -> bytearray:
+    channels = CHANNELS[header.color_type]
+    bits_per_pixel = channels * header.bit_depth
+    stride = (width * bits_per_pixel + 7) // 8
+    depth = header.bit_depth
+    scale = 255 // ((1 << depth) - 1) if depth < 8 else 1
+    out = bytearray(width * height * 4)
+    key = None
+    if trns and header.color_type == 0:
+        key = struct.unpack(">H", trns[:2])[0] * scale if depth < 16 else trns[0]
+    elif trns and header.color_type == 2:
+        values = struct.unpack(">HHH", trns[:6])
+        key = tuple(value >> 8 if depth == 16 else value for value in values)
+    for y in range(height):
+        samples = _samples(pixels[y * stride:(y + 1) * stride], width * channels, depth)
+        base = y * width * 4
+        for x in range(width):
+            s = samples[x * channels:(x + 1) * channels]
+            if header.color_type == 3:
+                rgba = palette[s[0]] if s[0] < len(palette) else b"\x00\x00\x00\x00"
+            elif header.color_type == 0:
+                gray = s[0] * scale
+                rgba = bytes((gray, gray, gray, 0 if gray == key else 255))
+            elif header.color_type == 4:
+                rgba = bytes((s[0], s[0], s[0], s[1]))
+            elif header.color_type == 2:
+                rgba = bytes((s[0], s[1], s[2], 0 if tuple(s) == key else 255))
+            else:
+                rgba = bytes(s)
+            out[base + x * 4:base + x * 4 + 4] = rgba
+    return out
+
+
+def _frame_control(body: bytes) -> _FrameControl:
+    _, width, height, x, y, delay_num, delay_den, dispose_op, blend_op = struct.unpack(">IIIIIHHBB", body[:26])
+    delay_ms = round(delay_num * 1000 / (delay_den or 100))
+    return _FrameControl(width, height, x, y, delay_ms if delay_ms >= MIN_DELAY_MS else DEFAULT_DELAY_MS, dispose_op, blend_op)
+
+
+def decode_frames(data: bytes, max_frames: int = 0) -> Iterator[tuple[int, int, bytes, int]]:
+    """Yield ``(width, height, rgba, delay_ms)`` per composited frame."""
+    header: _Header | None = None
+    palette: list[bytes] = []
+    trns = b""
+    animated = False
+    # (frame control or None for a plain PNG, compressed image data)
+    sequence: list[list] = []
+    current: list | None = None
+    for kind, body in _chunks(data):
+        if kind == b"IHDR":
+            width, height, bit_depth, color_type, _, _, interlace = struct.unpack(">IIBBBBB", body[:13])
+            if color_type not in CHANNELS or bit_depth not in {1, 2, 4, 8, 16}:
+                raise ValueError("unsupported PNG color type")
+            if interlace:
+                raise ValueError("interlaced PNG needs Pillow")
+            header = _Header(width, height, bit_depth, color_type)
+        elif kind == b"PLTE":
+            palette = [body[idx:idx + 3] + b"\xff" for idx in range(0, len(body) - 2, 3)]
+        elif kind == b"tRNS":
+            trns = body
+        elif kind == b"acTL":
+            animated = True
+        elif kind == b"fcTL":
+            current = [_frame_control(body), []]
+            sequence.append(current)
+        elif kind == b"IDAT":
+            if current is None:
+                # IDAT without a preceding fcTL is the fallback image, not part of the animation.
+                current = [None, []]
+                if not animated:
+                    sequence.append(current)
+            current[1].append(body)
+        elif kind == b"fdAT":
+            if current is not None:
+                current[1].append(body[4:])
+    if header is None:
+        raise ValueError("PNG has no IHDR")
+    if trns and header.color_type == 3:
+        palette = [entry[:3] + bytes([trns[idx]]) if idx < len(trns) else entry for idx, entry in enumerate(palette)]
+
+    canvas = bytearray(header.width * header.height * 4)
+    frames = 0
+    for control, parts in sequence:
+        if not parts:
+            continue
+        if control is None:
+            control = _FrameControl(header.width, header.height, 0, 0, DEFAULT_DELAY_MS, 0, 0)
+        raw = zlib.decompress(b"".join(parts))
+        pixels = _unfilter(raw, control.width, control.height, header)
+        rgba = _to_rgba(pixels, control.width, control.height, header, palette, trns)
+
+        previous = bytes(canvas) if control.dispose_op == 2 else None
+        for y in range(control.height):
+            canvas_y = control.y + y
+            if canvas_y >= header.height:
+                break
+            visible = max(0, min(control.width, header.width - control.x))
+            start = (canvas_y * header.width + control.x) * 4
+            row = rgba[y * control.width * 4:(y * control.width + visible) * 4]
+            if control.blend_op == 0:
+                canvas[start:start + visible * 4] = row
+                continue
+            for x in range(visible):
+                src_alpha = row[x * 4 + 3]
+                if src_alpha == 255:
+                    canvas[start + x * 4:start + x * 4 + 4] = row[x * 4:x * 4 + 4]
+                elif src_alpha:
+                    offset = start + x * 4
+                    dst_alpha = canvas[offset + 3] * (255 - src_alpha) // 255
+                    out_alpha = src_alpha + dst_alpha
+                    for channel in range(3):
+                        canvas[offset + channel] = (row[x * 4 + channel] * src_alpha + canvas[offset + channel] * dst_alpha) // out_alpha
+                    canvas[offset + 3] = out_alpha
+
+        yield header.width, header.height, bytes(canvas), control.delay_ms
+        frames += 1
+        if max_frames and frames >= max_frames:
+            return
+
+        if control.dispose_op == 1:
+            clear_width = max(0, min(control.width, header.width - control.x)) * 4
+            for y in range(control.y, min(header.height, control.y + control.height)):
+                start = (y * header.width + control.x) * 4
+                canvas[start:start + clear_width] = bytes(clear_width)
+        elif previous is not None:
+            canvas[:] = previous
+    if not frames:
+        raise ValueError("PNG contains no image data")
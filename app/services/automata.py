@@ -0,0 +1,188 @@
+"""Bit-packed cellular automata on a toroidal world.
+
+Every world row is one Python int (bit ``x`` = column ``x``), so a generation
+is a handful of shifts and bitwise operations per row instead of a loop over
+cells. Neighbour counts use a bit-sliced adder (three planes for 0..7 and a
+saturating "4+" plane). Cell ages are kept the same way in ``AGE_PLANES``
+saturating bit planes, which lets the module color cells through a small
+palette table without per-cell bookkeeping.
+"""
+
+from __future__ import annotations
+
+import random
+
+RULES = {"life", "brians_brain", "wolfram"}
+AGE_PLANES = 4
+AGE_LEVELS = 1 << AGE_PLANES
+
+# Remembered state hashes for cycle detection; covers all short oscillators.
+CYCLE_WINDOW = 64
+# Generations a stuck (cyclic or extinct) world stays visible before reseeding.
+HOLD_GENERATIONS = 12
+
+
+class BitboardAutomaton:
+    def __init__(
+        self,
+        rule: str,
+        width: int,
+        height: int,
+        wolfram_rule: int = 30,
+        density: float = 0.3,
+        seed: int | None = None,
+    ):
+        if rule not in RULES:
+            raise ValueError(f"unknown automaton rule: {rule}")
+        self.rule = rule
+        self.width = width
+        self.height = height
+        self.mask = (1 << width) - 1
+        self.wolfram_rule = wolfram_rule & 0xFF
+        self.density = density
+        self._rng = random.Random(seed)
+        self.generation = 0
+        self.reseeds = 0
+        self.reseed()
+
+    def reseed(self) -> None:
+        self.rows = [0] * self.height
+        self.dying = [0] * self.height
+        self.ages = [[0] * self.height for _ in range(AGE_PLANES)]
+        if self.rule == "wolfram":
+            # Only the newest (bottom) row is state; the rows above are history.
+            self.rows[-1] = self._random_row() or 1 << (self.width // 2)
+        else:
+            self.rows = [self._random_row() for _ in range(self.height)]
+        self._seen: dict[int, int] = {}
+        self._hold = 0
+        self.reseeds += 1
+
+    def _random_row(self) -> int:
+        row = 0
+        for x in range(self.width):
+            if self._rng.random() < self.density:
+                row |= 1 << x
+        return row
+
+    def _rol(self, row: int) -> int:
+        """Neighbour to the left (x - 1) moved onto column x."""
+        return ((row << 1) | (row >> (self.width - 1))) & self.mask
+
+    def _ror(self, row: int) -> int:
+        """Neighbour to the right (x + 1) moved onto column x."""
+        return ((row >> 1) | (row << (self.width - 1))) & self.mask
+
+    def _neighbour_counts(self, rows: list[int]) -> tuple[list[int], list[int]]:
+        """Per row, the bit masks of cells with exactly two and exactly three live neighbours."""
+        height = self.height
+        twos, threes = [], []
+        for y in range(height):
+            above, row, below = rows[y - 1], rows[y], rows[(y + 1) % height]
+            b0 = b1 = b2 = 0
+            for n in (
+                self._rol(above), above, self._ror(above),
+                self._rol(row), self._ror(row),
+                self._rol(below), below, self._ror(below),
+            ):
+                c0 = b0 & n
+                b0 ^= n
+                c1 = b1 & c0
+                b1 ^= c0
+                b2 |= c1
+            low = b1 & ~b2
+            twos.append(low & ~b0)
+            threes.append(low & b0)
+        return twos, threes
+
+    def _age(self, y_src: int, survivors: int) -> list[int]:
+        """Increment the age planes of ``survivors`` (saturating); everything else restarts at 0."""
+        carry = survivors
+        planes = []
+        for plane in self.ages:
+            bits = plane[y_src] & survivors
+            planes.append(bits ^ carry)
+            carry &= bits
+        return [bits | carry for bits in planes]
+
+    def step(self) -> None:
+        if self.rule == "life":
+            twos, threes = self._neighbour_counts(self.rows)
+            nxt = [(threes[y] | (self.rows[y] & twos[y])) & self.mask for y in range(self.height)]
+            ages = [self._age(y, self.rows[y] & nxt[y]) for y in range(self.height)]
+            self.rows = nxt
+        elif self.rule == "brians_brain":
+            twos, _ = self._neighbour_counts(self.rows)
+            nxt = [twos[y] & ~self.rows[y] & ~self.dying[y] & self.mask for y in range(self.height)]
+            self.dying = self.rows
+            self.rows = nxt
+            ages = [self._age(y, 0) for y in range(self.height)]
+        else:
+            newest = self.rows[-1]
+            left, right = self._rol(newest), self._ror(newest)
+            row = 0
+            for pattern in range(8):
+                if not self.wolfram_rule >> pattern & 1:
+                    continue
+                bits = self.mask
+                bits &= left if pattern & 4 else ~left
+                bits &= newest if pattern & 2 else ~newest
+                bits &= right if pattern & 1 else ~right
+                row |= bits
+            ages = [[plane[y] for plane in self.ages] for y in range(1, self.height)]
+            ages.append(self._age(self.height - 1, newest & row))
+            self.rows = self.rows[1:] + [row]
+        self.ages = [[ages[y][i] for y in range(self.height)] for i in range(AGE_PLANES)]
+        self.generation += 1
+        self._check_cycle()
+
+    def _state_hash(self) -> int:
+        if self.rule == "wolfram":
+            return hash(self.rows[-1])
+        return hash((tuple(self.rows), tuple(self.dying)))
+
+    def _check_cycle(self) -> None:
+        if self._hold:
+            self._hold -= 1
+            if not self._hold:
+                self.reseed()
+            return
+        state = self._state_hash()
+        if not any(self.rows) or state in self._seen:
+            self._hold = HOLD_GENERATIONS
+            return
+        self._seen[state] = self.generation
+        if len(self._seen) > CYCLE_WINDOW:
+            del self._seen[next(iter(self._seen))]
+
+    def window(self, x0: int, y0: int, width: int, height: int):
+        """Yield ``(row_y, x, age, dying)`` for lit cells of a ``width`` x ``height`` view at (x0, y0)."""
+        x0 %= self.width
+        view_mask = (1 << width) - 1
+        for vy in range(height):
+            y = (y0 + vy) % self.height
+            row, dying = self.rows[y], self.dying[y]
+            if x0:
+                row = (row >> x0) | (row << (self.width - x0))
+                dying = (dying >> x0) | (dying << (self.width - x0))
+            row &= view_mask
+            dying &= view_mask
+            bits = row | dying
+            while bits:
+                low = bits & -bits
+                x = low.bit_length() - 1
+                bits ^= low
+                src = (x + x0) % self.width
+                age = 0
+                for i, plane in enumerate(self.ages):
+                    age |= (plane[y] >> src & 1) << i
+                yield vy, x, age, bool(dying & low)
+
+    def get_stats(self) -> dict:
+        return {
+            "rule": self.rule,
+            "world": [self.width, self.height],
+            "generation": self.generation,
+            "population": sum(row.bit_count() for row in self.rows),
+            "reseeds": self.reseeds,
+        }
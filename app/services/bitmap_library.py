@@ -0,0 +1,183 @@
+"""Index of ``app/bitmaps`` on top of the ``BitmapLoader``.
+
+The directory is scanned on a slow timer (mtime changes are handed to the
+loader there, the render loop itself never touches the file system), files
+used by enabled bitmap modules are parsed/decoded on a worker thread as soon
+as they are configured, and ``listing()`` reports size and memory cost per
+file for the UI.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+from app.services.animated_bitmap import ANIMATION_SUFFIXES
+from app.services.bitmap_loader import BitmapLoader
+
+BITMAP_SUFFIXES = {".txt", ".pbm", ".ppm", ".pnm"} | ANIMATION_SUFFIXES
+
+
+@dataclass(frozen=True)
+class WantedBitmap:
+    file: str
+    color_mode: str
+    color: str | None
+    fit_mode: str
+
+
+@dataclass
+class LibraryEntry:
+    name: str
+    size_bytes: int
+    mtime: float
+
+    @property
+    def kind(self) -> str:
+        return "animation" if BitmapLoader.is_animated(self.name) else "bitmap"
+
+
+class BitmapLibrary:
+    def __init__(self, loader: BitmapLoader, scan_interval_s: float = 10.0):
+        self._logger = logging.getLogger(__name__)
+        self.loader = loader
+        self.scan_interval_s = scan_interval_s
+        self._entries: dict[str, LibraryEntry] = {}
+        self._wanted: frozenset[WantedBitmap] = frozenset()
+        self._running = False
+        self._task: asyncio.Task | None = None
+        self._prewarm_task: asyncio.Task | None = None
+        self._prewarm_generation = 0
+        self.last_scan_at: float | None = None
+        self.last_scan_ms: float | None = None
+        self.last_prewarm_ms: float | None = None
+        self._stats = {"scans": 0, "changed_files": 0, "prewarms": 0, "prewarm_errors": 0}
+
+    async def start(self) -> None:
+        # From now on the loader trusts the mtimes seen here instead of checking per frame
+        # (mapped bitmaps still get their cheap per-lookup size check on the open map).
+        self.loader.stat_on_load = False
+        await asyncio.to_thread(self.scan)
+        self._running = True
+        self._task = asyncio.create_task(self._scan_loop())
+
+    async def stop(self) -> None:
+        self._running = False
+        tasks = [task for task in (self._task, self._prewarm_task) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.loader.stat_on_load = True
+
+    async def _scan_loop(self) -> None:
+        while self._running:
+            await asyncio.sleep(self.scan_interval_s)
+            try:
+                changed = await asyncio.to_thread(self.scan)
+            except Exception as exc:  # noqa: BLE001
+                self._logger.warning("Bitmap library scan failed: %s", exc)
+                continue
+            if changed & {wanted.file for wanted in self._wanted}:
+                self._request_prewarm()
+
+    def scan(self) -> set[str]:
+        """Re-index the directory and pass mtime changes on to the loader; returns the changed names."""
+        started = time.perf_counter()
+        entries: dict[str, LibraryEntry] = {}
+        base_dir = self.loader.base_dir
+        for path in sorted(base_dir.rglob("*")):
+            if path.suffix.lower() not in BITMAP_SUFFIXES or not path.is_file():
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            name = path.relative_to(base_dir).as_posix()
+            entries[name] = LibraryEntry(name=name, size_bytes=stat.st_size, mtime=stat.st_mtime)
+        changed = self.loader.refresh_files()
+        self._entries = entries
+        self.last_scan_at = time.time()
+        self.last_scan_ms = round((time.perf_counter() - started) * 1000, 3)
+        self._stats["scans"] += 1
+        self._stats["changed_files"] += len(changed)
+        return changed
+
+    def want(self, module_settings: list[dict]) -> None:
+        """Files referenced by the enabled bitmap modules; new ones are pre-parsed in the background."""
+        wanted = set()
+        for settings in module_settings:
+            file_path = str(settings.get("file", "")).strip()
+            if not file_path:
+                continue
+            color_mode = str(settings.get("color_mode", "bitmap")).strip().lower()
+            color = settings.get("color")
+            wanted.add(
+                WantedBitmap(
+                    file=file_path,
+                    color_mode=color_mode if color_mode in {"bitmap", "solid"} else "bitmap",
+                    color=color if isinstance(color, str) else None,
+                    fit_mode=str(settings.get("fit_mode", "contain")),
+                )
+            )
+        wanted = frozenset(wanted)
+        if wanted == self._wanted:
+            return
+        added = wanted - self._wanted
+        self._wanted = wanted
+        if added:
+            self._request_prewarm()
+
+    def _request_prewarm(self) -> None:
+        self._prewarm_generation += 1
+        if self._prewarm_task is None or self._prewarm_task.done():
+            self._prewarm_task = asyncio.create_task(self._run_prewarm())
+
+    async def _run_prewarm(self) -> None:
+        # Requests arriving during a run trigger one more pass with the latest set.
+        done_generation = None
+        while done_generation != self._prewarm_generation:
+            done_generation = self._prewarm_generation
+            await asyncio.to_thread(self.prewarm, self._wanted)
+
+    def prewarm(self, wanted: frozenset[WantedBitmap]) -> None:
+        """Parse (or queue the decode of) every wanted file exactly as the render loop will request it."""
+        started = time.perf_counter()
+        for item in sorted(wanted, key=lambda entry: entry.file):
+            try:
+                if self.loader.is_animated(item.file):
+                    self.loader.load_animation(item.file, item.fit_mode, color=item.color if item.color_mode == "solid" else None)
+                else:
+                    self.loader.load_variant(item.file, item.color_mode, item.color)
+            except (ValueError, OSError) as exc:
+                self._logger.warning("Bitmap %s could not be preloaded: %s", item.file, exc)
+                self._stats["prewarm_errors"] += 1
+                continue
+            self._stats["prewarms"] += 1
+        self.last_prewarm_ms = round((time.perf_counter() - started) * 1000, 3)
+
+    def listing(self) -> list[dict]:
+        in_use = {wanted.file for wanted in self._wanted}
+        return [
+            {
+                "name": entry.name,
+                "kind": entry.kind,
+                "size_bytes": entry.size_bytes,
+                "mtime": entry.mtime,
+                "in_use": entry.name in in_use,
+                **self.loader.describe(entry.name),
+            }
+            for entry in self._entries.values()
+        ]
+
+    def get_stats(self) -> dict:
+        return {
+            **self._stats,
+            "files": len(self._entries),
+            "wanted": len(self._wanted),
+            "scan_interval_s": self.scan_interval_s,
+            "last_scan_at": self.last_scan_at,
+            "last_scan_ms": self.last_scan_ms,
+            "last_prewarm_ms": self.last_prewarm_ms,
+        }
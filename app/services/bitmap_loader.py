@@ -1,81 +1,486 @@
 from __future__ import annotations
 
+import logging
+import mmap
 import re
+import sys
+import threading
 import time
-from dataclasses import dataclass
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 
-from app.services.rendering import blank_color_frame, blank_frame
+from app.services.animated_bitmap import AnimatedBitmap, decode_animation, decoder_backend, is_animation_file
+from app.services.colors import parse_hex_color
+from app.services.rendering import blank_color_frame, blank_frame, lit_mask, unpack_rgb
 
 Color = tuple[int, int, int]
 
+NETPBM_WHITESPACE = b" \t\r\n\v\f"
+BLACK = b"\x00\x00\x00"
+WHITE = (255, 255, 255)
+# Recolor fallback, same as the ``recolor`` effect.
+DEFAULT_RECOLOR = (240, 240, 240)
+WHITESPACE_DELETION = {ord(char): None for char in " \t\r\n\v\f"}
+# ASCII "1" to 0xFF, everything else to 0 (P1 raster after joining the tokens).
+P1_TRANSLATION = bytes(0xFF if value == ord("1") else 0 for value in range(256))
+
+
+# Nonzero byte to ASCII "1", zero to "0" (lit mask as a binary number string).
+LIT_DIGITS = b"0" + b"1" * 255
+
+
+@lru_cache(maxsize=64)
+def _bit_expansion(color: Color) -> list[bytes]:
+    """One packed byte (MSB = leftmost pixel, 1 = set) to eight RGB pixels in ``color``."""
+    on = bytes(color)
+    return [b"".join(on if byte & (0x80 >> bit) else BLACK for bit in range(8)) for byte in range(256)]
+
+
+def _scale_table(max_value: int) -> bytes:
+    """Sample value (0..max_value) to 0..255."""
+    return bytes(min(255, round(value * 255 / max_value)) for value in range(max_value + 1))
+
+
+def _ping_pong(tick: int, limit: int) -> int:
+    """0..limit..0 over ``2 * limit`` ticks."""
+    if limit <= 0:
+        return 0
+    position = tick % (2 * limit)
+    return position if position <= limit else 2 * limit - position
+
 
 @dataclass
 class BitmapFile:
+    """Row-strided pixel buffer: row ``y`` starts at byte ``y * row_stride``.
+
+    24 bits per pixel is packed RGB (black = off); 1 bit per pixel is a
+    P4-style raster (MSB = leftmost pixel, set pixels shown in ``on_color``).
+    ``buffer`` may be a ``memoryview`` into the file contents or into a
+    memory map of the file (``mapped``), so loading such files copies nothing.
+    """
+
     width: int
     height: int
-    pixels: list[list[Color | None]]
+    buffer: bytes | memoryview
     is_monochrome: bool
+    row_stride: int = 0
+    bits_per_pixel: int = 24
+    mapped: bool = False
+    on_color: Color = WHITE
+
+    def __post_init__(self):
+        if not self.row_stride:
+            self.row_stride = self.width * 3 if self.bits_per_pixel == 24 else (self.width + 7) // 8
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.buffer)
+
+    def row_rgb(self, y: int, x: int, count: int) -> bytes | memoryview:
+        """Packed RGB of ``count`` pixels of row ``y`` starting at column ``x``."""
+        start = y * self.row_stride
+        if self.bits_per_pixel == 24:
+            return self.buffer[start + x * 3:start + (x + count) * 3]
+        expanded = b"".join(map(_bit_expansion(self.on_color).__getitem__, self.buffer[start + x // 8:start + (x + count + 7) // 8]))
+        skip = x % 8
+        return expanded[skip * 3:(skip + count) * 3]
+
+    def map_intact(self) -> bool:
+        """False once a mapped file shrank below the mapped length (truncated/rewritten in place).
+
+        Touching the pages past the new end of file would kill the process
+        with SIGBUS, so such a bitmap must not be read any more. The size
+        comes from ``fstat`` on the map's own file descriptor, not from a path
+        lookup.
+        """
+        if not self.mapped:
+            return True
+        mapped = self.buffer.obj
+        try:
+            return mapped.size() >= len(mapped)
+        except (OSError, ValueError):
+            return False
+
+    def pixel(self, x: int, y: int) -> Color | None:
+        color = tuple(self.row_rgb(y, x, 1))
+        return color if any(color) else None
+
+    def recolored(self, color: Color) -> "BitmapFile":
+        """Every lit pixel in ``color``, stored as a 1-bit mask (shares the raster if it already is one)."""
+        if self.bits_per_pixel == 1:
+            return replace(self, on_color=color, is_monochrome=True)
+        digits = lit_mask(self.buffer[:self.height * self.row_stride]).translate(LIT_DIGITS)
+        row_bytes = (self.width + 7) // 8
+        padding = b"0" * (row_bytes * 8 - self.width)
+        width = self.width
+        mask = b"".join(
+            int(digits[y * width:(y + 1) * width] + padding, 2).to_bytes(row_bytes, "big") for y in range(self.height)
+        )
+        return BitmapFile(self.width, self.height, mask, True, row_bytes, 1, False, color)
 
 
 class BitmapLoader:
-    """Loads bitmap files (mono + RGB) and caches parsed output by mtime."""
-
-    def __init__(self, base_dir: Path):
+    """Loads bitmap files (mono + RGB) and caches parsed output by mtime.
+
+    Parsed bitmaps live in a byte-bounded LRU (memory-mapped files count as
+    free). Animated images (GIF, PNG/APNG) are decoded on a worker thread into
+    ``AnimatedBitmap`` objects and kept in a byte-bounded LRU keyed by
+    (file, mtime, fit mode).
+
+    With ``stat_on_load`` (default) every lookup checks the file's mtime. A
+    ``BitmapLibrary`` switches that off and calls ``refresh_files`` on a
+    slow timer instead, so the render loop does no path lookups. Memory-mapped
+    bitmaps are still checked on every lookup (``fstat`` on the open map): a
+    file truncated in place is dropped and read again right away instead of
+    being served from a broken map until the next scan.
+    """
+
+    def __init__(
+        self,
+        base_dir: Path,
+        animation_cache_bytes: int = 2 * 1024 * 1024,
+        background_decode: bool = True,
+        mmap_min_bytes: int = 256 * 1024,
+        variant_cache_bytes: int = 1024 * 1024,
+        cache_bytes: int = 4 * 1024 * 1024,
+    ):
+        self._logger = logging.getLogger(__name__)
         self.base_dir = base_dir.resolve()
-        self._cache: dict[Path, tuple[float, BitmapFile]] = {}
+        self.mmap_min_bytes = mmap_min_bytes
+        self.stat_on_load = True
+        # Requested name -> (resolved path, mtime) as last seen on disk.
+        self._files: dict[str, tuple[Path, float]] = {}
+        self.cache_bytes = max(int(cache_bytes), 0)
+        self._cache: OrderedDict[Path, tuple[float, BitmapFile]] = OrderedDict()
+        self._cache_used_bytes = 0
+        self.animation_cache_bytes = max(int(animation_cache_bytes), 0)
+        self._lock = threading.Lock()
+        self._animations: OrderedDict[tuple[Path, float, str], AnimatedBitmap] = OrderedDict()
+        self._animation_bytes = 0
+        self._pending: set[tuple[Path, float, str]] = set()
+        self._failed: dict[tuple[Path, float, str], str] = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="PixelDockBitmapDecode") if background_decode else None
+        self.variant_cache_bytes = max(int(variant_cache_bytes), 0)
+        self._variants: OrderedDict[tuple, BitmapFile | AnimatedBitmap] = OrderedDict()
+        self._variant_bytes = 0
+        self._stats = {
+            "bitmap_hits": 0,
+            "bitmap_misses": 0,
+            "bitmap_evictions": 0,
+            "animation_hits": 0,
+            "animation_misses": 0,
+            "animations_decoded": 0,
+            "evictions": 0,
+            "decode_errors": 0,
+            "mapped_invalidations": 0,
+            "variant_hits": 0,
+            "variant_misses": 0,
+            "variant_evictions": 0,
+        }
+        self.last_decode_ms: float | None = None
 
     def load(self, relative_path: str) -> BitmapFile:
+        return self._load(relative_path)[2]
+
+    def _file(self, relative_path: str) -> tuple[Path, float]:
+        if not self.stat_on_load:
+            known = self._files.get(relative_path)
+            if known is not None:
+                return known
         source_path = self._resolve(relative_path)
-        stat = source_path.stat()
-        cached = self._cache.get(source_path)
-        if cached and cached[0] == stat.st_mtime:
-            return cached[1]
-
-        content = source_path.read_text(encoding="utf-8")
-        parsed = self._parse(content)
-        self._cache[source_path] = (stat.st_mtime, parsed)
+        known = (source_path, source_path.stat().st_mtime)
+        self._files[relative_path] = known
+        return known
+
+    def _load(self, relative_path: str) -> tuple[Path, float, BitmapFile]:
+        source_path, mtime = self._file(relative_path)
+        with self._lock:
+            cached = self._cache.get(source_path)
+            # Checked on every lookup, also while ``stat_on_load`` is off: a map of a shrunken file must never be read.
+            stale_map = cached is not None and not cached[1].map_intact()
+            if cached and cached[0] == mtime and not stale_map:
+                self._cache.move_to_end(source_path)
+                self._stats["bitmap_hits"] += 1
+                return source_path, mtime, cached[1]
+            self._stats["bitmap_misses"] += 1
+        if stale_map:
+            # Drop the map and every variant sharing it, then look at the file on disk again.
+            self._stats["mapped_invalidations"] += 1
+            self._forget(source_path)
+            self._files.pop(relative_path, None)
+            source_path, mtime = self._file(relative_path)
+
+        parsed = self._load_mapped(source_path) if source_path.stat().st_size >= self.mmap_min_bytes else None
+        if parsed is None:
+            parsed = self._parse(source_path.read_bytes())
+        with self._lock:
+            previous = self._cache.pop(source_path, None)
+            if previous is not None:
+                self._cache_used_bytes -= self._heap_size(previous[1])
+            self._cache[source_path] = (mtime, parsed)
+            self._cache_used_bytes += self._heap_size(parsed)
+            # The newest entry always stays, even if it alone exceeds the budget.
+            while self._cache_used_bytes > self.cache_bytes and len(self._cache) > 1:
+                _, (_, evicted) = self._cache.popitem(last=False)
+                self._cache_used_bytes -= self._heap_size(evicted)
+                self._stats["bitmap_evictions"] += 1
+        return source_path, mtime, parsed
+
+    @staticmethod
+    def _heap_size(bitmap: BitmapFile) -> int:
+        return 0 if bitmap.mapped else bitmap.nbytes
+
+    def refresh_files(self) -> set[str]:
+        """Re-check the mtimes of all files looked up so far; returns the names that changed or vanished.
+
+        Cached data of an older version is dropped right away instead of
+        waiting for LRU eviction.
+        """
+        changed: set[str] = set()
+        for name, (source_path, mtime) in list(self._files.items()):
+            try:
+                current = source_path.stat().st_mtime
+            except OSError:
+                current = None
+            if current == mtime:
+                continue
+            changed.add(name)
+            if current is None:
+                self._files.pop(name, None)
+            else:
+                self._files[name] = (source_path, current)
+            self._forget(source_path, keep_mtime=current)
+        return changed
+
+    def _forget(self, source_path: Path, keep_mtime: float | None = None) -> None:
+        with self._lock:
+            cached = self._cache.get(source_path)
+            if cached is not None and cached[0] != keep_mtime:
+                del self._cache[source_path]
+                self._cache_used_bytes -= self._heap_size(cached[1])
+            for key in [key for key in self._variants if key[0] == source_path and key[1] != keep_mtime]:
+                self._variant_bytes -= self._variant_size(self._variants.pop(key))
+            for key in [key for key in self._animations if key[0] == source_path and key[1] != keep_mtime]:
+                self._animation_bytes -= self._animations.pop(key).nbytes
+            for key in [key for key in self._failed if key[0] == source_path and key[1] != keep_mtime]:
+                del self._failed[key]
+
+    def describe(self, relative_path: str) -> dict:
+        """What is currently held in memory for one file (for listings)."""
+        source_path = (self.base_dir / relative_path).resolve()
+        info: dict = {"loaded": False, "width": None, "height": None, "bits_per_pixel": None, "frames": None, "memory_bytes": 0, "mapped_bytes": 0}
+        with self._lock:
+            cached = self._cache.get(source_path)
+            if cached is not None:
+                bitmap = cached[1]
+                info.update(loaded=True, width=bitmap.width, height=bitmap.height, bits_per_pixel=bitmap.bits_per_pixel)
+                info["memory_bytes" if not bitmap.mapped else "mapped_bytes"] += bitmap.nbytes
+            for key, animation in self._animations.items():
+                if key[0] == source_path:
+                    width, height = animation.source_size
+                    info.update(loaded=True, width=width, height=height, frames=len(animation.frames))
+                    info["memory_bytes"] += animation.nbytes
+            info["variants"] = 0
+            for key, variant in self._variants.items():
+                if key[0] == source_path:
+                    info["variants"] += 1
+                    info["memory_bytes"] += self._variant_size(variant)
+        return info
+
+    def load_variant(self, relative_path: str, color_mode: str, color: object) -> BitmapFile:
+        """The bitmap as displayed: recolored when ``color_mode`` is ``solid`` or the file is monochrome.
+
+        Recolored variants are cached per (file, mtime, color_mode, color), so
+        the render loop only extracts the window.
+        """
+        source_path, mtime, bitmap = self._load(relative_path)
+        if not color or not (color_mode == "solid" or bitmap.is_monochrome):
+            return bitmap
+        rgb = parse_hex_color(color if isinstance(color, str) else None, DEFAULT_RECOLOR)
+        return self._variant((source_path, mtime, color_mode, rgb), lambda: bitmap.recolored(rgb))
+
+    def _variant(self, key: tuple, build: Callable[[], BitmapFile | AnimatedBitmap]) -> BitmapFile | AnimatedBitmap:
+        with self._lock:
+            variant = self._variants.get(key)
+            if variant is not None:
+                self._variants.move_to_end(key)
+                self._stats["variant_hits"] += 1
+                return variant
+            self._stats["variant_misses"] += 1
+        variant = build()
+        with self._lock:
+            # Variants of an older version of the same file can never be hit again.
+            for stale in [other for other in self._variants if other[0] == key[0] and other[1] != key[1]]:
+                self._variant_bytes -= self._variant_size(self._variants.pop(stale))
+            if key not in self._variants:
+                self._variants[key] = variant
+                self._variant_bytes += self._variant_size(variant)
+            while self._variant_bytes > self.variant_cache_bytes and len(self._variants) > 1:
+                _, evicted = self._variants.popitem(last=False)
+                self._variant_bytes -= self._variant_size(evicted)
+                self._stats["variant_evictions"] += 1
+        return variant
+
+    @staticmethod
+    def _variant_size(variant: BitmapFile | AnimatedBitmap) -> int:
+        # A 1-bit view on a file raster (recolored P4) owns no memory of its own.
+        if isinstance(variant, BitmapFile) and (variant.mapped or isinstance(variant.buffer, memoryview)):
+            return 0
+        return variant.nbytes
+
+    @staticmethod
+    def _load_mapped(source_path: Path) -> BitmapFile | None:
+        """Large P4/P6 files are used straight from a read-only memory map instead of being read into RAM."""
+        with source_path.open("rb") as handle:
+            if handle.read(2) not in {b"P4", b"P6"}:
+                return None
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        parsed = BitmapLoader._parse(mapped)
+        if isinstance(parsed.buffer, memoryview) and parsed.buffer.obj is mapped:
+            parsed.mapped = True
+        else:
+            # Converted copy (max value other than 255); the map is no longer needed.
+            mapped.close()
         return parsed
 
+    @staticmethod
+    def is_animated(relative_path: str) -> bool:
+        return is_animation_file(relative_path)
+
+    def load_animation(self, relative_path: str, fit_mode: str, color: object = None) -> AnimatedBitmap | None:
+        """Decoded animation (recolored if ``color`` is given), or ``None`` while it is still being decoded."""
+        source_path, mtime = self._file(relative_path)
+        key = (source_path, mtime, fit_mode)
+        animation = self._cached_animation(key)
+        if animation is None or not color:
+            return animation
+        rgb = parse_hex_color(color if isinstance(color, str) else None, DEFAULT_RECOLOR)
+        return self._variant((source_path, key[1], "solid", rgb, fit_mode), lambda: animation.recolored(rgb))
+
+    def _cached_animation(self, key: tuple[Path, float, str]) -> AnimatedBitmap | None:
+        with self._lock:
+            animation = self._animations.get(key)
+            if animation is not None:
+                self._animations.move_to_end(key)
+                self._stats["animation_hits"] += 1
+                return animation
+            self._stats["animation_misses"] += 1
+            if key in self._failed:
+                raise ValueError(self._failed[key])
+            if key in self._pending:
+                return None
+            self._pending.add(key)
+        if self._executor is None:
+            self._decode(key)
+            return self._cached_animation(key)
+        self._executor.submit(self._decode, key)
+        return None
+
+    def _decode(self, key: tuple[Path, float, str]) -> None:
+        source_path, _, fit_mode = key
+        started = time.perf_counter()
+        try:
+            animation = decode_animation(source_path, fit_mode)
+        except (ValueError, OSError) as exc:
+            self._logger.warning("Bitmap animation %s could not be decoded: %s", source_path.name, exc)
+            with self._lock:
+                self._pending.discard(key)
+                self._failed[key] = str(exc)
+                self._stats["decode_errors"] += 1
+            return
+
+        with self._lock:
+            self._pending.discard(key)
+            self.last_decode_ms = round((time.perf_counter() - started) * 1000, 3)
+            self._stats["animations_decoded"] += 1
+            # Older versions of the same file are stale once a newer mtime was decoded.
+            for stale in [other for other in self._animations if other[0] == source_path and other[1] != key[1]]:
+                self._animation_bytes -= self._animations.pop(stale).nbytes
+            self._animations[key] = animation
+            self._animation_bytes += animation.nbytes
+            # The newest entry always stays, even if it alone exceeds the budget.
+            while self._animation_bytes > self.animation_cache_bytes and len(self._animations) > 1:
+                _, evicted = self._animations.popitem(last=False)
+                self._animation_bytes -= evicted.nbytes
+                self._stats["evictions"] += 1
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            variant_lookups = self._stats["variant_hits"] + self._stats["variant_misses"]
+            return {
+                **self._stats,
+                "decoder": decoder_backend(),
+                "bitmaps": len(self._cache),
+                "bitmap_bytes": self._cache_used_bytes,
+                "bitmap_cache_bytes": self.cache_bytes,
+                "mapped_bytes": sum(bitmap.nbytes for _, bitmap in self._cache.values() if bitmap.mapped),
+                "animations": len(self._animations),
+                "animation_bytes": self._animation_bytes,
+                "animation_cache_bytes": self.animation_cache_bytes,
+                "pending": len(self._pending),
+                "failed": len(self._failed),
+                "last_decode_ms": self.last_decode_ms,
+                "variants": len(self._variants),
+                "variant_bytes": self._variant_bytes,
+                "variant_cache_bytes": self.variant_cache_bytes,
+                "variant_hit_rate": round(self._stats["variant_hits"] / variant_lookups, 3) if variant_lookups else None,
+            }
+
     def render_window(
         self,
         bitmap: BitmapFile,
         scroll_direction: str,
         scroll_speed: float,
         now: float | None = None,
+        width: int = 32,
+        height: int = 8,
     ) -> tuple[list[list[int]], list[list[Color | None]]]:
-        frame = blank_frame(32, 8)
-        colors = blank_color_frame(32, 8)
-        if bitmap.width != 32:
-            return frame, colors
-
-        height = bitmap.height
-        if height <= 0:
-            return frame, colors
-
-        window_start = 0
-        if height > 8:
-            max_start = height - 8
-            speed = max(scroll_speed, 0.25)
-            tick = int((now or time.time()) * speed)
-            cycle = max_start + 1
-            if scroll_direction == "bottom_to_top":
-                window_start = max_start - (tick % cycle)
-            else:
-                window_start = tick % cycle
-
-        for y in range(8):
-            src_y = y + window_start
-            if src_y >= height:
-                break
-            for x in range(32):
-                color = bitmap.pixels[src_y][x]
-                if color is None:
-                    continue
-                frame[y][x] = 1
-                colors[y][x] = color
-
-        return frame, colors
+        """``width`` x ``height`` window of ``bitmap`` at time ``now``; ``scroll_speed`` is in pixels per second.
+
+        ``top_to_bottom``/``bottom_to_top`` move the window over taller images and
+        jump back at the end, ``left_to_right``/``right_to_left`` move it around
+        wider images as an endless ticker, ``pan`` bounces it over both axes.
+        Smaller images sit in the top left corner.
+        """
+        window_width, window_height = width, height
+        width, height = bitmap.width, bitmap.height
+        if width <= 0 or height <= 0 or not bitmap.map_intact():
+            return blank_frame(window_width, window_height), blank_color_frame(window_width, window_height)
+
+        max_x = max(0, width - window_width)
+        max_y = max(0, height - window_height)
+        tick = int((time.time() if now is None else now) * max(scroll_speed, 0.25))
+        window_x = window_y = 0
+        wrap = False
+        if scroll_direction in {"left_to_right", "right_to_left"}:
+            if max_x:
+                wrap = True
+                window_x = tick % width if scroll_direction == "left_to_right" else -tick % width
+        elif scroll_direction == "pan":
+            window_x = _ping_pong(tick, max_x)
+            window_y = _ping_pong(tick, max_y)
+        elif max_y:
+            window_y = max_y - (tick % (max_y + 1)) if scroll_direction == "bottom_to_top" else tick % (max_y + 1)
+
+        stride = window_width * 3
+        window = bytearray(stride * window_height)
+        visible = min(window_width, width - window_x)
+        for y in range(min(window_height, height - window_y)):
+            segment = bitmap.row_rgb(window_y + y, window_x, visible)
+            if wrap and visible < window_width:
+                segment = bytes(segment) + bytes(bitmap.row_rgb(window_y + y, 0, window_width - visible))
+            window[y * stride:y * stride + len(segment)] = segment
+        return unpack_rgb(window, stride, window_width, window_height)
 
     def _resolve(self, relative_path: str) -> Path:
         requested = (self.base_dir / relative_path).resolve()
@@ -86,7 +491,18 @@ class BitmapLoader:
         return requested
 
     @staticmethod
-    def _parse(content: str) -> BitmapFile:
+    def parse(data: bytes) -> BitmapFile:
+        """Parse file contents in any supported static format, without caching."""
+        return BitmapLoader._parse(data)
+
+    @staticmethod
+    def _parse(data: bytes) -> BitmapFile:
+        magic = data[:2]
+        if magic == b"P4":
+            return BitmapLoader._parse_p4(data)
+        if magic == b"P6":
+            return BitmapLoader._parse_p6(data)
+        content = data.decode("utf-8")
         stripped = content.lstrip()
         if stripped.startswith("P1"):
             return BitmapLoader._parse_p1(content)
@@ -95,67 +511,115 @@ class BitmapLoader:
         return BitmapLoader._parse_plain_grid(content)
 
     @staticmethod
-    def _strip_comments_and_tokens(content: str) -> list[str]:
-        tokens: list[str] = []
-        for line in content.splitlines():
-            line = line.split("#", 1)[0].strip()
-            if line:
-                tokens.extend(line.split())
-        return tokens
+    def _netpbm_text(content: str, fields: int) -> tuple[list[str], str]:
+        """Magic plus ``fields`` header tokens and the raster text behind them, comments removed."""
+        parts = re.sub(r"#[^\n]*", "", content).split(None, fields + 1)
+        return parts[:fields + 1], parts[fields + 1] if len(parts) > fields + 1 else ""
+
+    @staticmethod
+    def _netpbm_header(data: bytes, fields: int) -> tuple[list[int], int]:
+        """Header integers after the 2-byte magic and the offset where the binary raster starts."""
+        values: list[int] = []
+        pos = 2
+        size = len(data)
+        while len(values) < fields:
+            while pos < size:
+                if data[pos] == 0x23:
+                    end = data.find(b"\n", pos)
+                    pos = size if end < 0 else end + 1
+                elif data[pos] in NETPBM_WHITESPACE:
+                    pos += 1
+                else:
+                    break
+            start = pos
+            while pos < size and 0x30 <= data[pos] <= 0x39:
+                pos += 1
+            if start == pos:
+                raise ValueError("invalid netpbm header")
+            values.append(int(data[start:pos]))
+        # Exactly one whitespace byte separates the header from the raster.
+        if pos >= size or data[pos] not in NETPBM_WHITESPACE:
+            raise ValueError("invalid netpbm header")
+        return values, pos + 1
 
     @staticmethod
     def _parse_p1(content: str) -> BitmapFile:
-        tokens = BitmapLoader._strip_comments_and_tokens(content)
-        if len(tokens) < 3 or tokens[0] != "P1":
+        header, raster = BitmapLoader._netpbm_text(content, 2)
+        if len(header) < 3 or header[0] != "P1":
             raise ValueError("invalid PBM header (expected P1)")
 
-        width = int(tokens[1])
-        height = int(tokens[2])
+        width = int(header[1])
+        height = int(header[2])
         expected = width * height
-        values = tokens[3:]
-        if len(values) < expected:
+        # Plain PBM allows pixels without separating whitespace ("0110").
+        bits = raster.translate(WHITESPACE_DELETION).encode("ascii")
+        if len(bits) < expected:
             raise ValueError("not enough bitmap pixels in file")
 
-        pixels: list[list[Color | None]] = [[None for _ in range(width)] for _ in range(height)]
-        idx = 0
-        for y in range(height):
-            for x in range(width):
-                pixels[y][x] = (255, 255, 255) if values[idx] == "1" else None
-                idx += 1
+        mono = bits[:expected].translate(P1_TRANSLATION)
+        rgb = bytearray(expected * 3)
+        rgb[0::3] = rgb[1::3] = rgb[2::3] = mono
+        return BitmapFile(width=width, height=height, buffer=bytes(rgb), is_monochrome=True)
 
-        return BitmapFile(width=width, height=height, pixels=pixels, is_monochrome=True)
+    @staticmethod
+    def _parse_p4(data: bytes) -> BitmapFile:
+        (width, height), offset = BitmapLoader._netpbm_header(data, 2)
+        row_bytes = (width + 7) // 8
+        raster = memoryview(data)[offset:offset + row_bytes * height]
+        if len(raster) < row_bytes * height:
+            raise ValueError("not enough bitmap pixels in file")
+
+        # Kept bit-packed; rows are expanded to RGB only for the visible window.
+        return BitmapFile(width=width, height=height, buffer=raster, is_monochrome=True, row_stride=row_bytes, bits_per_pixel=1)
 
     @staticmethod
     def _parse_p3(content: str) -> BitmapFile:
-        tokens = BitmapLoader._strip_comments_and_tokens(content)
-        if len(tokens) < 4 or tokens[0] != "P3":
+        header, raster = BitmapLoader._netpbm_text(content, 3)
+        if len(header) < 4 or header[0] != "P3":
             raise ValueError("invalid PPM header (expected P3)")
 
-        width = int(tokens[1])
-        height = int(tokens[2])
-        max_value = int(tokens[3])
-        if max_value <= 0:
+        width = int(header[1])
+        height = int(header[2])
+        max_value = int(header[3])
+        if not 0 < max_value < 65536:
             raise ValueError("invalid PPM max value")
 
         expected = width * height * 3
-        values = tokens[4:]
-        if len(values) < expected:
+        table = _scale_table(max_value)
+        try:
+            # Values are tokenized lazily; a token list would cost ~50 bytes per sample.
+            values = (match.group() for match in re.finditer(r"\S+", raster))
+            rgb = bytes(map(table.__getitem__, map(int, islice(values, expected))))
+        except IndexError:
+            raise ValueError("PPM color value exceeds max value") from None
+        if len(rgb) < expected:
             raise ValueError("not enough color values in PPM file")
+        return BitmapFile(width=width, height=height, buffer=rgb, is_monochrome=False)
 
-        pixels: list[list[Color | None]] = [[None for _ in range(width)] for _ in range(height)]
-        idx = 0
-        for y in range(height):
-            for x in range(width):
-                r = int(values[idx])
-                g = int(values[idx + 1])
-                b = int(values[idx + 2])
-                idx += 3
-                rr = max(0, min(255, int(round((r / max_value) * 255))))
-                gg = max(0, min(255, int(round((g / max_value) * 255))))
-                bb = max(0, min(255, int(round((b / max_value) * 255))))
-                pixels[y][x] = (rr, gg, bb) if (rr or gg or bb) else None
+    @staticmethod
+    def _parse_p6(data: bytes) -> BitmapFile:
+        (width, height, max_value), offset = BitmapLoader._netpbm_header(data, 3)
+        if not 0 < max_value < 65536:
+            raise ValueError("invalid PPM max value")
+
+        sample_bytes = 1 if max_value < 256 else 2
+        size = width * height * 3 * sample_bytes
+        raster = memoryview(data)[offset:offset + size]
+        if len(raster) < size:
+            raise ValueError("not enough color values in PPM file")
 
-        return BitmapFile(width=width, height=height, pixels=pixels, is_monochrome=False)
+        if max_value == 255:
+            rgb: bytes | memoryview = raster
+        elif sample_bytes == 1:
+            rgb = raster.tobytes().translate(_scale_table(max_value).ljust(256, b"\xff"))
+        else:
+            samples = array("H")
+            samples.frombytes(raster)
+            if sys.byteorder == "little":
+                samples.byteswap()
+            table = _scale_table(max_value)
+            rgb = bytes(table[min(value, max_value)] for value in samples)
+        return BitmapFile(width=width, height=height, buffer=rgb, is_monochrome=False)
 
     @staticmethod
     def _parse_plain_grid(content: str) -> BitmapFile:
@@ -187,7 +651,8 @@ class BitmapLoader:
         if not rows:
             raise ValueError("bitmap file is empty")
 
-        return BitmapFile(width=width, height=len(rows), pixels=rows, is_monochrome=is_monochrome)
+        rgb = b"".join(bytes(px) if px else BLACK for row in rows for px in row)
+        return BitmapFile(width=width, height=len(rows), buffer=rgb, is_monochrome=is_monochrome)
 
     @staticmethod
     def _parse_bit_row(line: str) -> list[Color | None]:
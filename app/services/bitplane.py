@@ -0,0 +1,61 @@
+"""Bitplane helpers for monochrome frame operations.
+
+A frame's lit mask is stored as one int per row (bit ``x`` = column ``x``).
+Slides become row index shifts, mirrors bit reversals through a byte lookup
+table, overlays ORs and change detection a comparison of a few ints. Colors
+stay in the nested ``color_frame`` lists and are only taken over for lit bits.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from functools import lru_cache
+from itertools import compress
+
+Color = tuple[int, int, int]
+Frame = list[list[int]]
+ColorFrame = list[list[Color | None]]
+Planes = tuple[int, ...]
+
+BIT_VALUES = tuple(1 << x for x in range(256))
+REVERSE_BYTE = tuple(int(f"{value:08b}"[::-1], 2) for value in range(256))
+
+
+def pack(frame: Frame) -> Planes:
+    return tuple(sum(compress(BIT_VALUES, row)) for row in frame)
+
+
+@lru_cache(maxsize=4096)
+def row_bits(bits: int, width: int) -> tuple[int, ...]:
+    """0/1 cells of one packed row; cached because rows repeat a lot (glyphs, borders)."""
+    return tuple(bits >> x & 1 for x in range(width))
+
+
+def unpack(planes: Planes, width: int) -> Frame:
+    return [list(row_bits(bits, width)) for bits in planes]
+
+
+def lit(planes: Planes) -> Iterator[tuple[int, int]]:
+    """Yield ``(x, y)`` for every lit bit, row by row, lowest column first."""
+    for y, bits in enumerate(planes):
+        while bits:
+            low = bits & -bits
+            yield low.bit_length() - 1, y
+            bits ^= low
+
+
+def reverse_bits(bits: int, width: int) -> int:
+    """Mirror a row of ``width`` columns using the byte reversal table."""
+    nbytes = (width + 7) // 8
+    out = 0
+    for _ in range(nbytes):
+        out = (out << 8) | REVERSE_BYTE[bits & 0xFF]
+        bits >>= 8
+    return out >> (nbytes * 8 - width)
+
+
+def masked_colors(colors: list[Color | None], bits: int, width: int) -> list[Color | None]:
+    """Keep colors of lit bits only."""
+    if not bits:
+        return [None] * width
+    return [color if on else None for color, on in zip(colors, row_bits(bits, width))]
@@ -1,3 +1,6 @@
+import colorsys
+from functools import lru_cache
+
 
 def parse_hex_color(value: str | None, fallback: tuple[int, int, int]) -> tuple[int, int, int]:
     if not value:
@@ -22,3 +25,74 @@ def lerp_color(a: tuple[int, int, int], b: tuple[int, int, int], t: float) -> tu
         int(a[1] + (b[1] - a[1]) * t),
         int(a[2] + (b[2] - a[2]) * t),
     )
+
+
+PALETTE_LUT_SIZE = 256
+HUE_LUT_SIZE = 1024
+
+
+def scale_color(color: tuple[int, int, int], factor: float) -> tuple[int, int, int]:
+    return (
+        max(0, min(255, int(round(color[0] * factor)))),
+        max(0, min(255, int(round(color[1] * factor)))),
+        max(0, min(255, int(round(color[2] * factor)))),
+    )
+
+
+def _quantize_intensity(intensity: float) -> float:
+    # Bounds the number of cached tables when intensity comes from a continuous slider.
+    return round(max(0.0, min(1.0, float(intensity))), 3)
+
+
+@lru_cache(maxsize=64)
+def _palette_lut(colors: tuple[tuple[int, int, int], ...], intensity: float) -> tuple[tuple[int, int, int], ...]:
+    count = len(colors)
+    table = []
+    for idx in range(PALETTE_LUT_SIZE):
+        scaled = idx / PALETTE_LUT_SIZE * count
+        pos = int(scaled)
+        a = colors[pos % count]
+        b = colors[(pos + 1) % count]
+        amount = scaled - pos
+        mixed = tuple(max(0, min(255, int(round(a[i] + (b[i] - a[i]) * amount)))) for i in range(3))
+        table.append(scale_color(mixed, intensity))
+    return tuple(table)
+
+
+def palette_lut(colors, intensity: float = 1.0) -> tuple[tuple[int, int, int], ...]:
+    """Return the cyclic palette gradient sampled into ``PALETTE_LUT_SIZE`` entries.
+
+    Tables are built lazily per (palette, intensity) and cached; index with
+    ``int((value % 1.0) * PALETTE_LUT_SIZE)``.
+    """
+    return _palette_lut(tuple(tuple(color) for color in colors), _quantize_intensity(intensity))
+
+
+@lru_cache(maxsize=64)
+def _scaled_palette(colors: tuple[tuple[int, int, int], ...], intensity: float) -> tuple[tuple[int, int, int], ...]:
+    return tuple(scale_color(color, intensity) for color in colors)
+
+
+def scaled_palette(colors, intensity: float = 1.0) -> tuple[tuple[int, int, int], ...]:
+    """Return the raw palette entries with intensity applied, cached per (palette, intensity)."""
+    return _scaled_palette(tuple(tuple(color) for color in colors), _quantize_intensity(intensity))
+
+
+@lru_cache(maxsize=16)
+def hue_lut(saturation: float = 1.0) -> tuple[tuple[int, int, int], ...]:
+    """Return the full-value hue wheel sampled into ``HUE_LUT_SIZE`` entries.
+
+    Multiply an entry with ``scale_color`` to apply the HSV value component.
+    """
+    saturation = max(0.0, min(1.0, float(saturation)))
+    table = []
+    for idx in range(HUE_LUT_SIZE):
+        r, g, b = colorsys.hsv_to_rgb(idx / HUE_LUT_SIZE, saturation, 1.0)
+        table.append((round(r * 255), round(g * 255), round(b * 255)))
+    return tuple(table)
+
+
+def lut_lookup(table, value: float) -> tuple[int, int, int]:
+    """Pick the entry for a cyclic position ``value`` (wraps modulo 1.0)."""
+    size = len(table)
+    return table[int((value % 1.0) * size) % size]
@@ -0,0 +1,317 @@
+"""Layered frame compositor.
+
+The display output is a stack of layers ordered by ``z``: the module frame at
+the bottom, small overlay widgets (seconds border, notification badge, status
+dots) above it and a full-screen override (manual text/pixels, debug
+patterns) on top. Every layer keeps its lit mask as bitplanes plus either one
+color or a per-pixel color frame, and a version that only increases when its
+content really changed. The composed frame is cached by the tuple of layer
+versions, so a tick where nothing moved costs one tuple comparison.
+
+Overlays are folded in a single pass over the union of their lit bits; pixels
+no overlay touches are taken over from the base rows unchanged. Static overlay
+masks (border states, badge shapes) are precomputed and shared.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import compress
+
+from app.services import bitplane
+
+Color = tuple[int, int, int]
+Frame = list[list[int]]
+ColorFrame = list[list[Color | None]]
+
+BLEND_MODES = {"normal", "add", "multiply", "replace"}
+DEFAULT_PIXEL_COLOR = (80, 80, 80)
+BLACK = (0, 0, 0)
+
+BORDER_MODES = {"linear", "two_forward_one_back", "dual_edge"}
+BADGE_CORNERS = {"top_right", "top_left", "bottom_right", "bottom_left"}
+BADGE_SIZE = 3
+
+
+@dataclass
+class Layer:
+    name: str
+    z: int
+    blend: str = "normal"
+    alpha: float = 1.0
+    planes: bitplane.Planes = ()
+    # One color for the whole mask, or a per-pixel color frame.
+    colors: Color | ColorFrame | None = None
+    frame: Frame | None = None
+    visible: bool = False
+    version: int = 0
+
+
+class Compositor:
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self._layers: dict[str, Layer] = {}
+        self._stack: list[Layer] = []
+        self._composed_key: tuple | None = None
+        self.frame: Frame = [[0] * width for _ in range(height)]
+        self.color_frame: ColorFrame = [[None] * width for _ in range(height)]
+        self.planes: bitplane.Planes = (0,) * height
+        # Increases whenever the composed output differs from the previous one.
+        self.version = 0
+        self.compositions = 0
+        self.cached_compositions = 0
+
+    def add_layer(self, name: str, z: int, blend: str = "normal", alpha: float = 1.0) -> Layer:
+        if blend not in BLEND_MODES:
+            raise ValueError(f"unknown blend mode: {blend}")
+        layer = self._layers[name] = Layer(name=name, z=z, blend=blend, alpha=max(0.0, min(1.0, alpha)))
+        self._stack = sorted(self._layers.values(), key=lambda item: item.z)
+        return layer
+
+    def set_frame(self, name: str, frame: Frame, color_frame: ColorFrame) -> None:
+        """Per-pixel layer content; only marks the layer dirty if mask or colors differ."""
+        layer = self._layers[name]
+        planes = bitplane.pack(frame)
+        if layer.visible and planes == layer.planes and color_frame == layer.colors:
+            return
+        # Copied: modules may hand out the same (cached) lists again on later ticks.
+        layer.planes = planes
+        layer.frame = [row[:] for row in frame]
+        layer.colors = [row[:] for row in color_frame]
+        layer.visible = True
+        layer.version += 1
+
+    def blit(self, name: str, x0: int, y0: int, frame: Frame, color_frame: ColorFrame) -> None:
+        """Write a rectangle into a per-pixel layer; the rest of the layer keeps its content."""
+        layer = self._layers[name]
+        if not layer.visible or layer.frame is None:
+            layer.frame = [[0] * self.width for _ in range(self.height)]
+            layer.colors = [[None] * self.width for _ in range(self.height)]
+            layer.planes = (0,) * self.height
+            layer.visible = True
+            layer.version += 1
+        planes = list(layer.planes)
+        for dy, (frame_row, color_row) in enumerate(zip(frame, color_frame)):
+            y = y0 + dy
+            end = x0 + len(frame_row)
+            layer.frame[y][x0:end] = frame_row
+            layer.colors[y][x0:end] = color_row
+            planes[y] = sum(compress(bitplane.BIT_VALUES, layer.frame[y]))
+        layer.planes = tuple(planes)
+        layer.version += 1
+
+    def set_mask(self, name: str, planes: bitplane.Planes, color: Color) -> None:
+        """Mask layer in one color, e.g. a precomputed overlay state."""
+        layer = self._layers[name]
+        if layer.visible and planes == layer.planes and color == layer.colors:
+            return
+        layer.planes = planes
+        layer.frame = None
+        layer.colors = color
+        layer.visible = True
+        layer.version += 1
+
+    def set_alpha(self, name: str, alpha: float) -> None:
+        layer = self._layers[name]
+        alpha = max(0.0, min(1.0, alpha))
+        if alpha != layer.alpha:
+            layer.alpha = alpha
+            layer.version += 1
+
+    def clear(self, name: str) -> None:
+        layer = self._layers[name]
+        if layer.visible:
+            layer.visible = False
+            layer.version += 1
+
+    def is_visible(self, name: str) -> bool:
+        return self._layers[name].visible
+
+    def compose(self) -> tuple[Frame, ColorFrame]:
+        visible = [layer for layer in self._stack if layer.visible and layer.alpha > 0]
+        key = tuple((layer.name, layer.version) for layer in visible)
+        if key == self._composed_key:
+            self.cached_compositions += 1
+            return self.frame, self.color_frame
+        self._composed_key = key
+        self.compositions += 1
+
+        # An opaque full-screen layer hides everything below it.
+        for idx in range(len(visible) - 1, -1, -1):
+            if visible[idx].blend == "replace" and visible[idx].alpha >= 1.0:
+                visible = visible[idx:]
+                break
+
+        if not visible:
+            frame, color_frame = [[0] * self.width for _ in range(self.height)], [[None] * self.width for _ in range(self.height)]
+        else:
+            frame, color_frame = self._fold(visible[0], visible[1:])
+        planes = bitplane.pack(frame)
+        if planes != self.planes or color_frame != self.color_frame:
+            self.version += 1
+        self.frame, self.color_frame, self.planes = frame, color_frame, planes
+        return frame, color_frame
+
+    def _fold(self, base: Layer, overlays: list[Layer]) -> tuple[Frame, ColorFrame]:
+        width, height = self.width, self.height
+        base_frame = base.frame if base.frame is not None else bitplane.unpack(base.planes, width)
+        base_colors = base.colors
+        if not isinstance(base_colors, list):
+            base_colors = [bitplane.masked_colors([base_colors] * width, bits, width) for bits in base.planes]
+        if not overlays:
+            # Copies: ``blit`` edits the base layer's rows in place, so handing out (and later comparing
+            # against) the layer's own lists would hide color-only changes from the output version.
+            return [row[:] for row in base_frame], [row[:] for row in base_colors]
+
+        full = (1 << width) - 1
+        masks = [(full,) * height if layer.blend == "replace" else layer.planes for layer in overlays]
+        union = [0] * height
+        for planes in masks:
+            union = [acc | bits for acc, bits in zip(union, planes)]
+
+        frame = [row[:] for row in base_frame]
+        color_frame = [row[:] for row in base_colors]
+        for x, y in bitplane.lit(tuple(union)):
+            bit = 1 << x
+            color = (color_frame[y][x] or DEFAULT_PIXEL_COLOR) if frame[y][x] else BLACK
+            for layer, planes in zip(overlays, masks):
+                if not planes[y] & bit:
+                    continue
+                if not layer.planes[y] & bit:
+                    src = BLACK  # unlit pixel of a full-screen layer
+                elif isinstance(layer.colors, tuple):
+                    src = layer.colors
+                else:
+                    src = layer.colors[y][x] or DEFAULT_PIXEL_COLOR
+                color = _blend(color, src, layer.blend, layer.alpha)
+            if color == BLACK:
+                frame[y][x] = 0
+                color_frame[y][x] = None
+            else:
+                frame[y][x] = 1
+                color_frame[y][x] = color
+        return frame, color_frame
+
+    def get_stats(self) -> dict:
+        return {
+            "layers": [
+                {"name": layer.name, "z": layer.z, "blend": layer.blend, "alpha": layer.alpha, "visible": layer.visible, "version": layer.version}
+                for layer in self._stack
+            ],
+            "compositions": self.compositions,
+            "cached_compositions": self.cached_compositions,
+            "output_version": self.version,
+        }
+
+
+def _blend(dst: Color, src: Color, mode: str, alpha: float) -> Color:
+    if mode == "add":
+        out = (dst[0] + src[0], dst[1] + src[1], dst[2] + src[2])
+    elif mode == "multiply":
+        out = (dst[0] * src[0] // 255, dst[1] * src[1] // 255, dst[2] * src[2] // 255)
+    else:
+        out = src
+    if alpha < 1.0:
+        keep = 1.0 - alpha
+        out = (dst[0] * keep + out[0] * alpha, dst[1] * keep + out[1] * alpha, dst[2] * keep + out[2] * alpha)
+    return (min(255, int(round(out[0]))), min(255, int(round(out[1]))), min(255, int(round(out[2]))))
+
+
+def border_path(width: int, height: int) -> list[tuple[int, int]]:
+    """Clockwise 1px frame starting top-left."""
+    path: list[tuple[int, int]] = []
+    for x in range(width):
+        path.append((x, 0))
+    for y in range(1, height):
+        path.append((width - 1, y))
+    for x in range(width - 2, -1, -1):
+        path.append((x, height - 1))
+    for y in range(height - 2, 0, -1):
+        path.append((0, y))
+    return path
+
+
+def border_progress(seconds: int, mode: str, path_len: int) -> int:
+    seconds = max(0, min(59, seconds))
+    if path_len <= 0:
+        return 0
+    if mode == "two_forward_one_back":
+        steps = round((seconds / 59) * (path_len * 3))
+        cycles, rest = divmod(steps, 3)
+        progress = cycles
+        if rest == 1:
+            progress += 1
+        elif rest == 2:
+            progress += 2
+    else:
+        progress = round((seconds / 59) * path_len)
+    return max(0, min(path_len, progress))
+
+
+@lru_cache(maxsize=8)
+def border_masks(mode: str, width: int, height: int) -> tuple[bitplane.Planes, ...]:
+    """All 60 seconds-border states of ``mode``, indexed by second."""
+    path = border_path(width, height)
+    masks = []
+    for second in range(60):
+        progress = border_progress(second, mode, len(path))
+        if mode == "dual_edge":
+            half = len(path) // 2
+            left = progress // 2
+            right = progress - left
+            indices = set(range(left))
+            indices.update((half + idx) % len(path) for idx in range(right))
+        else:
+            indices = set(range(progress))
+        rows = [0] * height
+        for idx in indices:
+            x, y = path[idx]
+            rows[y] |= 1 << x
+        masks.append(tuple(rows))
+    return tuple(masks)
+
+
+@lru_cache(maxsize=8)
+def badge_mask(corner: str, width: int, height: int, size: int = BADGE_SIZE) -> bitplane.Planes:
+    """Filled ``size`` x ``size`` square in one corner."""
+    x0 = width - size if corner.endswith("right") else 0
+    y0 = height - size if corner.startswith("bottom") else 0
+    bits = ((1 << size) - 1) << x0
+    return tuple(bits if y0 <= y < y0 + size else 0 for y in range(height))
+
+
+def dots_mask(count: int, width: int, height: int) -> bitplane.Planes:
+    """``count`` status dots in the bottom-right corner, two columns apart, right to left."""
+    row = 0
+    for idx in range(max(0, count)):
+        x = width - 1 - idx * 2
+        if x < 0:
+            break
+        row |= 1 << x
+    return tuple(row if y == height - 1 else 0 for y in range(height))
+
+
+def blit_sprite(frame: Frame, color_frame: ColorFrame, sprite, x0: int, y0: int, color: Color | None = None) -> None:
+    """Draw a packed atlas sprite into ``frame``/``color_frame`` in place, clipped to the frame.
+
+    Lit sprite pixels overwrite the frame (in ``color`` if given, else their
+    own color); unlit ones leave it untouched.
+    """
+    height = len(frame)
+    width = len(frame[0]) if height else 0
+    visible = (1 << width) - 1
+    for dy, bits in enumerate(sprite.planes):
+        y = y0 + dy
+        if not 0 <= y < height or not bits:
+            continue
+        shifted = (bits << x0 if x0 >= 0 else bits >> -x0) & visible
+        frame_row = frame[y]
+        color_row = color_frame[y]
+        while shifted:
+            low = shifted & -shifted
+            x = low.bit_length() - 1
+            frame_row[x] = 1
+            color_row[x] = color or sprite.color(x - x0, dy)
+            shifted ^= low
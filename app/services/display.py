@@ -2,25 +2,38 @@ import asyncio
 import logging
 import time
 from collections.abc import Callable
+from itertools import chain
 from datetime import datetime
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from app.models import ModuleConfig
-from app.modules.base import ModulePayload
+from app.modules.base import ModulePayload, SpriteRef, frame_time
 from app.modules.btc import BTCModule
 from app.modules.clock import ClockModule
 from app.modules.weather import WeatherModule
 from app.modules.textbox import TextBoxModule
 from app.modules.bitmap import BitmapModule
 from app.modules.animations import AnimationsModule
+from app.modules.automata import AutomataModule
+from app.modules.expression import ExpressionModule
+from app.modules.video import VideoModule
 from app.services.led_driver import LEDDriver
 from app.services.led_mapper import LEDMapper
 from app.services.colors import parse_hex_color
-from app.services.animations import ANIMATION_FACTORIES
-from app.services.rendering import blank_color_frame, render_text_with_colors
+from app.services import bitplane, compositor, postprocess
+from app.services.animations import ANIMATION_FACTORIES, ANIMATION_PERIODS
+from app.services.frame_cache import PeriodicFrameCache
+from app.services.frame_clock import RealClock
+from app.services.render_budget import RenderBudget
+from app.services.timeline import PlaylistTimeline
+from app.services.transitions import TransitionEngine
+from app.services.zones import ZoneLayout
+from app.services.rendering import blank_color_frame, blank_frame, measure_text_width, render_text_with_colors
+from app.services.bitmap_library import BitmapLibrary
 from app.services.bitmap_loader import BitmapLoader
+from app.services.sprites import SpriteLibrary
 from app.config import get_settings
 
 MODULE_REGISTRY = {
@@ -30,6 +43,9 @@ MODULE_REGISTRY = {
     "textbox": TextBoxModule(),
     "bitmap": BitmapModule(),
     "animations": AnimationsModule(),
+    "expression": ExpressionModule(),
+    "automata": AutomataModule(),
+    "video": VideoModule(),
 }
 
 DEBUG_COLORS = {
@@ -49,34 +65,10 @@ def _safe_int(value: object, fallback: int) -> int:
         return fallback
 
 
-def _clock_border_path(width: int = 32, height: int = 8) -> list[tuple[int, int]]:
-    path: list[tuple[int, int]] = []
-    for x in range(width):
-        path.append((x, 0))
-    for y in range(1, height):
-        path.append((width - 1, y))
-    for x in range(width - 2, -1, -1):
-        path.append((x, height - 1))
-    for y in range(height - 2, 0, -1):
-        path.append((0, y))
-    return path
-
-
-def _clock_border_progress(seconds: int, mode: str, path_len: int) -> int:
-    seconds = max(0, min(59, seconds))
-    if path_len <= 0:
-        return 0
-    if mode == "two_forward_one_back":
-        steps = round((seconds / 59) * (path_len * 3))
-        cycles, rest = divmod(steps, 3)
-        progress = cycles
-        if rest == 1:
-            progress += 1
-        elif rest == 2:
-            progress += 2
-    else:
-        progress = round((seconds / 59) * path_len)
-    return max(0, min(path_len, progress))
+def _content_key(frame: list[list[int]], color_frame: list[list[tuple[int, int, int] | None]]) -> tuple:
+    """Cheap identity of a frame's content: lit mask as bitplanes plus a hash of the colors."""
+    return bitplane.pack(frame), hash(tuple(chain.from_iterable(color_frame)))
+
 
 class DisplayService:
     def __init__(
@@ -87,19 +79,61 @@ class DisplayService:
         cache_provider: Callable[[], dict],
         fps: int,
         bitmap_loader: BitmapLoader,
+        bitmap_library: BitmapLibrary | None = None,
+        sprite_library: SpriteLibrary | None = None,
+        frame_cache_bytes: int = 512 * 1024,
+        render_budget_ms: float = 0.0,
+        overlay_status_dots: bool = False,
+        layout_file: str | None = None,
+        clock=None,
+        width: int = 32,
+        height: int = 8,
     ):
         self._logger = logging.getLogger(__name__)
+        # Canvas size; modules rendering a fixed 32x8 frame are placed in its top-left corner.
+        self.width = width
+        self.height = height
         self.session_factory = session_factory
         self.led_driver = led_driver
         self.mapper = mapper
         self.cache_provider = cache_provider
         self.frame_delay = 1 / fps
+        # Read once per tick; every renderer gets that frame time instead of asking the wall clock itself.
+        self.clock = clock or RealClock()
+        self.frame_time: float | None = None
         self.bitmap_loader = bitmap_loader
+        self.bitmap_library = bitmap_library
+        # Atlases are loaded on the first frame that references them and shared by all modules.
+        self.sprite_library = sprite_library or SpriteLibrary()
         self.target_fps = fps
+        self.frame_cache = PeriodicFrameCache(fps=fps, max_bytes=frame_cache_bytes)
+        for module in MODULE_REGISTRY.values():
+            module.frame_cache = self.frame_cache
+        # 0 = automatic: half of the frame period is left for the module render.
+        self.render_budget = RenderBudget(render_budget_ms if render_budget_ms > 0 else self.frame_delay * 500)
+        self._last_module_frames: dict[str, tuple[list[list[int]], list[list[tuple[int, int, int] | None]]]] = {}
         self._running = False
         self._task: asyncio.Task | None = None
         self.manual_override: tuple[list[list[int]], list[list[tuple[int, int, int] | None]], float] | None = None
         self.debug_override: tuple[str, float, float] | None = None
+        self.notification: tuple[tuple[int, int, int], float, str] | None = None
+        self.overlay_status_dots = overlay_status_dots
+        self.compositor = compositor.Compositor(width, height)
+        self.compositor.add_layer("base", 0)
+        self.compositor.add_layer("seconds_border", 10)
+        self.compositor.add_layer("status_dots", 20)
+        self.compositor.add_layer("badge", 30, alpha=0.9)
+        self.compositor.add_layer("override", 100, blend="replace")
+        self._sent_version: int | None = None
+        self._overlay_settings: dict | None = None
+        self._effect_chains: dict[tuple[str, int, int], tuple[object, postprocess.EffectChain]] = {}
+        self.zones = ZoneLayout(layout_file, width, height)
+        self.timeline: PlaylistTimeline | None = None
+        self._timeline_source = None
+        self._timeline_signature: list | None = None
+        self._zones_were_active = False
+        self._module_settings_cache: dict[str, dict] | None = None
+        self._module_settings_cache_perf_ts: float | None = None
 
         self.last_frame_ts: float | None = None
         self.last_loop_error: str | None = None
@@ -116,13 +150,17 @@ class DisplayService:
         self.started_at = time.time()
         self.last_source = "module"
         self.last_module_key: str | None = None
-        self.last_frame: list[list[int]] = [[0 for _ in range(32)] for _ in range(8)]
-        self.last_color_frame: list[list[tuple[int, int, int] | None]] = blank_color_frame(32, 8)
-        self.transition_state: dict | None = None
+        self.last_frame: list[list[int]] = blank_frame(width, height)
+        self.last_planes: bitplane.Planes = (0,) * height
+        self.last_color_frame: list[list[tuple[int, int, int] | None]] = blank_color_frame(width, height)
+        self.transitions = TransitionEngine(fps)
+        self._target_changed_last_tick = False
         self.last_target_key: str | None = None
-        self.last_target_frame: list[list[int]] = [[0 for _ in range(32)] for _ in range(8)]
-        self.last_target_colors: list[list[tuple[int, int, int] | None]] = blank_color_frame(32, 8)
-        self.clock_border_path = _clock_border_path(32, 8)
+        self.last_target_frame: list[list[int]] = blank_frame(width, height)
+        self.last_target_colors: list[list[tuple[int, int, int] | None]] = blank_color_frame(width, height)
+        # Content key of the last target frame and the module output it was computed from.
+        self._last_target_content: tuple | None = None
+        self._last_target_source: tuple | None = None
         self.last_cache_snapshot: dict = {}
         self.last_cache_snapshot_ts: float | None = None
         self._module_rows_cache: list | None = None
@@ -184,6 +222,9 @@ class DisplayService:
         if self._task:
             self._task.cancel()
             await asyncio.gather(self._task, return_exceptions=True)
+        self.frame_cache.shutdown()
+        self.bitmap_loader.shutdown()
+        MODULE_REGISTRY["video"].shutdown()
 
     async def _get_enabled_module_rows(self):
         now_perf = time.perf_counter()
@@ -210,8 +251,31 @@ class DisplayService:
         self._module_rows_cache_perf_ts = time.perf_counter()
         self.last_module_query_ms = round((self._module_rows_cache_perf_ts - query_start) * 1000, 3)
         self.last_module_query_cache_hit = False
+        if self.bitmap_library is not None:
+            # Config changes show up here first; newly referenced bitmaps get parsed off the render loop.
+            self.bitmap_library.want([row["settings"] or {} for row in rows if row["key"] == "bitmap"])
         return rows
 
+    def set_zone_layout(self, spec: list[dict]):
+        self.zones.set_layout(spec)
+        self._zones_were_active = False
+
+    async def _get_module_settings_by_key(self) -> dict[str, dict]:
+        """Settings of all modules (enabled or not) for zone playlists; cached like the enabled rows."""
+        now_perf = time.perf_counter()
+        if (
+            self._module_settings_cache is not None
+            and self._module_settings_cache_perf_ts is not None
+            and (now_perf - self._module_settings_cache_perf_ts) < self.module_rows_cache_ttl_s
+        ):
+            return self._module_settings_cache
+
+        async with self.session_factory() as db:
+            rows = (await db.execute(ModuleConfig.__table__.select())).mappings().all()
+        self._module_settings_cache = {row["key"]: row["settings"] or {} for row in rows}
+        self._module_settings_cache_perf_ts = time.perf_counter()
+        return self._module_settings_cache
+
     def set_manual_text(
         self,
         text: str,
@@ -228,22 +292,24 @@ class DisplayService:
             base_color=parsed_color,
             x_offset=x_offset,
             y_offset=y_offset,
+            width=self.width,
+            height=self.height,
         )
-        self.manual_override = (frame, color_frame, time.time() + seconds)
+        self.manual_override = (frame, color_frame, self.clock.now() + seconds)
 
     def set_manual_pixels(self, pixels: list[list[int]], seconds: int):
-        color_frame = blank_color_frame(32, 8)
-        for y in range(8):
-            for x in range(32):
+        color_frame = blank_color_frame(self.width, self.height)
+        for y in range(self.height):
+            for x in range(self.width):
                 if pixels[y][x]:
                     color_frame[y][x] = (240, 240, 240)
-        self.manual_override = (pixels, color_frame, time.time() + seconds)
+        self.manual_override = (pixels, color_frame, self.clock.now() + seconds)
 
     def set_brightness(self, value: int):
         self.led_driver.set_brightness(value)
 
     def set_debug_pattern(self, pattern: str, seconds: int, interval_ms: int = 250):
-        self.debug_override = (pattern, time.time() + seconds, max(interval_ms / 1000.0, 0.05))
+        self.debug_override = (pattern, self.clock.now() + seconds, max(interval_ms / 1000.0, 0.05))
 
     def clear_debug_pattern(self):
         self.debug_override = None
@@ -251,6 +317,14 @@ class DisplayService:
     def clear_manual_override(self):
         self.manual_override = None
 
+    def set_notification(self, color: str, seconds: int, corner: str = "top_right"):
+        if corner not in compositor.BADGE_CORNERS:
+            corner = "top_right"
+        self.notification = (parse_hex_color(color, (255, 60, 60)), self.clock.now() + seconds, corner)
+
+    def clear_notification(self):
+        self.notification = None
+
     def get_preview_frame(self) -> list[list[int]]:
         return [row[:] for row in self.last_frame]
 
@@ -283,8 +357,35 @@ class DisplayService:
             "debug_until": self.debug_override[1] if self.debug_override else None,
             "manual_active": bool(self.manual_override),
             "manual_until": self.manual_override[2] if self.manual_override else None,
+            "notification_until": self.notification[1] if self.notification else None,
+            "clock": self.clock.get_stats(),
+            "frame_time": self.frame_time,
             "cache_snapshot_ts": self.last_cache_snapshot_ts,
             "cache_snapshot_keys": sorted(list(self.last_cache_snapshot.keys())),
+            "frame_cache": self.frame_cache.get_stats(),
+            "bitmaps": self.bitmap_loader.get_stats(),
+            "bitmap_library": self.bitmap_library.get_stats() if self.bitmap_library is not None else None,
+            "sprites": self.sprite_library.get_stats(),
+            "render_budget": self.render_budget.get_snapshot(),
+            "particles": MODULE_REGISTRY["animations"].particle_stats(),
+            "automata": MODULE_REGISTRY["automata"].get_stats(),
+            "video": MODULE_REGISTRY["video"].get_stats(),
+            "transitions": self.transitions.get_stats(),
+            "compositor": self.compositor.get_stats(),
+            "zones": self.zones.get_stats(),
+            "playlist": self._playlist_status(),
+        }
+
+    def _playlist_status(self) -> dict | None:
+        if self.timeline is None:
+            return None
+        now = self.clock.now()
+        return {
+            **self.timeline.get_stats(),
+            "upcoming": [
+                {"at": round(start, 3), "module": position.row["key"]}
+                for start, position in self.timeline.upcoming(now, 120)[:8]
+            ],
         }
 
     def get_live_data_snapshot(self) -> dict:
@@ -315,78 +416,56 @@ class DisplayService:
         }
 
 
-    @staticmethod
-    def _slide_vertical(
-        from_frame: list[list[int]],
-        from_colors: list[list[tuple[int, int, int] | None]],
-        to_frame: list[list[int]],
-        to_colors: list[list[tuple[int, int, int] | None]],
-        progress: float,
-        direction: str,
-    ) -> tuple[list[list[int]], list[list[tuple[int, int, int] | None]]]:
-        progress = max(0.0, min(1.0, progress))
-        shift = int(round(progress * 8))
-        out_frame = [[0 for _ in range(32)] for _ in range(8)]
-        out_colors = blank_color_frame(32, 8)
-
-        if direction == "down":
-            old_shift = shift
-            new_shift = shift - 8
-        else:
-            old_shift = -shift
-            new_shift = 8 - shift
-
-        for y in range(8):
-            oy = y - old_shift
-            ny = y - new_shift
-            for x in range(32):
-                if 0 <= oy < 8 and from_frame[oy][x]:
-                    out_frame[y][x] = 1
-                    out_colors[y][x] = from_colors[oy][x]
-                if 0 <= ny < 8 and to_frame[ny][x]:
-                    out_frame[y][x] = 1
-                    out_colors[y][x] = to_colors[ny][x]
-
-        return out_frame, out_colors
-
-    def _apply_clock_border_seconds(
-        self,
-        frame: list[list[int]],
-        color_frame: list[list[tuple[int, int, int] | None]],
-        settings: dict,
-    ) -> tuple[list[list[int]], list[list[tuple[int, int, int] | None]]]:
-        mode = str(settings.get("seconds_border_mode", "off")).strip().lower()
-        if mode not in {"off", "linear", "two_forward_one_back", "dual_edge"}:
-            mode = "off"
-        if mode == "off":
-            return frame, color_frame
+    def _playlist_timeline(self, rows) -> PlaylistTimeline:
+        """Timeline of the enabled rows, recompiled only when keys, durations or settings changed."""
+        if rows is self._timeline_source:
+            return self.timeline
+        signature = [(row["key"], row["duration_seconds"], row["settings"]) for row in rows]
+        if self.timeline is None or signature != self._timeline_signature:
+            self.timeline = PlaylistTimeline([dict(row) for row in rows], get_settings().tz)
+            self._timeline_signature = signature
+        self._timeline_source = rows
+        return self.timeline
+
+    def _effect_chain(self, module_key: str, effects: object, width: int | None = None, height: int | None = None) -> postprocess.EffectChain:
+        """Compiled post-processing chain of a module for a render size, recompiled only when its effect list changes."""
+        size = (width or self.width, height or self.height)
+        cached = self._effect_chains.get((module_key, *size))
+        if cached is None or cached[0] != effects:
+            cached = self._effect_chains[(module_key, *size)] = (effects, postprocess.compile_chain(effects, *size))
+        return cached[1]
+
+    def _update_seconds_border(self, settings: dict | None, now: float) -> None:
+        """Show the precomputed border state for the current second while the clock is on screen."""
+        mode = str((settings or {}).get("seconds_border_mode", "off")).strip().lower()
+        if settings is None or mode not in compositor.BORDER_MODES:
+            self.compositor.clear("seconds_border")
+            return
 
         border_color = parse_hex_color(settings.get("seconds_border_color"), (60, 200, 255))
         tz_name = settings.get("timezone", get_settings().tz)
         try:
-            now_sec = datetime.now(ZoneInfo(tz_name)).second
+            now_sec = datetime.fromtimestamp(now, ZoneInfo(tz_name)).second
         except ZoneInfoNotFoundError:
-            now_sec = datetime.now(ZoneInfo(get_settings().tz)).second
-
-        progress = _clock_border_progress(now_sec, mode, len(self.clock_border_path))
-        if progress <= 0:
-            return frame, color_frame
-
-        if mode == "dual_edge":
-            half = len(self.clock_border_path) // 2
-            left = progress // 2
-            right = progress - left
-            indices = set(range(left))
-            indices.update(((half + idx) % len(self.clock_border_path)) for idx in range(right))
-        else:
-            indices = set(range(progress))
-
-        for idx in indices:
-            x, y = self.clock_border_path[idx]
-            frame[y][x] = 1
-            color_frame[y][x] = border_color
-
-        return frame, color_frame
+            now_sec = datetime.fromtimestamp(now, ZoneInfo(get_settings().tz)).second
+        self.compositor.set_mask("seconds_border", compositor.border_masks(mode, self.width, self.height)[now_sec], border_color)
+
+    def _update_status_dots(self, live_cache: dict) -> None:
+        """One red dot per data source whose last poll failed."""
+        failing = sum(1 for key in ("btc_error", "weather_error", "dht_error") if live_cache.get(key))
+        if not self.overlay_status_dots or not failing:
+            self.compositor.clear("status_dots")
+            return
+        self.compositor.set_mask("status_dots", compositor.dots_mask(failing, self.width, self.height), (255, 40, 40))
+
+    def _update_badge(self, now: float) -> None:
+        if self.notification and now > self.notification[1]:
+            self.notification = None
+        if not self.notification:
+            self.compositor.clear("badge")
+            return
+        color, _, corner = self.notification
+        self.compositor.set_mask("badge", compositor.badge_mask(corner, self.width, self.height), color)
 
     async def _loop(self):
         while self._running:
@@ -394,27 +473,20 @@ class DisplayService:
             try:
                 frame, color_frame = await self._get_next_frame()
                 force_frame_send = bool(getattr(self.led_driver, "should_force_frame_send", lambda: False)())
-                frame_changed = force_frame_send or frame != self.last_frame or color_frame != self.last_color_frame
+                planes = self.compositor.planes
+                # The compositor bumps its output version only when the composed frame really changed.
+                frame_changed = force_frame_send or self.compositor.version != self._sent_version
                 if frame_changed:
-                    index_to_color: dict[int, tuple[int, int, int]] = {}
-                    for y, row in enumerate(frame):
-                        for x, val in enumerate(row):
-                            if not val:
-                                continue
-                            led_index = self.mapper.xy_to_index(x, y)
-                            color = color_frame[y][x] if color_frame and color_frame[y][x] else (80, 80, 80)
-                            index_to_color[led_index] = color
-
-                    led_write_started = time.perf_counter()
-                    self.led_driver.write_color_frame(index_to_color)
-                    self.last_led_write_ms = round((time.perf_counter() - led_write_started) * 1000, 3)
+                    self.write_leds(planes, color_frame)
                     self.last_led_frame_sent = True
+                    self._sent_version = self.compositor.version
+                    self.last_planes = planes
+                    self.last_frame = [row[:] for row in frame]
+                    self.last_color_frame = [row[:] for row in color_frame]
                 else:
                     self.unchanged_frame_skips += 1
                     self.last_led_write_ms = 0.0
                     self.last_led_frame_sent = False
-                self.last_frame = [row[:] for row in frame]
-                self.last_color_frame = [row[:] for row in color_frame]
                 self.last_frame_ts = time.time()
                 self.last_loop_error = None
                 self.frame_counter += 1
@@ -434,178 +506,364 @@ class DisplayService:
                 self.last_loop_total_ms = round((self.last_loop_work_ms or 0) + (self.last_loop_sleep_ms or 0), 3)
                 await asyncio.sleep(max(self.frame_delay, 0.1))
 
-    async def _get_next_frame(self) -> tuple[list[list[int]], list[list[tuple[int, int, int] | None]]]:
+    def write_leds(self, planes: bitplane.Planes, color_frame: list[list[tuple[int, int, int] | None]]) -> None:
+        """Map the lit pixels of a composed frame to LED indices and hand them to the driver."""
+        # Precomputed LED index per pixel (pixel fixes included); one list lookup per lit pixel.
+        index_table = self.mapper.index_table
+        index_to_color: dict[int, tuple[int, int, int]] = {}
+        for x, y in bitplane.lit(planes):
+            color = color_frame[y][x] if color_frame and color_frame[y][x] else (80, 80, 80)
+            index_to_color[index_table[y][x]] = color
+
+        led_write_started = time.perf_counter()
+        self.led_driver.write_color_frame(
+            index_to_color,
+            source=self.last_module_key if self.last_source in {"module", "zones"} else self.last_source,
+            frame_time=self.frame_time,
+        )
+        self.last_led_write_ms = round((time.perf_counter() - led_write_started) * 1000, 3)
+
+    async def _render_module(
+        self,
+        module_key: str,
+        module,
+        settings: dict,
+        live_cache: dict,
+        width: int | None = None,
+        height: int | None = None,
+    ) -> tuple[list[list[int]], list[list[tuple[int, int, int] | None]]]:
+        """Module output at ``width`` x ``height`` (default: the canvas; zones pass their own size).
+
+        Inside a zone, modules find its size as ``zone_size`` in the cache and
+        lay out their text for it; renderers fixed at 32x8 are cropped or padded
+        from the top left.
+        """
+        width, height = width or self.width, height or self.height
+        in_zone = (width, height) != (self.width, self.height)
+        if in_zone:
+            live_cache = {**live_cache, "zone_size": (width, height)}
+        if module_key == "bitmap":
+            try:
+                file_path = str(settings.get("file", "")).strip()
+                color_mode = str(settings.get("color_mode", "bitmap")).strip().lower()
+                if color_mode not in {"bitmap", "solid"}:
+                    color_mode = "bitmap"
+                bitmap_color = settings.get("color")
+                # Recoloring is baked into cached variants by the loader; per frame only the window is cut out.
+                if self.bitmap_loader.is_animated(file_path):
+                    animation = self.bitmap_loader.load_animation(
+                        file_path,
+                        str(settings.get("fit_mode", "contain")),
+                        color=bitmap_color if color_mode == "solid" else None,
+                    )
+                    if animation is None:
+                        # Still decoding on the worker thread.
+                        frame, color_frame = self._blank(width, height)
+                    else:
+                        playback_speed = max(0.25, min(4.0, float(settings.get("playback_speed", 1.0))))
+                        frame, color_frame = animation.render(animation.index_at(frame_time(live_cache) * playback_speed))
+                else:
+                    bitmap = self.bitmap_loader.load_variant(file_path, color_mode, bitmap_color)
+                    frame, color_frame = self.bitmap_loader.render_window(
+                        bitmap,
+                        scroll_direction=str(settings.get("scroll_direction", "top_to_bottom")),
+                        scroll_speed=max(0.25, float(settings.get("scroll_speed", 2.0))),
+                        now=live_cache.get("now"),
+                        width=width,
+                        height=height,
+                    )
+            except (ValueError, TypeError, OSError):
+                frame, color_frame = self._blank(width, height)
+            self._update_live_debug(module_key, settings, live_cache, None)
+        else:
+            payload: ModulePayload = await module.render(settings, live_cache)
+            self._update_live_debug(module_key, settings, live_cache, payload)
+            if payload.frame is not None:
+                frame = payload.frame
+            else:
+                if (
+                    in_zone
+                    and payload.font_size != "small"
+                    and measure_text_width(payload.text, payload.font_size, payload.char_spacing) + max(0, payload.x_offset) > width
+                ):
+                    # Modules without their own zone layout: the small font before clipping.
+                    payload.font_size = "small"
+                frame, generated_colors = render_text_with_colors(
+                    payload.text,
+                    font_size=payload.font_size,
+                    char_colors=payload.char_colors or None,
+                    base_color=payload.default_color,
+                    x_offset=payload.x_offset,
+                    y_offset=payload.y_offset,
+                    char_spacing=payload.char_spacing,
+                    width=width,
+                    height=height,
+                )
+                payload.color_frame = generated_colors
+
+            color_frame = payload.color_frame or blank_color_frame(len(frame[0]), len(frame))
+            if payload.sprites:
+                frame, color_frame = self._fit_canvas(frame, color_frame, width, height)
+                frame, color_frame = self._draw_sprites(payload.sprites, frame, color_frame, frame_time(live_cache))
+
+        return self._fit_canvas(frame, color_frame, width, height)
+
+    def _blank(self, width: int | None = None, height: int | None = None) -> tuple[list[list[int]], list[list[tuple[int, int, int] | None]]]:
+        width, height = width or self.width, height or self.height
+        return blank_frame(width, height), blank_color_frame(width, height)
+
+    def _fit_canvas(
+        self,
+        frame: list[list[int]],
+        color_frame: list[list[tuple[int, int, int] | None]],
+        width: int | None = None,
+        height: int | None = None,
+    ) -> tuple[list[list[int]], list[list[tuple[int, int, int] | None]]]:
+        """A frame of another size (fixed 32x8 renderers on a larger canvas or in a zone) cropped/padded from the top left."""
+        width, height = width or self.width, height or self.height
+        if len(frame) == height and frame and len(frame[0]) == width:
+            return frame, color_frame
+        out_frame, out_colors = self._blank(width, height)
+        for y, (frame_row, color_row) in enumerate(zip(frame[:height], color_frame[:height])):
+            out_frame[y][: min(len(frame_row), width)] = frame_row[:width]
+            out_colors[y][: min(len(color_row), width)] = color_row[:width]
+        return out_frame, out_colors
+
+    def _draw_sprites(
+        self,
+        sprites: list[SpriteRef],
+        frame: list[list[int]],
+        color_frame: list[list[tuple[int, int, int] | None]],
+        now: float,
+    ) -> tuple[list[list[int]], list[list[tuple[int, int, int] | None]]]:
+        # Copied: payload frames may be cached lists that are handed out again.
+        frame = [row[:] for row in frame]
+        color_frame = [row[:] for row in color_frame]
+        for ref in sprites:
+            try:
+                sprite = self.sprite_library.sprite(ref.name, now)
+            except ValueError:
+                continue
+            compositor.blit_sprite(frame, color_frame, sprite, ref.x, ref.y, ref.color)
+        return frame, color_frame
+
+    def _colorize_pattern(self, pattern: str, tick: int) -> tuple[list[list[int]], list[list[tuple[int, int, int] | None]]]:
+        from app.services.patterns import PATTERN_FACTORIES
+
+        frame = PATTERN_FACTORIES[pattern](tick, self.width, self.height)
+        color = DEBUG_COLORS.get(pattern, (120, 120, 120))
+        color_frame = [[color if on else None for on in row] for row in frame]
+        return frame, color_frame
+
+    async def _get_next_frame(self, now: float | None = None) -> tuple[list[list[int]], list[list[tuple[int, int, int] | None]]]:
+        """Update the compositor layers for frame time ``now`` (default: the clock) and return the composed frame."""
+        if now is None:
+            now = self.clock.now()
+        self.frame_time = now
+        override = self._get_override_frame(now)
+        if override is not None:
+            # The opaque override hides all other layers; the module is not rendered underneath.
+            self.compositor.set_frame("override", *override)
+            return self.compositor.compose()
+
+        self.compositor.clear("override")
+        self._overlay_settings = None
+        if self.zones.active:
+            await self._render_zones(now)
+        else:
+            self._zones_were_active = False
+            self.compositor.set_frame("base", *await self._get_module_frame(now))
+        self._update_seconds_border(self._overlay_settings, now)
+        self._update_status_dots(self.last_cache_snapshot)
+        self._update_badge(now)
+        return self.compositor.compose()
+
+    async def render_at(self, t: float) -> tuple[list[list[int]], list[list[tuple[int, int, int] | None]]]:
+        """Composed frame at frame time ``t`` without touching the LEDs (render-ahead, offline rendering).
+
+        Stateful parts (transitions, zones, automata, particles) advance as if
+        the display had shown this frame, so calls should move forward in time.
+        """
+        frame, color_frame = await self._get_next_frame(t)
+        return [row[:] for row in frame], [row[:] for row in color_frame]
+
+    async def _render_zones(self, now: float) -> None:
+        """Render due zones and blit the ones whose pixels changed into the base layer."""
+        if not self._zones_were_active:
+            # Entering zone mode: start from a blank canvas so nothing of the full-screen module remains.
+            self.zones.reset()
+            self.compositor.set_frame("base", *self._blank())
+            self._zones_were_active = True
+
+        settings_by_key = await self._get_module_settings_by_key()
+        live_cache = dict(self.cache_provider() or {})
+        live_cache["now"] = now
+        self.last_cache_snapshot = live_cache
+        self.last_cache_snapshot_ts = time.time()
+        self.last_source = "zones"
+        for zone in self.zones.zones:
+            key = zone.select(now)
+            if not zone.is_due(key, now):
+                zone.skipped += 1
+                continue
+            module = MODULE_REGISTRY.get(key)
+            settings = settings_by_key.get(key, {})
+            if module is None:
+                frame, color_frame = self._blank(zone.width, zone.height)
+            else:
+                # Rendered at the zone's own size, so modules lay out inside it and only pay for its pixels.
+                render_started = time.perf_counter()
+                frame, color_frame = await self._render_module(key, module, settings, live_cache, zone.width, zone.height)
+                self.render_budget.record(key, (time.perf_counter() - render_started) * 1000, has_cheap_variant=False)
+                effects = self._effect_chain(key, settings.get("effects"), zone.width, zone.height)
+                if not effects.is_empty:
+                    frame, color_frame = effects.apply(frame, color_frame, now)
+            if zone.update(key, now, frame, color_frame):
+                self.compositor.blit("base", zone.x, zone.y, frame, color_frame)
+        self.last_module_key = self.zones.zones[0].module_key
+
+    def _get_override_frame(self, now: float) -> tuple[list[list[int]], list[list[tuple[int, int, int] | None]]] | None:
         if self.debug_override:
-            from app.services.patterns import PATTERN_FACTORIES
+            from app.services.patterns import PATTERN_FACTORIES, pattern_periods
 
             pattern, until, interval = self.debug_override
-            now = time.time()
             if now <= until and pattern in ANIMATION_FACTORIES:
                 self.last_source = "debug"
-                return ANIMATION_FACTORIES[pattern](now)
+                factory = ANIMATION_FACTORIES[pattern]
+                spec = ANIMATION_PERIODS.get(pattern)
+                cached = self.frame_cache.lookup(("debug", pattern), spec, now, factory) if spec else None
+                return self._fit_canvas(*(cached or factory(now)))
             if now <= until and pattern in PATTERN_FACTORIES:
                 self.last_source = "debug"
                 tick = int(now / interval)
-                frame = PATTERN_FACTORIES[pattern](tick)
-                color = DEBUG_COLORS.get(pattern, (120, 120, 120))
-                color_frame = blank_color_frame(32, 8)
-                for y in range(8):
-                    for x in range(32):
-                        if frame[y][x]:
-                            color_frame[y][x] = color
-                return frame, color_frame
+                spec = pattern_periods(self.width, self.height).get(pattern)
+                if spec:
+                    cached = self.frame_cache.lookup(("pattern", pattern), spec, tick, lambda t: self._colorize_pattern(pattern, int(t)))
+                    if cached:
+                        return cached
+                return self._colorize_pattern(pattern, tick)
             self.debug_override = None
 
         if self.manual_override:
             pixels, colors, until = self.manual_override
-            if time.time() <= until:
+            if now <= until:
                 self.last_source = "manual"
                 return pixels, colors
             self.manual_override = None
+        return None
 
+    async def _get_module_frame(self, now: float) -> tuple[list[list[int]], list[list[tuple[int, int, int] | None]]]:
         rows = await self._get_enabled_module_rows()
 
         if not rows:
             self.last_source = "idle"
-            return [[0 for _ in range(32)] for _ in range(8)], blank_color_frame(32, 8)
-
-        durations = [row["duration_seconds"] for row in rows]
-        total = max(sum(durations), 1)
-        t = int(time.time()) % total
-        idx = 0
-        for duration in durations:
-            if t < duration:
-                break
-            t -= duration
-            idx += 1
-        selected = rows[min(idx, len(rows) - 1)]
+            return self._blank()
+
+        position = self._playlist_timeline(rows).at(now)
+        if position is None:
+            # Every enabled module is outside its schedule window right now.
+            self.last_source = "idle"
+            return self._blank()
+        selected = position.row
 
         module = MODULE_REGISTRY.get(selected["key"])
         if not module:
             self.last_source = "module"
             self.last_module_key = None
             self._update_live_debug(None, {}, {}, None)
-            return [[0 for _ in range(32)] for _ in range(8)], blank_color_frame(32, 8)
+            return self._blank()
 
         self.last_source = "module"
         self.last_module_key = selected["key"]
         settings = selected["settings"] or {}
+        if selected["key"] == "clock":
+            self._overlay_settings = settings
+
+        # A running transition plays its precomputed frames; the incoming module is not rendered meanwhile.
+        transition_frame = self.transitions.current(selected["key"], now)
+        if transition_frame is not None:
+            return transition_frame
 
         live_cache = dict(self.cache_provider() or {})
+        live_cache["now"] = now
         self.last_cache_snapshot = live_cache
         self.last_cache_snapshot_ts = time.time()
 
-        if selected["key"] == "bitmap":
-            try:
-                file_path = str(settings.get("file", "")).strip()
-                bitmap = self.bitmap_loader.load(file_path)
-                frame, color_frame = self.bitmap_loader.render_window(
-                    bitmap,
-                    scroll_direction=str(settings.get("scroll_direction", "top_to_bottom")),
-                    scroll_speed=max(0.25, float(settings.get("scroll_speed", 2.0))),
-                )
-                color_mode = str(settings.get("color_mode", "bitmap")).strip().lower()
-                if color_mode not in {"bitmap", "solid"}:
-                    color_mode = "bitmap"
-                bitmap_color = settings.get("color")
-                if color_mode == "solid" and bitmap_color:
-                    parsed_color = parse_hex_color(bitmap_color, (245, 245, 245))
-                    for y in range(8):
-                        for x in range(32):
-                            if frame[y][x]:
-                                color_frame[y][x] = parsed_color
-                elif bitmap.is_monochrome and bitmap_color:
-                    parsed_color = parse_hex_color(bitmap_color, (245, 245, 245))
-                    for y in range(8):
-                        for x in range(32):
-                            if frame[y][x] and color_frame[y][x] is not None:
-                                color_frame[y][x] = parsed_color
-            except (ValueError, TypeError):
-                frame = [[0 for _ in range(32)] for _ in range(8)]
-                color_frame = blank_color_frame(32, 8)
-            self._update_live_debug(selected["key"], settings, live_cache, None)
+        last_output = self._last_module_frames.get(selected["key"])
+        plan = self.render_budget.plan(selected["key"], has_last_frame=last_output is not None)
+        if plan.reuse_last_frame and last_output is not None:
+            frame, color_frame = last_output
         else:
-            payload: ModulePayload = await module.render(settings, live_cache)
-            self._update_live_debug(selected["key"], settings, live_cache, payload)
-            if payload.frame is not None:
-                frame = payload.frame
-            else:
-                frame, generated_colors = render_text_with_colors(
-                    payload.text,
-                    font_size=payload.font_size,
-                    char_colors=payload.char_colors or None,
-                    base_color=payload.default_color,
-                    x_offset=payload.x_offset,
-                    y_offset=payload.y_offset,
-                    char_spacing=payload.char_spacing,
-                )
-                payload.color_frame = generated_colors
-
-            color_frame = payload.color_frame or blank_color_frame(32, 8)
+            render_settings = settings
+            cheaper = module.cheaper_settings(settings)
+            if plan.use_cheap_variant and cheaper is not None:
+                render_settings = cheaper
+            render_started = time.perf_counter()
+            frame, color_frame = await self._render_module(selected["key"], module, render_settings, live_cache)
+            self.render_budget.record(
+                selected["key"],
+                (time.perf_counter() - render_started) * 1000,
+                has_cheap_variant=cheaper is not None,
+            )
+            self._last_module_frames[selected["key"]] = (frame, color_frame)
 
-        if selected["key"] == "clock":
-            frame = [row[:] for row in frame]
-            color_frame = [row[:] for row in color_frame]
-            frame, color_frame = self._apply_clock_border_seconds(frame, color_frame, settings)
+        effects = self._effect_chain(selected["key"], settings.get("effects"))
+        if not effects.is_empty:
+            frame, color_frame = effects.apply(frame, color_frame, now)
 
         transition_direction = settings.get("transition_direction", "down")
         if transition_direction not in {"down", "up"}:
             transition_direction = "down"
         transition_ms = max(0, min(2000, _safe_int(settings.get("transition_ms", 350), 350)))
+        transition_effect = str(settings.get("transition_effect", "slide")).strip().lower()
         if selected["key"] == "clock":
             transition_ms = 0
 
-        if self.transition_state:
-            state = self.transition_state
-            if state.get("to_key") == selected["key"] and state.get("to_frame") == frame:
-                elapsed = (time.time() - state["start_time"]) * 1000.0
-                if elapsed < state["duration_ms"]:
-                    progress = elapsed / max(state["duration_ms"], 1)
-                    return self._slide_vertical(
-                        state["from_frame"],
-                        state["from_colors"],
-                        state["to_frame"],
-                        state["to_colors"],
-                        progress,
-                        state["direction"],
-                    )
-                self.transition_state = None
-
         transition_on_content_change = bool(settings.get("transition_on_content_change", True))
         if selected["key"] == "clock":
             transition_on_content_change = False
 
         same_module = self.last_target_key == selected["key"]
-        content_changed = self.last_target_frame != frame or self.last_target_colors != color_frame
+        source = self._last_target_source
+        if source is not None and source[0] is frame and source[1] is color_frame:
+            # The same output objects as last tick (reused frame, no effects): nothing to compare.
+            content_key = self._last_target_content
+        else:
+            content_key = _content_key(frame, color_frame)
+        content_changed = content_key != self._last_target_content
+        # Content that changed on the previous tick as well is animating; sliding a snapshot of it would freeze it.
+        continuous_change = same_module and content_changed and self._target_changed_last_tick
+        self._target_changed_last_tick = same_module and content_changed
         target_changed = (
             self.last_target_key != selected["key"]
-            or (transition_on_content_change and same_module and content_changed)
+            or (transition_on_content_change and same_module and content_changed and not continuous_change)
         )
 
         if transition_ms > 0 and self.last_target_key is not None and target_changed:
-            self.transition_state = {
-                "from_frame": [row[:] for row in self.last_target_frame],
-                "from_colors": [row[:] for row in self.last_target_colors],
-                "to_frame": [row[:] for row in frame],
-                "to_colors": [row[:] for row in color_frame],
-                "to_key": selected["key"],
-                "start_time": time.time(),
-                "duration_ms": transition_ms,
-                "direction": transition_direction,
-            }
-            self.last_target_key = selected["key"]
-            self.last_target_frame = [row[:] for row in frame]
-            self.last_target_colors = [row[:] for row in color_frame]
-            return self._slide_vertical(
-                self.transition_state["from_frame"],
-                self.transition_state["from_colors"],
-                self.transition_state["to_frame"],
-                self.transition_state["to_colors"],
-                0.0,
-                transition_direction,
+            transition = self.transitions.start(
+                self.last_target_frame,
+                self.last_target_colors,
+                frame,
+                color_frame,
+                to_key=selected["key"],
+                effect=transition_effect,
+                direction=transition_direction,
+                duration_ms=transition_ms,
+                now=now,
             )
+            # The module was not rendered during the transition; its first frame afterwards is not a content change.
+            self._target_changed_last_tick = True
+            self._remember_target(selected["key"], frame, color_frame, content_key)
+            return transition.frame(0)
 
-        self.last_target_key = selected["key"]
-        self.last_target_frame = [row[:] for row in frame]
-        self.last_target_colors = [row[:] for row in color_frame]
+        self._remember_target(selected["key"], frame, color_frame, content_key, copy=content_changed or not same_module)
         return frame, color_frame
+
+    def _remember_target(self, key: str, frame, color_frame, content_key: tuple, copy: bool = True) -> None:
+        """Keep the target frame as the start of a later transition; only copied when its content changed."""
+        self.last_target_key = key
+        self._last_target_content = content_key
+        self._last_target_source = (frame, color_frame)
+        if copy:
+            self.last_target_frame = [row[:] for row in frame]
+            self.last_target_colors = [row[:] for row in color_frame]
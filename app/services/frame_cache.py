@@ -0,0 +1,193 @@
+"""Replay cache for periodic animations.
+
+Animations that repeat after a fixed phase declare a ``PeriodicSpec``. The
+first request for a (preset, settings) key schedules one full cycle to be
+rendered on a worker thread; until it is ready the caller renders live. Once
+stored, frames are played back by time index, so a cached animation costs
+only the unpacking of its lit pixels per display tick.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+Color = tuple[int, int, int]
+Frame = list[list[int]]
+ColorFrame = list[list[Color | None]]
+AnimationFrame = tuple[Frame, ColorFrame]
+
+DEFAULT_PIXEL_COLOR = (80, 80, 80)
+
+
+@dataclass(frozen=True)
+class PeriodicSpec:
+    """Declares that an animation repeats after ``period`` time units.
+
+    ``step`` is the frame quantization in the same units; ``None`` means one
+    frame per display tick (``speed / fps``).
+    """
+
+    period: float
+    step: float | None = None
+
+
+@dataclass
+class PackedCycle:
+    width: int
+    height: int
+    period: float
+    step: float
+    frames: list[tuple[array, bytes]]
+    nbytes: int
+    render_ms: float
+
+    def frame_at(self, t: float) -> AnimationFrame:
+        # Small epsilon keeps exact step boundaries from landing on the previous frame.
+        idx = int((t % self.period) / self.step + 1e-9) % len(self.frames)
+        indices, rgb = self.frames[idx]
+        width = self.width
+        frame = [[0] * width for _ in range(self.height)]
+        colors: ColorFrame = [[None] * width for _ in range(self.height)]
+        for pos, led in enumerate(indices):
+            y, x = divmod(led, width)
+            frame[y][x] = 1
+            base = pos * 3
+            colors[y][x] = (rgb[base], rgb[base + 1], rgb[base + 2])
+        return frame, colors
+
+
+def pack_frame(frame: Frame, color_frame: ColorFrame | None) -> tuple[array, bytes]:
+    """Store only lit pixels: their row-major index plus 3 bytes of color."""
+    indices = array("H")
+    rgb = bytearray()
+    for y, row in enumerate(frame):
+        width = len(row)
+        for x, value in enumerate(row):
+            if not value:
+                continue
+            indices.append(y * width + x)
+            color = color_frame[y][x] if color_frame and color_frame[y][x] else DEFAULT_PIXEL_COLOR
+            rgb += bytes(color)
+    return indices, bytes(rgb)
+
+
+class PeriodicFrameCache:
+    """Bounded LRU of pre-rendered animation cycles, filled in the background."""
+
+    def __init__(self, fps: int, max_bytes: int = 512 * 1024, max_frames_per_cycle: int = 4096):
+        self._logger = logging.getLogger(__name__)
+        self.fps = max(int(fps), 1)
+        self.max_bytes = max(int(max_bytes), 0)
+        self.max_frames_per_cycle = max_frames_per_cycle
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple, PackedCycle] = OrderedDict()
+        self._pending: set[tuple] = set()
+        self._rejected: set[tuple] = set()
+        self._bytes = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="PixelDockFrameCache")
+        self._stats = {"hits": 0, "misses": 0, "cycles_rendered": 0, "evictions": 0, "render_errors": 0}
+        self.last_cycle_render_ms: float | None = None
+
+    def step_for(self, spec: PeriodicSpec, speed: float = 1.0) -> float:
+        return spec.step if spec.step else max(float(speed), 1e-6) / self.fps
+
+    def lookup(
+        self,
+        key: tuple,
+        spec: PeriodicSpec,
+        t: float,
+        render: Callable[[float], AnimationFrame],
+        speed: float = 1.0,
+    ) -> AnimationFrame | None:
+        """Return the cached frame for ``t`` or ``None`` (and schedule the cycle)."""
+        if self.max_bytes <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+        if entry is not None:
+            return entry.frame_at(t)
+        with self._lock:
+            self._stats["misses"] += 1
+            if key in self._pending or key in self._rejected:
+                return None
+            step = self.step_for(spec, speed)
+            if spec.period / step > self.max_frames_per_cycle:
+                self._rejected.add(key)
+                return None
+            self._pending.add(key)
+        self._executor.submit(self._render_cycle, key, spec.period, step, render)
+        return None
+
+    def _render_cycle(self, key: tuple, period: float, step: float, render: Callable[[float], AnimationFrame]) -> None:
+        started = time.perf_counter()
+        try:
+            count = max(1, int(round(period / step)))
+            frames = []
+            width = height = 0
+            nbytes = 0
+            for idx in range(count):
+                frame, color_frame = render(idx * step)
+                height, width = len(frame), len(frame[0]) if frame else 0
+                packed = pack_frame(frame, color_frame)
+                nbytes += packed[0].itemsize * len(packed[0]) + len(packed[1])
+                frames.append(packed)
+        except Exception:
+            self._logger.exception("Periodic frame cache render failed for %s", key)
+            with self._lock:
+                self._pending.discard(key)
+                self._rejected.add(key)
+                self._stats["render_errors"] += 1
+            return
+
+        render_ms = round((time.perf_counter() - started) * 1000, 3)
+        cycle = PackedCycle(width, height, period, step, frames, nbytes, render_ms)
+        with self._lock:
+            self._pending.discard(key)
+            self.last_cycle_render_ms = render_ms
+            self._stats["cycles_rendered"] += 1
+            if nbytes > self.max_bytes:
+                self._rejected.add(key)
+                return
+            self._entries[key] = cycle
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._rejected.clear()
+            self._bytes = 0
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": round(self._stats["hits"] / lookups, 3) if lookups else None,
+                "entries": len(self._entries),
+                "pending": len(self._pending),
+                "rejected": len(self._rejected),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "last_cycle_render_ms": self.last_cycle_render_ms,
+                "cycles": [
+                    {"key": list(key), "frames": len(entry.frames), "bytes": entry.nbytes, "render_ms": entry.render_ms}
+                    for key, entry in self._entries.items()
+                ],
+            }
@@ -0,0 +1,69 @@
+"""Frame clocks.
+
+The display loop reads its clock once per tick and hands that single frame
+time to every renderer (via ``cache["now"]``, see ``app.modules.base.frame_time``).
+Swapping the clock makes the same playlist render in real time, frozen at a
+fixed timestamp or accelerated, which is what pre-rendering, offline rendering
+and reproducible benchmarks need. All clocks return epoch seconds.
+"""
+
+from __future__ import annotations
+
+import time
+
+
+class RealClock:
+    mode = "real"
+
+    def now(self) -> float:
+        return time.time()
+
+    def get_stats(self) -> dict:
+        return {"mode": self.mode}
+
+
+class FixedClock:
+    """Always the same instant until moved explicitly (offline rendering, tests, benchmarks)."""
+
+    mode = "fixed"
+
+    def __init__(self, t: float):
+        self.t = float(t)
+
+    def now(self) -> float:
+        return self.t
+
+    def set(self, t: float) -> None:
+        self.t = float(t)
+
+    def advance(self, seconds: float) -> None:
+        self.t += seconds
+
+    def get_stats(self) -> dict:
+        return {"mode": self.mode, "t": self.t}
+
+
+class AcceleratedClock:
+    """Runs ``factor`` times faster than real time, starting at ``start`` (default: now)."""
+
+    mode = "accelerated"
+
+    def __init__(self, factor: float, start: float | None = None):
+        self.factor = float(factor)
+        self._origin_real = time.monotonic()
+        self._origin = float(start) if start is not None else time.time()
+
+    def now(self) -> float:
+        return self._origin + (time.monotonic() - self._origin_real) * self.factor
+
+    def get_stats(self) -> dict:
+        return {"mode": self.mode, "factor": self.factor, "origin": self._origin}
+
+
+def make_clock(mode: str, start: float = 0.0, factor: float = 1.0):
+    """Clock from the ``RENDER_CLOCK*`` settings; ``start`` 0 means "now"."""
+    if mode == "fixed":
+        return FixedClock(start or time.time())
+    if mode == "accelerated":
+        return AcceleratedClock(factor, start or None)
+    return RealClock()
@@ -0,0 +1,247 @@
+"""Binary frame recordings.
+
+``LED_TRANSPORT=record`` replaces the LED hardware with ``RecordingStrip``,
+which appends every shown frame to ``LED_RECORD_FILE``. The file is a
+16-byte header followed by fixed-size records, so frame ``i`` lives at
+``HEADER_SIZE + i * record_size`` and ``FrameRecording`` can memory-map the
+file and jump to any frame without reading the ones before it::
+
+    header  "PDFR" | version u8 | reserved u8 | led_count u16 | record_size u32 | reserved u32
+    record  timestamp f64 | seq u32 | brightness u8 | pad 3 | source 16s | led_count * RGB
+
+Records are only ever appended; an incomplete record at the end (crash while
+writing) is ignored by the reader and overwritten by the next recorder.
+``replay`` feeds a recording back through an ``LEDDriver`` at the original
+timing or as fast as possible.
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+MAGIC = b"PDFR"
+VERSION = 1
+HEADER = struct.Struct("<4sBBHII")
+RECORD_HEADER = struct.Struct("<dIB3x16s")
+HEADER_SIZE = HEADER.size
+SOURCE_SIZE = 16
+
+
+def record_size(led_count: int) -> int:
+    return RECORD_HEADER.size + led_count * 3
+
+
+@dataclass(frozen=True)
+class RecordedFrame:
+    seq: int
+    timestamp: float
+    brightness: int
+    source: str
+    pixels: bytes
+
+    def index_to_color(self) -> dict[int, tuple[int, int, int]]:
+        """Lit LEDs in the form ``LEDDriver.write_color_frame`` takes."""
+        pixels = self.pixels
+        return {
+            offset // 3: (pixels[offset], pixels[offset + 1], pixels[offset + 2])
+            for offset in range(0, len(pixels), 3)
+            if pixels[offset] or pixels[offset + 1] or pixels[offset + 2]
+        }
+
+
+class RecordingStrip:
+    """Strip-compatible transport that appends every ``show()`` to a recording file."""
+
+    def __init__(self, path: str | Path, count: int):
+        self.path = Path(path)
+        self.count = count
+        self.brightness = 64
+        self._buffer = bytearray(count * 3)
+        self._record_size = record_size(count)
+        self._source = b""
+        self._frame_time: float | None = None
+        self.frames_written = 0
+        self.bytes_written = 0
+        self.seq = self._open()
+
+    def _open(self) -> int:
+        """Open for appending; returns the next sequence number (continues an existing recording)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.path.exists() or self.path.stat().st_size < HEADER_SIZE:
+            self._file = self.path.open("wb")
+            self._file.write(HEADER.pack(MAGIC, VERSION, 0, self.count, self._record_size, 0))
+            self._file.flush()
+            return 0
+        self._file = self.path.open("r+b")
+        magic, version, _, led_count, size, _ = HEADER.unpack(self._file.read(HEADER_SIZE))
+        if magic != MAGIC or version != VERSION or led_count != self.count or size != self._record_size:
+            self._file.close()
+            raise ValueError(f"{self.path} is not a {self.count}-LED frame recording")
+        records = (self.path.stat().st_size - HEADER_SIZE) // size
+        # Drop a partial record left by an interrupted write, then keep appending.
+        self._file.truncate(HEADER_SIZE + records * size)
+        self._file.seek(0, 2)
+        if not records:
+            return 0
+        self._file.seek(HEADER_SIZE + (records - 1) * size)
+        _, last_seq, _, _ = RECORD_HEADER.unpack(self._file.read(RECORD_HEADER.size))
+        self._file.seek(0, 2)
+        return last_seq + 1
+
+    def begin(self):
+        return None
+
+    def numPixels(self):
+        return self.count
+
+    def setBrightness(self, brightness: int):
+        self.brightness = max(0, min(255, int(brightness)))
+
+    def setPixelColor(self, index: int, color):
+        if not (0 <= index < self.count):
+            return
+        offset = index * 3
+        self._buffer[offset:offset + 3] = bytes(color)
+
+    def set_indexed_colors(self, index_to_color: dict[int, tuple[int, int, int]]):
+        self._buffer[:] = bytes(len(self._buffer))
+        for index, rgb in index_to_color.items():
+            if 0 <= index < self.count:
+                offset = index * 3
+                self._buffer[offset:offset + 3] = bytes(rgb)
+
+    def annotate(self, source: str | None, frame_time: float | None) -> None:
+        """Source module and display frame time stored with the next shown frame."""
+        self._source = (source or "").encode("ascii", "replace")[:SOURCE_SIZE]
+        self._frame_time = frame_time
+
+    def show(self):
+        timestamp = self._frame_time if self._frame_time is not None else time.time()
+        record = RECORD_HEADER.pack(timestamp, self.seq & 0xFFFFFFFF, self.brightness, self._source) + self._buffer
+        # One write per record keeps the file append-only and readers never see half a header.
+        self._file.write(record)
+        self._file.flush()
+        self.seq += 1
+        self.frames_written += 1
+        self.bytes_written += len(record)
+        self._frame_time = None
+
+    def close(self) -> None:
+        self._file.close()
+
+    def get_debug_snapshot(self) -> dict:
+        return {
+            "file": str(self.path),
+            "next_seq": self.seq,
+            "frames_written": self.frames_written,
+            "bytes_written": self.bytes_written,
+            "record_size": self._record_size,
+        }
+
+
+class FrameRecording:
+    """Read-only, memory-mapped view of a recording; frames are addressed by position."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        with self.path.open("rb") as handle:
+            header = handle.read(HEADER_SIZE)
+            if len(header) < HEADER_SIZE:
+                raise ValueError(f"{self.path} is not a frame recording")
+            magic, version, _, self.led_count, self.record_size, _ = HEADER.unpack(header)
+            if magic != MAGIC or version != VERSION or self.record_size != record_size(self.led_count):
+                raise ValueError(f"{self.path} is not a frame recording")
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self._count = (len(self._map) - HEADER_SIZE) // self.record_size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> RecordedFrame:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        offset = HEADER_SIZE + index * self.record_size
+        timestamp, seq, brightness, source = RECORD_HEADER.unpack_from(self._map, offset)
+        start = offset + RECORD_HEADER.size
+        return RecordedFrame(
+            seq=seq,
+            timestamp=timestamp,
+            brightness=brightness,
+            source=source.rstrip(b"\x00").decode("ascii", "replace"),
+            pixels=self._map[start:start + self.led_count * 3],
+        )
+
+    def __iter__(self):
+        return (self[index] for index in range(self._count))
+
+    def pixels_equal(self, index: int, other: "FrameRecording", other_index: int) -> bool:
+        """Compare two frames' pixels without building ``RecordedFrame`` objects."""
+        start = HEADER_SIZE + index * self.record_size + RECORD_HEADER.size
+        other_start = HEADER_SIZE + other_index * other.record_size + RECORD_HEADER.size
+        size = self.led_count * 3
+        return self._map[start:start + size] == other._map[other_start:other_start + size]
+
+    def diff(self, other: "FrameRecording") -> list[int]:
+        """Positions whose pixels differ (frames missing in the shorter recording count as different)."""
+        if self.led_count != other.led_count:
+            raise ValueError("recordings have different LED counts")
+        common = min(len(self), len(other))
+        changed = [index for index in range(common) if not self.pixels_equal(index, other, index)]
+        return changed + list(range(common, max(len(self), len(other))))
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> "FrameRecording":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def replay(recording: FrameRecording, driver, speed: float = 1.0, start: int = 0, stop: int | None = None) -> dict:
+    """Send frames ``start:stop`` through ``driver`` (an ``LEDDriver``).
+
+    ``speed`` 1.0 keeps the recorded timing, 2.0 plays twice as fast, 0 sends
+    back to back. Returns write timings of the transport.
+    """
+    stop = len(recording) if stop is None else min(stop, len(recording))
+    write_ms: list[float] = []
+    late = 0
+    brightness = None
+    wall_started = time.perf_counter()
+    first_ts = None
+    for index in range(start, stop):
+        frame = recording[index]
+        if first_ts is None:
+            first_ts = frame.timestamp
+        if speed > 0:
+            due = (frame.timestamp - first_ts) / speed
+            wait = due - (time.perf_counter() - wall_started)
+            if wait > 0:
+                time.sleep(wait)
+            elif wait < -0.05:
+                late += 1
+        if frame.brightness != brightness:
+            brightness = frame.brightness
+            driver.set_brightness(brightness)
+        started = time.perf_counter()
+        driver.write_color_frame(frame.index_to_color(), source=frame.source)
+        write_ms.append((time.perf_counter() - started) * 1000)
+    wall_s = time.perf_counter() - wall_started
+    ordered = sorted(write_ms)
+    return {
+        "frames": len(write_ms),
+        "wall_seconds": round(wall_s, 3),
+        "fps": round(len(write_ms) / wall_s, 1) if wall_s else None,
+        "late_frames": late,
+        "write_ms_mean": round(sum(write_ms) / len(write_ms), 3) if write_ms else None,
+        "write_ms_p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3) if write_ms else None,
+        "write_ms_max": round(ordered[-1], 3) if write_ms else None,
+    }
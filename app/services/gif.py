@@ -0,0 +1,280 @@
+"""Minimal GIF support without Pillow.
+
+Only what the project needs: encoding small animated previews of rendered
+frames (offline renderer; RGB color frames with ``None`` = off sharing one
+global palette) and decoding animated GIFs for the bitmap module. The decoder
+composites every frame onto the full logical screen (disposal methods,
+transparency, interlacing) and yields it as RGBA bytes.
+"""
+
+from __future__ import annotations
+
+import struct
+from collections.abc import Iterator
+
+Color = tuple[int, int, int]
+ColorFrame = list[list[Color | None]]
+
+MAX_CODE_SIZE = 12
+BLACK = (0, 0, 0)
+# Browsers treat tiny delays as "as fast as possible" and play them at 10 fps; so do we.
+MIN_DELAY_MS = 20
+DEFAULT_DELAY_MS = 100
+
+
+def _lzw_encode(indices: bytes, min_code_size: int) -> bytes:
+    """GIF-flavoured LZW (variable code width, LSB-first bit packing)."""
+    clear = 1 << min_code_size
+    end = clear + 1
+    out = bytearray()
+    bit_buffer = 0
+    bit_count = 0
+
+    def emit(code: int, width: int) -> None:
+        nonlocal bit_buffer, bit_count
+        bit_buffer |= code << bit_count
+        bit_count += width
+        while bit_count >= 8:
+            out.append(bit_buffer & 0xFF)
+            bit_buffer >>= 8
+            bit_count -= 8
+
+    code_size = min_code_size + 1
+    table: dict[tuple[int, int], int] = {}
+    next_code = end + 1
+    emit(clear, code_size)
+    prefix = indices[0]
+    for index in indices[1:]:
+        code = table.get((prefix, index))
+        if code is not None:
+            prefix = code
+            continue
+        emit(prefix, code_size)
+        if next_code < 1 << MAX_CODE_SIZE:
+            table[(prefix, index)] = next_code
+            next_code += 1
+            # The decoder adds its entries one code later, so widen once the new entry no longer fits.
+            if next_code > 1 << code_size and code_size < MAX_CODE_SIZE:
+                code_size += 1
+        else:
+            emit(clear, code_size)
+            table.clear()
+            code_size = min_code_size + 1
+            next_code = end + 1
+        prefix = index
+    emit(prefix, code_size)
+    emit(end, code_size)
+    if bit_count:
+        out.append(bit_buffer & 0xFF)
+    return bytes(out)
+
+
+def _sub_blocks(data: bytes) -> bytes:
+    chunks = [bytes([len(data[pos:pos + 255])]) + data[pos:pos + 255] for pos in range(0, len(data), 255)]
+    return b"".join(chunks) + b"\x00"
+
+
+def _palette(frames: list[ColorFrame]) -> tuple[list[Color], dict[Color, int], bool]:
+    """Exact palette if the frames use at most 256 colors, otherwise a 6x6x6 cube (quantized)."""
+    colors = {BLACK}
+    for frame in frames:
+        for row in frame:
+            colors.update(color or BLACK for color in row)
+        if len(colors) > 256:
+            break
+    if len(colors) <= 256:
+        palette = [BLACK] + sorted(colors - {BLACK})
+        return palette, {color: idx for idx, color in enumerate(palette)}, False
+    palette = [(r * 51, g * 51, b * 51) for r in range(6) for g in range(6) for b in range(6)]
+    return palette, {}, True
+
+
+def encode_animation(frames: list[ColorFrame], delays_ms: list[int], scale: int = 1, loop: bool = True) -> bytes:
+    """Animated GIF of ``frames``; each pixel becomes a ``scale`` x ``scale`` block."""
+    if not frames:
+        raise ValueError("at least one frame is required")
+    height = len(frames[0]) * scale
+    width = len(frames[0][0]) * scale
+    palette, lookup, quantized = _palette(frames)
+    table_bits = max(1, (len(palette) - 1).bit_length())
+    palette += [BLACK] * ((1 << table_bits) - len(palette))
+
+    out = bytearray(b"GIF89a")
+    out += struct.pack("<HHBBB", width, height, 0x80 | 0x70 | (table_bits - 1), 0, 0)
+    out += b"".join(bytes(color) for color in palette)
+    if loop:
+        out += b"\x21\xff\x0bNETSCAPE2.0\x03\x01\x00\x00\x00"
+
+    min_code_size = max(2, table_bits)
+    for frame, delay_ms in zip(frames, delays_ms):
+        indices = bytearray()
+        for row in frame:
+            if quantized:
+                line = bytes(
+                    ((r * 5 + 127) // 255) * 36 + ((g * 5 + 127) // 255) * 6 + (b * 5 + 127) // 255
+                    for r, g, b in (color or BLACK for color in row)
+                )
+            else:
+                line = bytes(lookup[color or BLACK] for color in row)
+            if scale > 1:
+                line = bytes(index for index in line for _ in range(scale))
+            indices += line * scale
+        # Graphic control extension: delay in 1/100 s, no transparency.
+        out += struct.pack("<BBBBHBB", 0x21, 0xF9, 4, 0, max(2, round(delay_ms / 10)), 0, 0)
+        out += struct.pack("<BHHHHB", 0x2C, 0, 0, width, height, 0)
+        out.append(min_code_size)
+        out += _sub_blocks(_lzw_encode(bytes(indices), min_code_size))
+    out += b"\x3b"
+    return bytes(out)
+
+
+def _lzw_decode(data: bytes, min_code_size: int, pixel_count: int) -> bytes:
+    clear = 1 << min_code_size
+    end = clear + 1
+    table = [bytes([value]) for value in range(clear)] + [b"", b""]
+    code_size = min_code_size + 1
+    out = bytearray()
+    prev: bytes | None = None
+    bit_buffer = 0
+    bit_count = 0
+    for byte in data:
+        bit_buffer |= byte << bit_count
+        bit_count += 8
+        while bit_count >= code_size:
+            code = bit_buffer & ((1 << code_size) - 1)
+            bit_buffer >>= code_size
+            bit_count -= code_size
+            if code == clear:
+                del table[clear + 2:]
+                code_size = min_code_size + 1
+                prev = None
+                continue
+            if code == end:
+                return bytes(out[:pixel_count])
+            if code < len(table):
+                entry = table[code]
+            elif code == len(table) and prev is not None:
+                entry = prev + prev[:1]
+            else:
+                raise ValueError("corrupt GIF image data")
+            out += entry
+            if prev is not None and len(table) < 1 << MAX_CODE_SIZE:
+                table.append(prev + entry[:1])
+                if len(table) == 1 << code_size and code_size < MAX_CODE_SIZE:
+                    code_size += 1
+            prev = entry
+            if len(out) >= pixel_count:
+                return bytes(out[:pixel_count])
+    # Truncated stream: missing pixels stay index 0.
+    return bytes(out[:pixel_count]).ljust(pixel_count, b"\x00")
+
+
+def _deinterlace(indices: bytes, width: int, height: int) -> bytes:
+    rows = [indices[pos:pos + width] for pos in range(0, width * height, width)]
+    order = [y for start, step in ((0, 8), (4, 8), (2, 4), (1, 2)) for y in range(start, height, step)]
+    out = [b""] * height
+    for row, y in zip(rows, order):
+        out[y] = row
+    return b"".join(out)
+
+
+def _read_sub_blocks(data: bytes, pos: int) -> tuple[bytes, int]:
+    chunks = []
+    while pos < len(data):
+        size = data[pos]
+        pos += 1
+        if size == 0:
+            break
+        chunks.append(data[pos:pos + size])
+        pos += size
+    return b"".join(chunks), pos
+
+
+def _color_table(data: bytes, pos: int, flags: int) -> tuple[list[bytes], int]:
+    count = 1 << ((flags & 0x07) + 1)
+    table = [data[pos + idx * 3:pos + idx * 3 + 3] + b"\xff" for idx in range(count)]
+    return table, pos + count * 3
+
+
+def decode_frames(data: bytes, max_frames: int = 0) -> Iterator[tuple[int, int, bytes, int]]:
+    """Yield ``(width, height, rgba, delay_ms)`` per frame, composited onto the logical screen."""
+    if data[:6] not in {b"GIF87a", b"GIF89a"}:
+        raise ValueError("not a GIF file")
+    width, height, flags = struct.unpack_from("<HHB", data, 6)
+    if not width or not height:
+        raise ValueError("GIF has no logical screen size")
+    pos = 13
+    global_table: list[bytes] = []
+    if flags & 0x80:
+        global_table, pos = _color_table(data, pos, flags)
+
+    canvas = bytearray(width * height * 4)
+    delay_ms = DEFAULT_DELAY_MS
+    disposal = 0
+    transparent: int | None = None
+    frames = 0
+    while pos < len(data):
+        block = data[pos]
+        pos += 1
+        if block == 0x3B:
+            break
+        if block == 0x21:
+            label = data[pos]
+            body, pos = _read_sub_blocks(data, pos + 1)
+            if label == 0xF9 and len(body) >= 4:
+                packed, delay_cs, transparent_index = struct.unpack_from("<BHB", body)
+                disposal = (packed >> 2) & 0x07
+                transparent = transparent_index if packed & 0x01 else None
+                delay_ms = delay_cs * 10 if delay_cs * 10 >= MIN_DELAY_MS else DEFAULT_DELAY_MS
+            continue
+        if block != 0x2C:
+            raise ValueError("corrupt GIF block structure")
+
+        left, top, frame_width, frame_height, image_flags = struct.unpack_from("<HHHHB", data, pos)
+        pos += 9
+        table = global_table
+        if image_flags & 0x80:
+            table, pos = _color_table(data, pos, image_flags)
+        min_code_size = data[pos]
+        lzw_data, pos = _read_sub_blocks(data, pos + 1)
+        indices = _lzw_decode(lzw_data, min_code_size, frame_width * frame_height)
+        if image_flags & 0x40:
+            indices = _deinterlace(indices, frame_width, frame_height)
+
+        previous = bytes(canvas) if disposal == 3 else None
+        palette = [table[idx] if idx < len(table) else b"\x00\x00\x00\xff" for idx in range(256)]
+        if transparent is not None:
+            palette[transparent] = b""
+        for y in range(frame_height):
+            canvas_y = top + y
+            if canvas_y >= height:
+                break
+            row = indices[y * frame_width:(y + 1) * frame_width]
+            visible = min(frame_width, width - left)
+            if visible <= 0:
+                break
+            if transparent is None:
+                start = (canvas_y * width + left) * 4
+                canvas[start:start + visible * 4] = b"".join(palette[idx] for idx in row[:visible])
+                continue
+            for x, idx in enumerate(row[:visible]):
+                rgba = palette[idx]
+                if rgba:
+                    start = (canvas_y * width + left + x) * 4
+                    canvas[start:start + 4] = rgba
+
+        yield width, height, bytes(canvas), delay_ms
+        frames += 1
+        if max_frames and frames >= max_frames:
+            return
+
+        if disposal == 2:
+            clear_width = max(0, min(frame_width, width - left)) * 4
+            for y in range(top, min(height, top + frame_height)):
+                start = (y * width + left) * 4
+                canvas[start:start + clear_width] = bytes(clear_width)
+        elif previous is not None:
+            canvas[:] = previous
+        delay_ms, disposal, transparent = DEFAULT_DELAY_MS, 0, None
+    if not frames:
+        raise ValueError("GIF contains no frames")
@@ -6,6 +6,7 @@ import threading
 import time
 
 from app.config import Settings
+from app.services.frame_recorder import RecordingStrip
 
 try:
     from rpi_ws281x import Color, PixelStrip
@@ -863,6 +864,15 @@ class LEDDriver:
                     settings.led_serial_baudrate,
                 )
 
+        elif transport == "record":
+            try:
+                self.strip = RecordingStrip(settings.led_record_file, settings.led_count)
+            except (ValueError, OSError) as exc:
+                self._logger.warning("Frame recorder init failed (%s). Falling back to mock strip.", exc)
+                self._activate_mock_strip("Frame recorder initialization failed")
+            else:
+                self._logger.info("Recording LED frames to %s", settings.led_record_file)
+
         elif transport == "rpi":
             if PixelStrip is None:
                 self._activate_mock_strip("rpi_ws281x is not installed (pip install rpi-ws281x==5.0.0)")
@@ -905,6 +915,8 @@ class LEDDriver:
         }
         if isinstance(self.strip, SerialLEDStrip):
             base["serial"] = self.strip.get_debug_snapshot()
+        if isinstance(self.strip, RecordingStrip):
+            base["recording"] = self.strip.get_debug_snapshot()
         return base
 
     def serial_ping(self, nonce: int | None = None) -> dict:
@@ -917,7 +929,8 @@ class LEDDriver:
 
     def set_brightness(self, brightness: int):
         self.strip.setBrightness(brightness)
-        if not isinstance(self.strip, SerialLEDStrip):
+        # The recorder stores the brightness with the next real frame; re-showing the old buffer would add a bogus record.
+        if not isinstance(self.strip, (SerialLEDStrip, RecordingStrip)):
             self.strip.show()
 
     def write_frame(self, indices_to_on: list[int], color: RGB | None = None):
@@ -930,7 +943,17 @@ class LEDDriver:
                 self.strip.setPixelColor(i, self._color(0, 0, 0))
         self.strip.show()
 
-    def write_color_frame(self, index_to_color: dict[int, tuple[int, int, int]]):
+    def write_color_frame(
+        self,
+        index_to_color: dict[int, tuple[int, int, int]],
+        source: str | None = None,
+        frame_time: float | None = None,
+    ):
+        if isinstance(self.strip, RecordingStrip):
+            self.strip.annotate(source, frame_time)
+            self.strip.set_indexed_colors(index_to_color)
+            self.strip.show()
+            return
         if isinstance(self.strip, SerialLEDStrip):
             self.strip.set_indexed_colors(index_to_color)
             self.strip.show()
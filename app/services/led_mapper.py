@@ -1,9 +1,14 @@
-from itertools import permutations, product
+from collections.abc import Iterator
+from itertools import islice, permutations, product
 import json
+from math import factorial
 from pathlib import Path
+import time
 
 from app.config import Settings
 
+ROTATIONS = (0, 90, 180, 270)
+
 
 class LEDMapper:
     def __init__(self, settings: Settings):
@@ -22,6 +27,14 @@ class LEDMapper:
             [self._compute_index(x, y) for x in range(self.width)]
             for y in range(self.height)
         ]
+        self._rebuild_index_table()
+
+    def _rebuild_index_table(self) -> None:
+        # ``xy_to_index`` for every pixel with the pixel fixes applied: one list lookup per lit pixel in the render loop.
+        table = [row[:] for row in self._xy_index_table]
+        for fix in self._pixel_fixes.values():
+            table[fix["logical_y"]][fix["logical_x"]] = self._xy_index_table[fix["observed_y"]][fix["observed_x"]]
+        self.index_table = table
 
     def _effective(self, key: str):
         if key in self._runtime_overrides:
@@ -31,6 +44,27 @@ class LEDMapper:
     def _effective_panel_count(self) -> int:
         return max(int(self._effective("chain_panels")), 1)
 
+    def _grid_shape(self) -> tuple[int, int]:
+        """``(panel rows, panels per row)`` of the panel grid."""
+        panel_count = self._effective_panel_count()
+        grid_rows = min(max(int(self._effective("panel_grid_rows")), 1), panel_count)
+        return grid_rows, max(panel_count // grid_rows, 1)
+
+    def _physical_panel(self, panel_x: int, panel_y: int, data_starts_right: bool) -> int:
+        """Position in the data chain of the panel at grid cell (``panel_x``, ``panel_y``).
+
+        The chain starts in the top panel row, on the right with
+        ``data_starts_right``; with ``panel_grid_serpentine`` every second
+        row runs back the other way.
+        """
+        _, per_row = self._grid_shape()
+        column = panel_x
+        if data_starts_right:
+            column = per_row - 1 - column
+        if self._effective("panel_grid_serpentine") and panel_y % 2 == 1:
+            column = per_row - 1 - column
+        return panel_y * per_row + column
+
     def apply_runtime_overrides(
         self,
         *,
@@ -88,6 +122,8 @@ class LEDMapper:
             "panel_order": [int(item) for item in panel_order],
             "panel_rotations": [self._normalize_rotation(value) for value in panel_rotations],
             "panel_count": panel_count,
+            "panel_grid_rows": self._grid_shape()[0],
+            "panel_grid_serpentine": bool(self._effective("panel_grid_serpentine")),
             "panel_width": int(self._effective("panel_width")),
             "panel_height": int(self._effective("panel_height")),
             "panel_columns": int(self._effective("panel_columns")),
@@ -126,6 +162,7 @@ class LEDMapper:
             observed_y=observed_y,
         )
         self._pixel_fixes[self._pixel_fix_key(fix["logical_x"], fix["logical_y"])] = fix
+        self._rebuild_index_table()
         self._persist_state()
         return self.get_pixel_fixes_snapshot()
 
@@ -140,11 +177,13 @@ class LEDMapper:
             )
             normalized[self._pixel_fix_key(fix["logical_x"], fix["logical_y"])] = fix
         self._pixel_fixes = normalized
+        self._rebuild_index_table()
         self._persist_state()
         return self.get_pixel_fixes_snapshot()
 
     def clear_pixel_fixes(self) -> list[dict[str, int]]:
         self._pixel_fixes = {}
+        self._rebuild_index_table()
         self._persist_state()
         return self.get_pixel_fixes_snapshot()
 
@@ -180,6 +219,7 @@ class LEDMapper:
                 self.replace_pixel_fixes(fixes)
             except Exception:
                 self._pixel_fixes = {}
+                self._rebuild_index_table()
 
     def _persist_state(self) -> None:
         payload = {
@@ -195,7 +235,7 @@ class LEDMapper:
             raise ValueError("panel rotation must be one of 0, 90, 180, 270")
         return rotation
 
-    def _resolve_panel_config(self, panel_x: int) -> tuple[int, int]:
+    def _resolve_panel_config(self, panel_x: int, panel_y: int = 0) -> tuple[int, int]:
         panel_count = self._effective_panel_count()
 
         panel_order = list(self._effective("panel_order"))
@@ -208,7 +248,7 @@ class LEDMapper:
         elif len(panel_rotations) > panel_count:
             panel_rotations = panel_rotations[:panel_count]
 
-        physical_index = panel_count - 1 - panel_x if self._effective("data_starts_right") else panel_x
+        physical_index = self._physical_panel(panel_x, panel_y, bool(self._effective("data_starts_right")))
         panel_index = int(panel_order[physical_index])
         if panel_index < 0 or panel_index >= panel_count:
             panel_index = physical_index
@@ -237,10 +277,11 @@ class LEDMapper:
         serpentine = bool(self._effective("serpentine"))
 
         panel_x = x // panel_width
+        panel_y = y // panel_height
         local_x = x % panel_width
         local_y = y % panel_height
 
-        panel_index, panel_rotation = self._resolve_panel_config(panel_x)
+        panel_index, panel_rotation = self._resolve_panel_config(panel_x, panel_y)
         local_x, local_y = self._rotate_local(local_x, local_y, panel_rotation)
 
         serpentine_flipped = bool(serpentine and (local_y % 2 == 1))
@@ -256,6 +297,7 @@ class LEDMapper:
             "x": x,
             "y": y,
             "panel_x": panel_x,
+            "panel_y": panel_y,
             "panel_index": panel_index,
             "panel_rotation": panel_rotation,
             "local_x": local_x,
@@ -271,113 +313,177 @@ class LEDMapper:
     def xy_to_index(self, x: int, y: int) -> int:
         if x < 0 or y < 0 or x >= self.width or y >= self.height:
             raise ValueError("coordinate out of range")
-        override = self._pixel_fixes.get(self._pixel_fix_key(x, y))
-        if override:
-            x = int(override["observed_x"])
-            y = int(override["observed_y"])
-        return self._xy_index_table[y][x]
-
-    def _map_index_with_overrides(
-        self,
-        *,
-        x: int,
-        y: int,
-        first_pixel_offset: int,
-        data_starts_right: bool,
-        serpentine: bool,
-        panel_order: list[int],
-        panel_rotations: list[int],
-    ) -> int:
-        panel_width = int(self.settings.panel_width)
-        panel_height = int(self.settings.panel_height)
-        panel_count = max(int(self.settings.chain_panels), 1)
-
-        panel_x = x // panel_width
-        local_x = x % panel_width
-        local_y = y % panel_height
-
-        physical_index = panel_count - 1 - panel_x if data_starts_right else panel_x
-        panel_index = int(panel_order[physical_index])
-        panel_rotation = self._normalize_rotation(panel_rotations[panel_index])
+        return self.index_table[y][x]
 
-        local_x, local_y = self._rotate_local(local_x, local_y, panel_rotation)
+    def _pixel_in_panel(self, local_x: int, local_y: int, rotation: int, serpentine: bool) -> int:
+        panel_width = int(self._effective("panel_width"))
+        local_x, local_y = self._rotate_local(local_x, local_y, rotation)
         if serpentine and (local_y % 2 == 1):
             local_x = panel_width - 1 - local_x
-
-        pixel_in_panel = local_y * panel_width + local_x
-        return int(first_pixel_offset) + panel_index * (panel_width * panel_height) + pixel_in_panel
+        return local_y * panel_width + local_x
+
+    @staticmethod
+    def _constrain_panels(
+        seen: list[tuple[int, int, dict[int, int]]],
+        remainder: int,
+        panel_size: int,
+    ) -> dict[int, tuple[int, set[int]]] | None:
+        """Chain slot (before the offset shift) and possible rotations per observed physical panel.
+
+        With the offset fixed modulo the panel size, an observed LED index
+        splits into its panel's chain slot and its pixel within the panel;
+        only rotations that put the observed position on that pixel remain.
+        None if two observations contradict each other.
+        """
+        panels: dict[int, tuple[int, set[int]]] = {}
+        for physical, led_index, pixels in seen:
+            chain_slot, pixel = divmod(led_index - remainder, panel_size)
+            rotations = {rotation for rotation, value in pixels.items() if value == pixel}
+            known = panels.get(physical)
+            if known is not None:
+                if known[0] != chain_slot:
+                    return None
+                rotations &= known[1]
+            if not rotations:
+                return None
+            panels[physical] = (chain_slot, rotations)
+        slots = [slot for slot, _ in panels.values()]
+        if len(set(slots)) != len(slots):
+            return None
+        return panels
+
+    @staticmethod
+    def _panel_solutions(
+        panels: dict[int, tuple[int, set[int]]],
+        shift: int,
+        panel_count: int,
+        current_order: list[int],
+        current_rotations: list[int],
+    ) -> tuple[int, Iterator[tuple[list[int], list[int]]]]:
+        """Number of (order, rotations) pairs for one chain layout, and a generator yielding them best first."""
+        order: list[int | None] = [None] * panel_count
+        domains: list[list[int]] = [list(ROTATIONS) for _ in range(panel_count)]
+        for physical, (chain_slot, rotations) in panels.items():
+            order[physical] = chain_slot - shift
+            domains[chain_slot - shift] = sorted(rotations)
+        free_physical = [physical for physical in range(panel_count) if order[physical] is None]
+        free_chain = set(range(panel_count)) - set(order)
+        # The current mapping's choices come first, so the first yields change the least.
+        preferred: list[int] = []
+        for physical in free_physical:
+            wanted = current_order[physical]
+            preferred.append(wanted if wanted in free_chain and wanted not in preferred else -1)
+        leftovers = iter(sorted(free_chain - set(preferred)))
+        preferred = [value if value >= 0 else next(leftovers) for value in preferred]
+        for chain, domain in enumerate(domains):
+            domain.sort(key=lambda rotation: rotation != current_rotations[chain])
+
+        count = factorial(len(free_physical))
+        for domain in domains:
+            count *= len(domain)
+
+        def generate() -> Iterator[tuple[list[int], list[int]]]:
+            for assignment in permutations(preferred):
+                for physical, chain in zip(free_physical, assignment):
+                    order[physical] = chain
+                resolved = [int(chain) for chain in order]
+                for rotations in product(*domains):
+                    yield resolved, list(rotations)
+
+        return count, generate()
 
     def infer_runtime_overrides(self, observations: list[dict], max_solutions: int = 8) -> dict:
+        """Mappings under which every observed position is driven by the LED its logical pixel drives now.
+
+        Instead of trying every order/rotation combination, the observations
+        are grouped by the physical panel they were seen on. For each chain
+        layout guess (``data_starts_right``, ``serpentine``, offset modulo the
+        panel size) every observation pins its panel's place in the chain and
+        narrows its rotation; panels without observations stay free. The cost
+        grows with the number of observations, not with ``panel_count!``.
+        Solutions are ranked by how few settings differ from the current
+        mapping; ``solution_count`` is the number of mappings that fit.
+        CPU-bound, callers on the event loop should run it in a thread.
+        """
+        started = time.perf_counter()
         panel_count = self._effective_panel_count()
-        if panel_count > 6:
-            raise ValueError("mapping inference supports up to 6 panels")
+        panel_width = int(self._effective("panel_width"))
+        panel_height = int(self._effective("panel_height"))
+        panel_size = panel_width * panel_height
 
         current_mapping = self.get_runtime_mapping_snapshot()
-        logical_targets: list[dict] = []
+        targets: list[tuple[int, int, int]] = []
         for item in observations:
-            logical_x = int(item["logical_x"])
-            logical_y = int(item["logical_y"])
             observed_x = int(item["observed_x"])
             observed_y = int(item["observed_y"])
-            logical_index = int(self.map_components(logical_x, logical_y)["index"])
-            logical_targets.append(
-                {
-                    "logical_x": logical_x,
-                    "logical_y": logical_y,
-                    "observed_x": observed_x,
-                    "observed_y": observed_y,
-                    "logical_index": logical_index,
-                }
-            )
-
-        matches: list[dict] = []
-        all_orders = list(permutations(range(panel_count)))
-        all_rotations = list(product((0, 90, 180, 270), repeat=panel_count))
-
+            self._validate_coordinate(x=observed_x, y=observed_y)
+            logical_index = int(self.map_components(int(item["logical_x"]), int(item["logical_y"]))["index"])
+            targets.append((observed_x, observed_y, logical_index))
+        if not targets:
+            raise ValueError("at least one observation is required")
+
+        ranked: list[tuple[int, int, dict]] = []
+        solution_count = 0
         for data_starts_right in (False, True):
             for serpentine in (False, True):
-                for panel_order in all_orders:
-                    for panel_rotations in all_rotations:
-                        offset_guess: int | None = None
-                        valid = True
-                        for obs in logical_targets:
-                            base_index = self._map_index_with_overrides(
-                                x=obs["observed_x"],
-                                y=obs["observed_y"],
-                                first_pixel_offset=0,
-                                data_starts_right=data_starts_right,
-                                serpentine=serpentine,
-                                panel_order=list(panel_order),
-                                panel_rotations=list(panel_rotations),
-                            )
-                            inferred_offset = int(obs["logical_index"]) - int(base_index)
-                            if offset_guess is None:
-                                offset_guess = inferred_offset
-                            elif inferred_offset != offset_guess:
-                                valid = False
-                                break
-                        if not valid or offset_guess is None:
-                            continue
-                        matches.append(
-                            {
-                                "first_pixel_offset": int(offset_guess),
-                                "data_starts_right": bool(data_starts_right),
-                                "serpentine": bool(serpentine),
-                                "panel_order": [int(value) for value in panel_order],
-                                "panel_rotations": [int(value) for value in panel_rotations],
-                            }
+                # (physical panel, LED index, pixel in panel per rotation) per observation
+                seen: list[tuple[int, int, dict[int, int]]] = []
+                for observed_x, observed_y, logical_index in targets:
+                    physical = self._physical_panel(observed_x // panel_width, observed_y // panel_height, data_starts_right)
+                    local_x = observed_x % panel_width
+                    local_y = observed_y % panel_height
+                    pixels = {
+                        rotation: self._pixel_in_panel(local_x, local_y, rotation, serpentine) for rotation in ROTATIONS
+                    }
+                    seen.append((physical, logical_index, pixels))
+
+                first_index, first_pixels = seen[0][1], seen[0][2]
+                for remainder in sorted({(first_index - pixel) % panel_size for pixel in first_pixels.values()}):
+                    panels = self._constrain_panels(seen, remainder, panel_size)
+                    if panels is None:
+                        continue
+                    slots = [slot for slot, _ in panels.values()]
+                    # Every observed panel has to land on a chain position 0..panel_count-1.
+                    for shift in range(max(slots) - panel_count + 1, min(slots) + 1):
+                        first_pixel_offset = shift * panel_size + remainder
+                        count, solutions = self._panel_solutions(
+                            panels,
+                            shift,
+                            panel_count,
+                            current_mapping["panel_order"],
+                            current_mapping["panel_rotations"],
                         )
-                        if len(matches) >= max_solutions:
-                            return {
-                                "observation_count": len(logical_targets),
-                                "solutions_found": len(matches),
-                                "solutions": matches,
-                                "current_mapping": current_mapping,
-                            }
+                        solution_count += count
+                        for panel_order, panel_rotations in islice(solutions, max_solutions):
+                            changes = (
+                                int(first_pixel_offset != current_mapping["first_pixel_offset"])
+                                + int(data_starts_right != current_mapping["data_starts_right"])
+                                + int(serpentine != current_mapping["serpentine"])
+                                + sum(a != b for a, b in zip(panel_order, current_mapping["panel_order"]))
+                                + sum(a != b for a, b in zip(panel_rotations, current_mapping["panel_rotations"]))
+                            )
+                            ranked.append(
+                                (
+                                    changes,
+                                    len(ranked),
+                                    {
+                                        "first_pixel_offset": int(first_pixel_offset),
+                                        "data_starts_right": bool(data_starts_right),
+                                        "serpentine": bool(serpentine),
+                                        "panel_order": panel_order,
+                                        "panel_rotations": panel_rotations,
+                                        "changes": changes,
+                                    },
+                                )
+                            )
 
+        ranked.sort(key=lambda entry: entry[:2])
+        matches = [solution for _, _, solution in ranked[:max_solutions]]
         return {
-            "observation_count": len(logical_targets),
+            "observation_count": len(targets),
             "solutions_found": len(matches),
+            "solution_count": solution_count,
+            "search_ms": round((time.perf_counter() - started) * 1000, 3),
             "solutions": matches,
             "current_mapping": current_mapping,
         }
@@ -40,6 +40,7 @@ DEFAULT_MODULES = [
             "color_flat": "#dcdc50",
             "color_fallback": "#9ca3af",
             "show_block_height": False,
+            "show_icon": False,
             "screen_seconds": 4,
             "transition_direction": "down",
             "transition_ms": 350,
@@ -61,6 +62,7 @@ DEFAULT_MODULES = [
             "color_fallback": "#9ca3af",
             "color_humidity": "#6ed2ff",
             "screen_seconds": 4,
+            "show_icons": False,
             "transition_direction": "down",
             "transition_ms": 350,
         },
@@ -97,6 +99,8 @@ DEFAULT_MODULES = [
             "scroll_speed": 2.0,
             "color": "#f4f4f5",
             "color_mode": "bitmap",
+            "fit_mode": "contain",
+            "playback_speed": 1.0,
             "transition_direction": "down",
             "transition_ms": 250,
         },
@@ -116,6 +120,59 @@ DEFAULT_MODULES = [
             "transition_ms": 0,
         },
     },
+    {
+        "key": "expression",
+        "name": "Expression",
+        "sort_order": 6,
+        "duration_seconds": 12,
+        "settings": {
+            "expression": "sin(x*0.3+t)+cos(y-t)",
+            "speed": 1.0,
+            "palette": "neon",
+            "intensity": 0.8,
+            "color_scale": 0.25,
+            "mirror_mode": "none",
+            "transition_direction": "down",
+            "transition_ms": 0,
+        },
+    },
+    {
+        "key": "automata",
+        "name": "Automata",
+        "sort_order": 7,
+        "duration_seconds": 15,
+        "settings": {
+            "rule": "life",
+            "wolfram_rule": 30,
+            "world_width": 32,
+            "world_height": 8,
+            "density": 0.3,
+            "generations_per_second": 8,
+            "pan_speed": 0.0,
+            "palette": "neon",
+            "intensity": 0.8,
+            "transition_direction": "down",
+            "transition_ms": 0,
+        },
+    },
+    {
+        "key": "video",
+        "name": "Video",
+        "sort_order": 8,
+        "duration_seconds": 10,
+        "settings": {
+            "file": "sample_waves.y4m",
+            "fit_mode": "cover",
+            "playback_speed": 1.0,
+            "loop": True,
+            "drop_frames": True,
+            "raw_width": 32,
+            "raw_height": 8,
+            "raw_fps": 25.0,
+            "transition_direction": "down",
+            "transition_ms": 250,
+        },
+    },
 ]
 
 
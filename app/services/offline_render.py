@@ -0,0 +1,234 @@
+"""Headless offline rendering.
+
+Runs the regular ``DisplayService`` pipeline (playlist, transitions, effects,
+zones, compositor) against a fixed frame clock, without web server, poller or
+LED transport. Module configuration comes from a SQLite database or a JSON
+export of ``GET /api/modules``; the external data (BTC, weather) from a
+recorded snapshot or a synthetic default. Frames are rendered back to back,
+so an hour of playlist takes as long as its render cost, not an hour.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import ModuleConfig
+from app.services import gif
+from app.services.bitmap_loader import BitmapLoader
+from app.services.display import MODULE_REGISTRY, DisplayService
+from app.services.frame_clock import FixedClock
+from app.services.zones import normalize_layout
+
+Color = tuple[int, int, int]
+
+SYNTHETIC_SNAPSHOT = {
+    "btc_eur": 58250.0,
+    "btc_trend": "up",
+    "btc_block_height": 870000,
+    "weather_temp": 14.5,
+    "weather_outdoor_temp": 14.5,
+    "weather_indoor_temp": 21.5,
+    "weather_indoor_humidity": 45.0,
+    "weather_source": "api",
+}
+
+
+@dataclass
+class FrameRecord:
+    index: int
+    t: float
+    source: str
+    module: str | None
+    render_ms: float
+
+
+@dataclass
+class RenderResult:
+    fps: int
+    frames: list[list[list[Color | None]]] = field(default_factory=list)
+    records: list[FrameRecord] = field(default_factory=list)
+    wall_s: float = 0.0
+
+    def summary(self) -> dict:
+        per_module: dict[str, list[float]] = {}
+        for record in self.records:
+            per_module.setdefault(record.module or record.source, []).append(record.render_ms)
+        total_ms = sum(record.render_ms for record in self.records)
+        rendered_s = len(self.records) / self.fps
+        return {
+            "frames": len(self.records),
+            "rendered_seconds": round(rendered_s, 3),
+            "wall_seconds": round(self.wall_s, 3),
+            "speedup": round(rendered_s / self.wall_s, 1) if self.wall_s else None,
+            "mean_ms": round(total_ms / len(self.records), 3) if self.records else 0.0,
+            "modules": {
+                key: {
+                    "frames": len(values),
+                    "mean_ms": round(statistics.fmean(values), 3),
+                    "p95_ms": round(_percentile(values, 0.95), 3),
+                    "max_ms": round(max(values), 3),
+                }
+                for key, values in sorted(per_module.items())
+            },
+        }
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def load_snapshot(path: str | Path | None, now: float) -> dict:
+    """External data cache from a JSON file (``GET /api/debug/status`` or its ``live_data``), else synthetic."""
+    if path is None:
+        snapshot = dict(SYNTHETIC_SNAPSHOT)
+        snapshot["btc_updated_at"] = snapshot["weather_updated_at"] = now
+        return snapshot
+    raw = json.loads(Path(path).read_text(encoding="utf-8"))
+    if isinstance(raw, dict) and isinstance(raw.get("live_data"), dict):
+        raw = raw["live_data"]
+    if not isinstance(raw, dict):
+        raise ValueError("data snapshot must be a JSON object")
+    return raw
+
+
+def load_module_rows(path: str | Path) -> list[dict]:
+    """Module rows from a JSON export (list of modules or ``{"modules": [...]}``)."""
+    raw = json.loads(Path(path).read_text(encoding="utf-8"))
+    if isinstance(raw, dict):
+        raw = raw.get("modules")
+    if not isinstance(raw, list):
+        raise ValueError("module export must be a list of modules")
+    rows = []
+    for idx, item in enumerate(raw):
+        if not isinstance(item, dict) or not item.get("key"):
+            raise ValueError(f"module entry {idx} has no key")
+        rows.append({
+            "key": str(item["key"]),
+            "name": str(item.get("name") or item["key"]),
+            "enabled": bool(item.get("enabled", True)),
+            "duration_seconds": int(item.get("duration_seconds", 10)),
+            "sort_order": int(item.get("sort_order", idx)),
+            "settings": item.get("settings") or {},
+        })
+    return rows
+
+
+async def open_config(db_path: str | Path | None = None, config_path: str | Path | None = None) -> AsyncEngine:
+    """Engine over an existing SQLite file, or an in-memory database filled from a JSON export."""
+    if db_path is not None:
+        if not Path(db_path).exists():
+            raise FileNotFoundError(db_path)
+        return create_async_engine(f"sqlite+aiosqlite:///{Path(db_path).resolve()}")
+    if config_path is None:
+        raise ValueError("either a database or a module export is required")
+    rows = load_module_rows(config_path)
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        if rows:
+            await conn.execute(ModuleConfig.__table__.insert(), rows)
+    return engine
+
+
+def build_service(
+    engine: AsyncEngine,
+    snapshot: dict,
+    start: float,
+    fps: int,
+    bitmap_dir: Path,
+    layout_file: str | None = None,
+    width: int = 32,
+    height: int = 8,
+) -> DisplayService:
+    service = DisplayService(
+        session_factory=async_sessionmaker(engine, expire_on_commit=False),
+        led_driver=None,
+        mapper=None,
+        cache_provider=lambda: snapshot,
+        fps=fps,
+        bitmap_loader=BitmapLoader(bitmap_dir, background_decode=False),
+        clock=FixedClock(start),
+        width=width,
+        height=height,
+    )
+    # Decode clips on the render thread: a prefetch worker would make frames depend on thread timing.
+    MODULE_REGISTRY["video"].prefetch = False
+    if layout_file is not None:
+        raw = json.loads(Path(layout_file).read_text(encoding="utf-8"))
+        zones = raw.get("zones") if isinstance(raw, dict) else raw
+        service.zones.set_layout(normalize_layout(zones, set(MODULE_REGISTRY), width, height), persist=False)
+    # Configuration does not change during an offline run; query it once.
+    service.module_rows_cache_ttl_s = float("inf")
+    return service
+
+
+async def render_range(service: DisplayService, start: float, duration_s: float, keep_frames: bool = True) -> RenderResult:
+    """Render ``duration_s`` seconds from ``start`` at the service's frame rate, as fast as possible."""
+    fps = service.target_fps
+    result = RenderResult(fps=fps)
+    count = max(1, round(duration_s * fps))
+    wall_started = time.perf_counter()
+    try:
+        for index in range(count):
+            t = start + index / fps
+            service.clock.set(t)
+            started = time.perf_counter()
+            _, color_frame = await service.render_at(t)
+            render_ms = (time.perf_counter() - started) * 1000
+            module = service.last_module_key if service.last_source in {"module", "zones"} else None
+            result.records.append(FrameRecord(index, t, service.last_source, module, render_ms))
+            if keep_frames:
+                result.frames.append(color_frame)
+    finally:
+        result.wall_s = time.perf_counter() - wall_started
+        service.frame_cache.shutdown()
+        service.bitmap_loader.shutdown()
+    return result
+
+
+def write_raw(result: RenderResult, path: Path) -> int:
+    """Frames back to back as 8-bit RGB, row-major, unlit pixels black; returns bytes written."""
+    with path.open("wb") as handle:
+        for color_frame in result.frames:
+            handle.write(bytes(channel for row in color_frame for color in row for channel in (color or (0, 0, 0))))
+        return handle.tell()
+
+
+def write_gif(result: RenderResult, path: Path, scale: int = 8) -> int:
+    """Animated GIF preview; runs of identical frames become one frame with a longer delay."""
+    frame_ms = 1000 / result.fps
+    frames: list = []
+    delays: list[float] = []
+    for color_frame in result.frames:
+        if frames and color_frame == frames[-1]:
+            delays[-1] += frame_ms
+            continue
+        frames.append(color_frame)
+        delays.append(frame_ms)
+    data = gif.encode_animation(frames, [round(delay) for delay in delays], scale=scale)
+    path.write_bytes(data)
+    return len(data)
+
+
+def write_report(result: RenderResult, path: Path | None) -> None:
+    """Per-frame timing as CSV (stdout if ``path`` is None)."""
+    handle = path.open("w", newline="", encoding="utf-8") if path else sys.stdout
+    try:
+        writer = csv.writer(handle)
+        writer.writerow(["frame", "t", "source", "module", "render_ms"])
+        for record in result.records:
+            writer.writerow([record.index, f"{record.t:.3f}", record.source, record.module or "", f"{record.render_ms:.3f}"])
+    finally:
+        if path:
+            handle.close()
@@ -0,0 +1,302 @@
+"""Particle engine for the fireworks/snow/sparks/rain animation presets.
+
+Particles live in a fixed-capacity pool stored as parallel arrays (position,
+velocity, life, palette position, kind); there are no per-particle objects.
+Spawning fills free slots and killing only clears the ``alive`` flag, so the
+pool never reallocates. With NumPy integration and additive compositing run
+over whole arrays; without it the same pool is backed by plain lists.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from dataclasses import dataclass
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency, the list-backed pool is used instead
+    np = None
+
+HAS_NUMPY = np is not None
+
+Color = tuple[int, int, int]
+
+KIND_EMBER = 0
+KIND_ROCKET = 1
+
+FIELDS = ("x", "y", "vx", "vy", "life", "max_life", "hue", "kind")
+
+# Longest simulated step; larger gaps (paused module, slow tick) are clamped.
+MAX_STEP = 0.25
+
+
+class ParticlePool:
+    """Struct-of-arrays particle storage with a fixed capacity."""
+
+    def __init__(self, capacity: int, vectorized: bool = HAS_NUMPY):
+        self.capacity = max(int(capacity), 1)
+        self.vectorized = vectorized and np is not None
+        if self.vectorized:
+            for name in FIELDS:
+                setattr(self, name, np.zeros(self.capacity, dtype=np.float64))
+            self.alive = np.zeros(self.capacity, dtype=bool)
+        else:
+            for name in FIELDS:
+                setattr(self, name, [0.0] * self.capacity)
+            self.alive = [False] * self.capacity
+            self._free = list(range(self.capacity - 1, -1, -1))
+        self.dropped = 0
+
+    @property
+    def count(self) -> int:
+        if self.vectorized:
+            return int(np.count_nonzero(self.alive))
+        return self.capacity - len(self._free)
+
+    def spawn(self, count: int, **values) -> int:
+        """Fill up to ``count`` free slots; each value is a scalar or a sequence of ``count`` items."""
+        if count <= 0:
+            return 0
+        if self.vectorized:
+            slots = np.flatnonzero(~self.alive)[:count]
+            placed = len(slots)
+            for name in FIELDS:
+                value = values.get(name, 0.0)
+                getattr(self, name)[slots] = value[:placed] if np.ndim(value) else value
+            self.alive[slots] = True
+        else:
+            placed = min(count, len(self._free))
+            for i in range(placed):
+                slot = self._free.pop()
+                for name in FIELDS:
+                    value = values.get(name, 0.0)
+                    getattr(self, name)[slot] = value[i] if isinstance(value, (list, tuple)) else value
+                self.alive[slot] = True
+        self.dropped += count - placed
+        return placed
+
+    def step(self, dt: float, gravity: float, drag: float, width: int, height: int) -> list[tuple[float, float, float]]:
+        """Integrate one step, kill expired or off-screen particles.
+
+        Returns ``(x, y, hue)`` of rockets whose life ran out during this step.
+        """
+        damping = max(0.0, 1.0 - drag * dt)
+        if self.vectorized:
+            self.vy += gravity * dt
+            if damping != 1.0:
+                self.vx *= damping
+                self.vy *= damping
+            self.x += self.vx * dt
+            self.y += self.vy * dt
+            self.life -= dt
+            expired = self.alive & (self.life <= 0)
+            rockets = np.flatnonzero(expired & (self.kind == KIND_ROCKET))
+            bursts = list(zip(self.x[rockets].tolist(), self.y[rockets].tolist(), self.hue[rockets].tolist()))
+            self.alive &= (
+                (self.life > 0)
+                & (self.x > -2)
+                & (self.x < width + 2)
+                & (self.y > -height)
+                & (self.y < height + 1)
+            )
+            return bursts
+
+        bursts = []
+        xs, ys, vxs, vys, lives, kinds, alive = self.x, self.y, self.vx, self.vy, self.life, self.kind, self.alive
+        for i in range(self.capacity):
+            if not alive[i]:
+                continue
+            vx = vxs[i] * damping
+            vy = (vys[i] + gravity * dt) * damping
+            vxs[i], vys[i] = vx, vy
+            xs[i] += vx * dt
+            ys[i] += vy * dt
+            lives[i] -= dt
+            if lives[i] <= 0 and kinds[i] == KIND_ROCKET:
+                bursts.append((xs[i], ys[i], self.hue[i]))
+            if lives[i] <= 0 or not (-2 < xs[i] < width + 2 and -height < ys[i] < height + 1):
+                alive[i] = False
+                self._free.append(i)
+        return bursts
+
+    def composite(self, width: int, height: int, lut, weight: float, fade: bool):
+        """Additively blend all live particles into a frame.
+
+        Vectorized pools return ``(mask, rgb)`` arrays, list pools nested-list frames.
+        """
+        size = len(lut)
+        if self.vectorized:
+            idx = np.flatnonzero(self.alive)
+            ix = np.rint(self.x[idx]).astype(np.intp)
+            iy = np.rint(self.y[idx]).astype(np.intp)
+            inside = (ix >= 0) & (ix < width) & (iy >= 0) & (iy < height)
+            idx, ix, iy = idx[inside], ix[inside], iy[inside]
+            brightness = np.full(len(idx), weight)
+            if fade:
+                brightness *= np.clip(self.life[idx] / np.maximum(self.max_life[idx], 1e-6), 0.0, 1.0)
+            colors = lut[(np.mod(self.hue[idx], 1.0) * size).astype(np.intp) % size] * brightness[:, None]
+            linear = iy * width + ix
+            buffer = np.stack(
+                [np.bincount(linear, weights=colors[:, c], minlength=width * height) for c in range(3)],
+                axis=-1,
+            )
+            rgb = np.clip(np.rint(buffer), 0, 255).astype(np.uint8).reshape(height, width, 3)
+            return rgb.any(axis=2), rgb
+
+        buffer = [[[0.0, 0.0, 0.0] for _ in range(width)] for _ in range(height)]
+        for i in range(self.capacity):
+            if not self.alive[i]:
+                continue
+            x, y = int(round(self.x[i])), int(round(self.y[i]))
+            if not (0 <= x < width and 0 <= y < height):
+                continue
+            brightness = weight
+            if fade:
+                brightness *= max(0.0, min(1.0, self.life[i] / max(self.max_life[i], 1e-6)))
+            color = lut[int((self.hue[i] % 1.0) * size) % size]
+            acc = buffer[y][x]
+            acc[0] += color[0] * brightness
+            acc[1] += color[1] * brightness
+            acc[2] += color[2] * brightness
+        frame = [[0] * width for _ in range(height)]
+        color_frame: list[list[Color | None]] = [[None] * width for _ in range(height)]
+        for y, row in enumerate(buffer):
+            for x, acc in enumerate(row):
+                color = tuple(max(0, min(255, int(round(c)))) for c in acc)
+                if any(color):
+                    frame[y][x] = 1
+                    color_frame[y][x] = color
+        return frame, color_frame
+
+
+@dataclass(frozen=True)
+class EffectSpec:
+    gravity: float = 0.0
+    drag: float = 0.0
+    weight: float = 1.0
+    fade: bool = True
+    rate: float = 0.0  # particles per animation-time second
+
+
+EFFECTS: dict[str, EffectSpec] = {
+    "fireworks": EffectSpec(gravity=9.0, drag=1.2, weight=0.45, fade=True, rate=1.1),
+    "snow": EffectSpec(gravity=0.0, drag=0.0, weight=1.0, fade=False, rate=45.0),
+    "sparks": EffectSpec(gravity=18.0, drag=0.6, weight=0.35, fade=True, rate=600.0),
+    "rain": EffectSpec(gravity=0.0, drag=0.0, weight=0.6, fade=False, rate=220.0),
+}
+
+
+class ParticleSimulation:
+    """One running particle effect; advanced by animation time rather than wall time."""
+
+    def __init__(self, effect: str, width: int, height: int, capacity: int = 2048, vectorized: bool = HAS_NUMPY, seed: int | None = None):
+        self.effect = effect
+        self.spec = EFFECTS[effect]
+        self.width = width
+        self.height = height
+        self.pool = ParticlePool(capacity, vectorized=vectorized)
+        self._rng = random.Random(seed)
+        self._np_rng = np.random.default_rng(seed) if self.pool.vectorized else None
+        self._emit = getattr(self, f"_emit_{effect}")
+        self._carry = 0.0
+        self.last_t: float | None = None
+
+    def advance(self, t: float) -> None:
+        if self.last_t is None or t < self.last_t:
+            dt = 0.0
+        else:
+            dt = min(t - self.last_t, MAX_STEP)
+        self.last_t = t
+        if dt <= 0:
+            return
+        self._carry += self.spec.rate * dt
+        count = int(self._carry)
+        self._carry -= count
+        if count:
+            self._emit(count, t)
+        for x, y, hue in self.pool.step(dt, self.spec.gravity, self.spec.drag, self.width, self.height):
+            self._burst(x, y, hue)
+
+    def render(self, t: float, lut):
+        self.advance(t)
+        return self.pool.composite(self.width, self.height, lut, self.spec.weight, self.spec.fade)
+
+    def _uniform(self, low: float, high: float, count: int):
+        if self._np_rng is not None:
+            return self._np_rng.uniform(low, high, count)
+        return [self._rng.uniform(low, high) for _ in range(count)]
+
+    def _polar(self, count: int, angle_low: float, angle_high: float, speed_low: float, speed_high: float, squash: float = 1.0):
+        angles = self._uniform(angle_low, angle_high, count)
+        speeds = self._uniform(speed_low, speed_high, count)
+        if self._np_rng is not None:
+            return np.cos(angles) * speeds, np.sin(angles) * speeds * squash
+        return (
+            [math.cos(a) * s for a, s in zip(angles, speeds)],
+            [math.sin(a) * s * squash for a, s in zip(angles, speeds)],
+        )
+
+    def _emit_snow(self, count: int, t: float) -> None:
+        self.pool.spawn(
+            count,
+            x=self._uniform(0, self.width, count),
+            y=-0.5,
+            vx=self._uniform(-0.6, 0.6, count),
+            vy=self._uniform(1.2, 2.5, count),
+            life=30.0,
+            max_life=30.0,
+            hue=self._uniform(0.55, 1.0, count),
+        )
+
+    def _emit_rain(self, count: int, t: float) -> None:
+        self.pool.spawn(
+            count,
+            x=self._uniform(0, self.width + 4, count),
+            y=-0.5,
+            vx=-2.0,
+            vy=self._uniform(12.0, 18.0, count),
+            life=2.0,
+            max_life=2.0,
+            hue=self._uniform(0.0, 0.35, count),
+        )
+
+    def _emit_sparks(self, count: int, t: float) -> None:
+        origin = self.width / 2 + math.sin(t * 0.9) * (self.width / 2 - 3)
+        vx, vy = self._polar(count, -math.pi * 0.85, -math.pi * 0.15, 6.0, 16.0, squash=0.7)
+        life = self._uniform(0.3, 0.9, count)
+        self.pool.spawn(
+            count,
+            x=origin,
+            y=self.height - 1,
+            vx=vx,
+            vy=vy,
+            life=life,
+            max_life=life,
+            hue=(t * 0.05) % 1.0,
+        )
+
+    def _emit_fireworks(self, count: int, t: float) -> None:
+        for _ in range(count):
+            vy = -self._rng.uniform(8.0, 11.0)
+            self.pool.spawn(
+                1,
+                x=self._rng.uniform(3, self.width - 3),
+                y=float(self.height),
+                vx=self._rng.uniform(-1.5, 1.5),
+                vy=vy,
+                life=-vy / self.spec.gravity * 0.9,
+                # Rockets stay at full brightness; the fade only covers their last moment.
+                max_life=0.25,
+                hue=self._rng.random(),
+                kind=KIND_ROCKET,
+            )
+
+    def _burst(self, x: float, y: float, hue: float, count: int = 250) -> None:
+        vx, vy = self._polar(count, 0.0, math.tau, 2.0, 9.0, squash=0.5)
+        life = self._uniform(0.6, 1.4, count)
+        hues = self._uniform(hue - 0.08, hue + 0.08, count)
+        self.pool.spawn(count, x=x, y=y, vx=vx, vy=vy, life=life, max_life=life, hue=hues, kind=KIND_EMBER)
+
+    def get_stats(self) -> dict:
+        return {"effect": self.effect, "alive": self.pool.count, "capacity": self.pool.capacity, "dropped": self.pool.dropped}
@@ -1,5 +1,7 @@
 from typing import Callable
 
+from app.services.frame_cache import PeriodicSpec
+
 Frame = list[list[int]]
 
 
@@ -27,10 +29,14 @@ def vertical_stripes(step: int, width: int = 32, height: int = 8) -> Frame:
     return frame
 
 
-def panel_blocks(panel: int, width: int = 32, height: int = 8, panel_width: int = 8) -> Frame:
+def panel_blocks(panel: int, width: int = 32, height: int = 8, panel_width: int = 8, panel_height: int = 8) -> Frame:
     frame = blank(width, height)
-    start_x = (panel % (width // panel_width)) * panel_width
-    for y in range(height):
+    columns = max(width // panel_width, 1)
+    rows = max(height // panel_height, 1)
+    panel %= columns * rows
+    start_x = (panel % columns) * panel_width
+    start_y = (panel // columns) * panel_height
+    for y in range(start_y, min(start_y + panel_height, height)):
         for x in range(start_x, min(start_x + panel_width, width)):
             frame[y][x] = 1
     return frame
@@ -47,9 +53,22 @@ def border(width: int = 32, height: int = 8) -> Frame:
     return frame
 
 
-PATTERN_FACTORIES: dict[str, Callable[[int], Frame]] = {
-    "pixel_walk": lambda tick: single_pixel(tick),
-    "stripes": lambda tick: vertical_stripes(tick),
-    "panel_walk": lambda tick: panel_blocks(tick),
-    "border": lambda tick: border(),
+PATTERN_FACTORIES: dict[str, Callable[..., Frame]] = {
+    "pixel_walk": lambda tick, width=32, height=8: single_pixel(tick, width, height),
+    "stripes": lambda tick, width=32, height=8: vertical_stripes(tick, width, height),
+    "panel_walk": lambda tick, width=32, height=8: panel_blocks(tick, width, height),
+    "border": lambda tick, width=32, height=8: border(width, height),
 }
+
+
+def pattern_periods(width: int = 32, height: int = 8, panel_width: int = 8, panel_height: int = 8) -> dict[str, PeriodicSpec]:
+    """Periods in ticks for a ``width`` x ``height`` canvas; every tick is a distinct frame."""
+    return {
+        "pixel_walk": PeriodicSpec(period=width * height, step=1),
+        "stripes": PeriodicSpec(period=2, step=1),
+        "panel_walk": PeriodicSpec(period=max(width // panel_width, 1) * max(height // panel_height, 1), step=1),
+        "border": PeriodicSpec(period=1, step=1),
+    }
+
+
+PATTERN_PERIODS = pattern_periods()
@@ -0,0 +1,282 @@
+"""Per-module post-processing chain.
+
+A module's ``settings["effects"]`` is an ordered list such as::
+
+    [{"type": "mirror", "mode": "horizontal"}, {"type": "hue_shift", "speed": 30}, {"type": "fade", "amount": 0.6}]
+
+The chain is compiled once per distinct effect list and applied in the
+declared order. Consecutive geometric effects (mirror, scroll) collapse into
+one table of source candidates per output pixel, consecutive color effects
+(recolor, invert, hue_shift, fade, gamma) into one function that is memoized
+per distinct input color. Each such run is one pass over the frame, so a
+chain like ``[mirror, hue_shift, fade]`` still costs two passes.
+"""
+
+from __future__ import annotations
+
+import colorsys
+import json
+from functools import lru_cache
+
+from app.services.colors import parse_hex_color, scale_color
+
+Color = tuple[int, int, int]
+Frame = list[list[int]]
+ColorFrame = list[list[Color | None]]
+
+EFFECT_TYPES = ("mirror", "recolor", "invert", "hue_shift", "fade", "scroll", "gamma")
+MIRROR_MODES = {"horizontal", "vertical", "quad"}
+SCROLL_AXES = {"x", "y"}
+MAX_EFFECTS = 8
+DEFAULT_PIXEL_COLOR = (80, 80, 80)
+# Distinct input colors memoized per chain state before the memo is reset.
+MAX_COLOR_MEMO = 4096
+
+
+def _float(value: object, minimum: float, maximum: float, fallback: float) -> float:
+    try:
+        parsed = float(value)
+    except (TypeError, ValueError):
+        return fallback
+    return max(minimum, min(maximum, parsed))
+
+
+def _hex(value: object, fallback: str) -> str:
+    color = parse_hex_color(value if isinstance(value, str) else None, parse_hex_color(fallback, (240, 240, 240)))
+    return "#{:02x}{:02x}{:02x}".format(*color)
+
+
+def normalize_effects(raw: object) -> list[dict]:
+    """Drop unknown entries and clamp parameters; the result is what gets stored and compiled."""
+    if not isinstance(raw, list):
+        return []
+    effects = []
+    for entry in raw[:MAX_EFFECTS]:
+        if not isinstance(entry, dict):
+            continue
+        kind = str(entry.get("type", "")).strip().lower()
+        if kind == "mirror":
+            mode = str(entry.get("mode", "horizontal")).strip().lower()
+            effects.append({"type": kind, "mode": mode if mode in MIRROR_MODES else "horizontal"})
+        elif kind == "recolor":
+            effects.append({"type": kind, "color": _hex(entry.get("color"), "#f0f0f0")})
+        elif kind == "invert":
+            effects.append({"type": kind, "color": _hex(entry.get("color"), "#f0f0f0")})
+        elif kind == "hue_shift":
+            effects.append({
+                "type": kind,
+                "degrees": _float(entry.get("degrees"), -360.0, 360.0, 0.0),
+                "speed": _float(entry.get("speed"), -360.0, 360.0, 0.0),
+            })
+        elif kind == "fade":
+            effects.append({"type": kind, "amount": _float(entry.get("amount"), 0.0, 1.0, 1.0)})
+        elif kind == "scroll":
+            axis = str(entry.get("axis", "x")).strip().lower()
+            effects.append({
+                "type": kind,
+                "axis": axis if axis in SCROLL_AXES else "x",
+                "speed": _float(entry.get("speed"), -64.0, 64.0, 8.0),
+            })
+        elif kind == "gamma":
+            effects.append({"type": kind, "value": _float(entry.get("value"), 0.2, 5.0, 2.2)})
+    return effects
+
+
+def _mirror_sources(mode: str, x: int, y: int, width: int, height: int) -> list[tuple[int, int]]:
+    """Source pixels in priority order; same winner rule as the animation mirror (later row-major wins)."""
+    candidates = [(x, y)]
+    if mode in {"horizontal", "quad"}:
+        mx = width - 1 - x
+        candidates = [(max(x, mx), y), (min(x, mx), y)] if mx != x else candidates
+    if mode in {"vertical", "quad"}:
+        my = height - 1 - y
+        if my != y:
+            candidates = [(cx, max(y, my)) for cx, _ in candidates] + [(cx, min(y, my)) for cx, _ in candidates]
+    return candidates
+
+
+GEOMETRIC_EFFECTS = {"mirror", "scroll"}
+
+
+class EffectChain:
+    def __init__(self, effects: list[dict], width: int, height: int):
+        self.effects = effects
+        self.width = width
+        self.height = height
+        # Runs of consecutive steps of one kind, in declared order: (is_geometric, steps).
+        self._segments: list[tuple[bool, list[dict]]] = []
+        for effect in effects:
+            geometric = effect["type"] in GEOMETRIC_EFFECTS
+            if self._segments and self._segments[-1][0] == geometric:
+                self._segments[-1][1].append(effect)
+            else:
+                self._segments.append((geometric, [effect]))
+        # Per segment: source tables by scroll offsets, or the color memo and the hue shifts it is valid for.
+        self._sources: list[dict[tuple[int, ...], list[list[tuple[tuple[int, int], ...]]]]] = [{} for _ in self._segments]
+        self._memo_keys: list[tuple | None] = [None] * len(self._segments)
+        self._memos: list[dict[tuple[int, Color | None], tuple[int, Color | None]]] = [{} for _ in self._segments]
+        self._gamma_tables = {
+            effect["value"]: bytes(round(((value / 255) ** effect["value"]) * 255) for value in range(256))
+            for effect in effects
+            if effect["type"] == "gamma"
+        }
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.effects
+
+    def _scroll_offsets(self, steps: list[dict], t: float) -> tuple[int, ...]:
+        offsets = []
+        for effect in steps:
+            if effect["type"] == "scroll":
+                size = self.width if effect["axis"] == "x" else self.height
+                offsets.append(int(t * effect["speed"]) % size)
+        return tuple(offsets)
+
+    def _source_table(self, segment: int, offsets: tuple[int, ...]) -> list[list[tuple[tuple[int, int], ...]]]:
+        """Per output pixel, the candidate source pixels after a run of geometric steps (first lit one wins)."""
+        cache = self._sources[segment]
+        table = cache.get(offsets)
+        if table is not None:
+            return table
+        steps = self._segments[segment][1]
+        width, height = self.width, self.height
+        table = []
+        for y in range(height):
+            row = []
+            for x in range(width):
+                candidates = [(x, y)]
+                scroll_idx = len(offsets)
+                # Walk the steps from the last one back to the segment's input frame.
+                for effect in reversed(steps):
+                    expanded: list[tuple[int, int]] = []
+                    if effect["type"] == "scroll":
+                        scroll_idx -= 1
+                        offset = offsets[scroll_idx]
+                        for cx, cy in candidates:
+                            if effect["axis"] == "x":
+                                expanded.append(((cx + offset) % width, cy))
+                            else:
+                                expanded.append((cx, (cy + offset) % height))
+                    else:
+                        for cx, cy in candidates:
+                            expanded.extend(_mirror_sources(effect["mode"], cx, cy, width, height))
+                    candidates = list(dict.fromkeys(expanded))
+                row.append(tuple(candidates))
+            table.append(row)
+        if len(cache) >= width + height:
+            cache.clear()
+        cache[offsets] = table
+        return table
+
+    @staticmethod
+    def _hue_shift(steps: list[dict], t: float) -> tuple[int, ...]:
+        return tuple(
+            int(effect["degrees"] + t * effect["speed"]) % 360
+            for effect in steps
+            if effect["type"] == "hue_shift"
+        )
+
+    def _map_color(self, steps: list[dict], lit: int, color: Color | None, shifts: tuple[int, ...]) -> tuple[int, Color | None]:
+        shift_idx = 0
+        for effect in steps:
+            kind = effect["type"]
+            if kind == "invert":
+                if lit:
+                    lit, color = 0, None
+                else:
+                    lit, color = 1, parse_hex_color(effect["color"], (240, 240, 240))
+                continue
+            if not lit:
+                if kind == "hue_shift":
+                    shift_idx += 1
+                continue
+            if kind == "recolor":
+                color = parse_hex_color(effect["color"], (240, 240, 240))
+            elif kind == "hue_shift":
+                r, g, b = color or DEFAULT_PIXEL_COLOR
+                h, s, v = colorsys.rgb_to_hsv(r / 255, g / 255, b / 255)
+                r, g, b = colorsys.hsv_to_rgb((h + shifts[shift_idx] / 360) % 1.0, s, v)
+                color = (round(r * 255), round(g * 255), round(b * 255))
+                shift_idx += 1
+            elif kind == "fade":
+                color = scale_color(color or DEFAULT_PIXEL_COLOR, effect["amount"])
+            elif kind == "gamma":
+                table = self._gamma_tables[effect["value"]]
+                r, g, b = color or DEFAULT_PIXEL_COLOR
+                color = (table[r], table[g], table[b])
+            if color == (0, 0, 0):
+                lit, color = 0, None
+        return lit, color
+
+    def apply(self, frame: Frame, color_frame: ColorFrame, t: float) -> tuple[Frame, ColorFrame]:
+        for segment, (geometric, steps) in enumerate(self._segments):
+            if geometric:
+                frame, color_frame = self._apply_geometry(frame, color_frame, self._source_table(segment, self._scroll_offsets(steps, t)))
+            else:
+                frame, color_frame = self._apply_colors(segment, steps, frame, color_frame, t)
+        return frame, color_frame
+
+    def _apply_geometry(
+        self,
+        frame: Frame,
+        color_frame: ColorFrame,
+        sources: list[list[tuple[tuple[int, int], ...]]],
+    ) -> tuple[Frame, ColorFrame]:
+        out_frame: Frame = []
+        out_colors: ColorFrame = []
+        for source_row in sources:
+            frame_row = []
+            color_row: list[Color | None] = []
+            for candidates in source_row:
+                lit, color = 0, None
+                for sx, sy in candidates:
+                    if frame[sy][sx]:
+                        lit, color = 1, color_frame[sy][sx]
+                        break
+                frame_row.append(lit)
+                color_row.append(color)
+            out_frame.append(frame_row)
+            out_colors.append(color_row)
+        return out_frame, out_colors
+
+    def _apply_colors(
+        self,
+        segment: int,
+        steps: list[dict],
+        frame: Frame,
+        color_frame: ColorFrame,
+        t: float,
+    ) -> tuple[Frame, ColorFrame]:
+        shifts = self._hue_shift(steps, t)
+        if shifts != self._memo_keys[segment] or len(self._memos[segment]) > MAX_COLOR_MEMO:
+            self._memo_keys[segment] = shifts
+            self._memos[segment] = {}
+        memo = self._memos[segment]
+
+        out_frame: Frame = []
+        out_colors: ColorFrame = []
+        for y in range(self.height):
+            frame_row = []
+            color_row: list[Color | None] = []
+            for x in range(self.width):
+                key = (1, color_frame[y][x]) if frame[y][x] else (0, None)
+                mapped = memo.get(key)
+                if mapped is None:
+                    mapped = memo[key] = self._map_color(steps, key[0], key[1], shifts)
+                frame_row.append(mapped[0])
+                color_row.append(mapped[1])
+            out_frame.append(frame_row)
+            out_colors.append(color_row)
+        return out_frame, out_colors
+
+
+@lru_cache(maxsize=64)
+def _compile(spec: str, width: int, height: int) -> EffectChain:
+    return EffectChain(json.loads(spec), width, height)
+
+
+def compile_chain(effects: object, width: int = 32, height: int = 8) -> EffectChain:
+    """Compiled chain for a (raw) effect list; identical lists share one cached chain."""
+    normalized = normalize_effects(effects)
+    return _compile(json.dumps(normalized, sort_keys=True), width, height)
@@ -0,0 +1,163 @@
+"""Per-module render budget tracking with a stepwise degradation ladder.
+
+Every module render is timed against a budget. Repeated overruns move the
+module one rung down the ladder (reuse frames, lower its render rate, switch
+to a cheaper variant); a sustained period well under budget moves it back up.
+Each transition is kept in the module's perf record for ``/api/debug/status``.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+# Rung name -> render every Nth tick (other ticks replay the last frame).
+LADDER: tuple[tuple[str, int], ...] = (
+    ("full", 1),
+    ("reuse_last_frame", 1),
+    ("halve_fps", 2),
+    ("cheap_variant", 2),
+    ("quarter_fps", 4),
+)
+CHEAP_LEVEL = 3
+
+
+@dataclass
+class RenderPlan:
+    reuse_last_frame: bool
+    use_cheap_variant: bool
+    level: str
+
+
+@dataclass
+class ModulePerf:
+    key: str
+    level: int = 0
+    renders: int = 0
+    reused_frames: int = 0
+    overruns: int = 0
+    last_ms: float | None = None
+    avg_ms: float | None = None
+    max_ms: float = 0.0
+    has_cheap_variant: bool = False
+    reuse_next: bool = False
+    consecutive_over: int = 0
+    consecutive_under: int = 0
+    ticks: int = 0
+    decisions: deque = field(default_factory=lambda: deque(maxlen=20))
+
+    def snapshot(self) -> dict:
+        return {
+            "level": LADDER[self.level][0],
+            "renders": self.renders,
+            "reused_frames": self.reused_frames,
+            "overruns": self.overruns,
+            "last_ms": self.last_ms,
+            "avg_ms": round(self.avg_ms, 3) if self.avg_ms is not None else None,
+            "max_ms": round(self.max_ms, 3),
+            "has_cheap_variant": self.has_cheap_variant,
+            "decisions": list(self.decisions),
+        }
+
+
+class RenderBudget:
+    def __init__(
+        self,
+        budget_ms: float,
+        escalate_after: int = 3,
+        recover_after: int = 60,
+        smoothing: float = 0.2,
+    ):
+        self._logger = logging.getLogger(__name__)
+        self.budget_ms = max(float(budget_ms), 0.1)
+        self.escalate_after = max(int(escalate_after), 1)
+        self.recover_after = max(int(recover_after), 1)
+        self.smoothing = smoothing
+        self._modules: dict[str, ModulePerf] = {}
+
+    def _perf(self, key: str) -> ModulePerf:
+        perf = self._modules.get(key)
+        if perf is None:
+            perf = self._modules[key] = ModulePerf(key=key)
+        return perf
+
+    def plan(self, key: str, has_last_frame: bool) -> RenderPlan:
+        """Decide whether this tick renders the module or replays its last frame."""
+        perf = self._perf(key)
+        perf.ticks += 1
+        name, interval = LADDER[perf.level]
+        reuse = has_last_frame and (perf.reuse_next or perf.ticks % interval != 0)
+        perf.reuse_next = False
+        if reuse:
+            perf.reused_frames += 1
+        return RenderPlan(
+            reuse_last_frame=reuse,
+            use_cheap_variant=perf.level >= CHEAP_LEVEL and perf.has_cheap_variant,
+            level=name,
+        )
+
+    def record(self, key: str, elapsed_ms: float, has_cheap_variant: bool) -> None:
+        perf = self._perf(key)
+        perf.has_cheap_variant = has_cheap_variant
+        perf.renders += 1
+        perf.last_ms = round(elapsed_ms, 3)
+        perf.max_ms = max(perf.max_ms, elapsed_ms)
+        perf.avg_ms = elapsed_ms if perf.avg_ms is None else perf.avg_ms + (elapsed_ms - perf.avg_ms) * self.smoothing
+
+        if elapsed_ms > self.budget_ms:
+            perf.overruns += 1
+            perf.consecutive_over += 1
+            perf.consecutive_under = 0
+            if perf.level >= 1:
+                perf.reuse_next = True
+            if perf.consecutive_over >= self.escalate_after and perf.level < len(LADDER) - 1:
+                target = perf.level + 1
+                if target == CHEAP_LEVEL and not has_cheap_variant:
+                    target += 1
+                self._move(perf, target, "escalate")
+            return
+
+        perf.consecutive_over = 0
+        if perf.level and perf.avg_ms < self.budget_ms * 0.5:
+            perf.consecutive_under += 1
+            if perf.consecutive_under >= self.recover_after:
+                target = perf.level - 1
+                if target == CHEAP_LEVEL and not has_cheap_variant:
+                    target -= 1
+                self._move(perf, target, "recover")
+        else:
+            perf.consecutive_under = 0
+
+    def _move(self, perf: ModulePerf, target: int, action: str) -> None:
+        previous = LADDER[perf.level][0]
+        perf.level = target
+        perf.consecutive_over = 0
+        perf.consecutive_under = 0
+        decision = {
+            "ts": time.time(),
+            "action": action,
+            "from": previous,
+            "to": LADDER[target][0],
+            "avg_ms": round(perf.avg_ms or 0.0, 3),
+            "last_ms": perf.last_ms,
+            "budget_ms": self.budget_ms,
+        }
+        perf.decisions.append(decision)
+        self._logger.info(
+            "Render budget %s for module %s: %s -> %s (avg %.2f ms, budget %.2f ms)",
+            action,
+            perf.key,
+            previous,
+            decision["to"],
+            decision["avg_ms"],
+            self.budget_ms,
+        )
+
+    def get_snapshot(self) -> dict:
+        return {
+            "budget_ms": self.budget_ms,
+            "ladder": [name for name, _ in LADDER],
+            "modules": {key: perf.snapshot() for key, perf in self._modules.items()},
+        }
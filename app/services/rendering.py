@@ -108,6 +108,45 @@ def blank_color_frame(width: int = 32, height: int = 8) -> list[list[tuple[int,
     return [[None for _ in range(width)] for _ in range(height)]
 
 
+def unpack_rgb(
+    data: bytes | memoryview,
+    row_stride: int,
+    width: int = 32,
+    height: int = 8,
+    offset: int = 0,
+) -> tuple[list[list[int]], list[list[tuple[int, int, int] | None]]]:
+    """Frame + color frame from a packed RGB buffer (black = off).
+
+    Row ``y`` of the window starts at byte ``offset + y * row_stride``; rows
+    past the end of ``data`` stay off.
+    """
+    frame: list[list[int]] = []
+    colors: list[list[tuple[int, int, int] | None]] = []
+    for y in range(height):
+        start = offset + y * row_stride
+        row = data[start:start + width * 3]
+        color_row = [(r, g, b) if r or g or b else None for r, g, b in zip(row[0::3], row[1::3], row[2::3])]
+        color_row += [None] * (width - len(color_row))
+        colors.append(color_row)
+        frame.append([0 if color is None else 1 for color in color_row])
+    return frame, colors
+
+
+def lit_mask(rgb: bytes | memoryview) -> bytes:
+    """One byte per packed RGB pixel, nonzero where the pixel is lit.
+
+    The three channels are ORed as big integers, which avoids a Python loop
+    over the pixels; map the result with ``bytes.translate``.
+    """
+    count = len(rgb) // 3
+    if not count:
+        return b""
+    combined = 0
+    for channel in range(3):
+        combined |= int.from_bytes(bytes(rgb[channel::3]), "big")
+    return combined.to_bytes(count, "big")
+
+
 def normalize_char_spacing(char_spacing: int | None, font_size: str = "normal") -> int:
     default_spacing = 1
     if char_spacing is None:
@@ -0,0 +1,281 @@
+"""Sprite atlases: one image plus a JSON index of named rectangles and animations.
+
+An atlas ``app/sprites/<atlas>.json`` names its image (any static format the
+bitmap loader reads, or GIF/PNG with transparency; black = off as everywhere
+else), the sprite rectangles in it and optional animations::
+
+    {
+      "image": "icons.ppm",
+      "sprites": {"sun": [0, 0, 5, 7], "drop": {"x": 6, "y": 0, "w": 5, "h": 7}},
+      "animations": {"wait": {"frames": ["wait_1", "wait_2"], "frame_ms": 400}}
+    }
+
+Atlases are loaded on first use and shared by all modules. Each sprite is
+stored packed: its lit mask as one int per row (bit ``x`` = column ``x``, as
+in ``bitplane``) plus its RGB bytes, so blitting is one shift per row and a
+color lookup per lit pixel. Sprites are referenced as ``"<atlas>:<name>"``;
+an animation name resolves to the frame shown at the given frame time.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+import threading
+import time
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from itertools import accumulate
+from pathlib import Path
+
+from app.services.animated_bitmap import decode_still, is_animation_file
+from app.services.bitmap_loader import BitmapLoader
+
+Color = tuple[int, int, int]
+
+SPRITE_DIR = Path(__file__).resolve().parent.parent / "sprites"
+ATLAS_NAME = re.compile(r"[A-Za-z0-9_-]+")
+MAX_SHEET_PIXELS = 1024 * 1024
+MAX_SPRITE_SIZE = 64
+DEFAULT_FRAME_MS = 250
+# How often an atlas in use is checked for changed files.
+RECHECK_S = 5.0
+
+
+@dataclass(frozen=True)
+class Sprite:
+    name: str
+    width: int
+    height: int
+    planes: tuple[int, ...]
+    rgb: bytes
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.rgb) + 8 * len(self.planes)
+
+    def color(self, x: int, y: int) -> Color:
+        offset = (y * self.width + x) * 3
+        return self.rgb[offset], self.rgb[offset + 1], self.rgb[offset + 2]
+
+
+@dataclass(frozen=True)
+class SpriteAnimation:
+    frames: tuple[Sprite, ...]
+    frame_ms: tuple[int, ...]
+    _ends: tuple[int, ...] = field(default=(), repr=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_ends", tuple(accumulate(self.frame_ms)))
+
+    def at(self, t: float) -> Sprite:
+        """Frame shown at time ``t`` (seconds) of an endlessly looping playback."""
+        if len(self.frames) == 1:
+            return self.frames[0]
+        return self.frames[bisect_right(self._ends, int(t * 1000) % self._ends[-1])]
+
+
+@dataclass
+class SpriteAtlas:
+    name: str
+    sprites: dict[str, Sprite]
+    animations: dict[str, SpriteAnimation]
+    image_path: Path
+    # (index mtime, image mtime) the atlas was built from.
+    version: tuple[float, float]
+    checked_at: float = 0.0
+
+    @property
+    def nbytes(self) -> int:
+        return sum(sprite.nbytes for sprite in self.sprites.values())
+
+    def resolve(self, name: str, t: float = 0.0) -> Sprite:
+        sprite = self.sprites.get(name)
+        if sprite is not None:
+            return sprite
+        animation = self.animations.get(name)
+        if animation is None:
+            raise ValueError(f"sprite {self.name}:{name} not found")
+        return animation.at(t)
+
+
+def _sheet_pixels(path: Path) -> tuple[int, int, list[bytes], list[int]]:
+    """Rows of packed RGB and lit masks for the whole sheet."""
+    data = path.read_bytes()
+    if is_animation_file(path):
+        width, height, rgba = decode_still(data)
+        if width * height > MAX_SHEET_PIXELS:
+            raise ValueError(f"sprite sheet {width}x{height} too large")
+        rows, masks = [], []
+        for y in range(height):
+            line = rgba[y * width * 4:(y + 1) * width * 4]
+            rgb = bytearray(width * 3)
+            bits = 0
+            for x in range(width):
+                r, g, b, a = line[x * 4:x * 4 + 4]
+                if a >= 128 and (r or g or b):
+                    rgb[x * 3:x * 3 + 3] = bytes((r, g, b))
+                    bits |= 1 << x
+            rows.append(bytes(rgb))
+            masks.append(bits)
+        return width, height, rows, masks
+
+    bitmap = BitmapLoader.parse(data)
+    if bitmap.width * bitmap.height > MAX_SHEET_PIXELS:
+        raise ValueError(f"sprite sheet {bitmap.width}x{bitmap.height} too large")
+    rows = [bytes(bitmap.row_rgb(y, 0, bitmap.width)) for y in range(bitmap.height)]
+    masks = []
+    for rgb in rows:
+        bits = 0
+        for x in range(bitmap.width):
+            if rgb[x * 3] or rgb[x * 3 + 1] or rgb[x * 3 + 2]:
+                bits |= 1 << x
+        masks.append(bits)
+    return bitmap.width, bitmap.height, rows, masks
+
+
+def _rect(value: object) -> tuple[int, int, int, int]:
+    if isinstance(value, dict):
+        value = [value.get("x"), value.get("y"), value.get("w"), value.get("h")]
+    if not isinstance(value, (list, tuple)) or len(value) != 4:
+        raise ValueError("sprite rectangle must be [x, y, w, h]")
+    try:
+        x, y, w, h = (int(item) for item in value)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("sprite rectangle must be [x, y, w, h]") from exc
+    return x, y, w, h
+
+
+def load_atlas(index_path: Path) -> SpriteAtlas:
+    """Parse an atlas index and cut its sprites out of the sheet; raises ``ValueError`` for invalid atlases."""
+    try:
+        index = json.loads(index_path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"invalid atlas index: {exc}") from exc
+    if not isinstance(index, dict) or not isinstance(index.get("sprites"), dict):
+        raise ValueError("atlas index needs a 'sprites' object")
+    image_path = (index_path.parent / str(index.get("image", ""))).resolve()
+    if index_path.parent.resolve() not in image_path.parents or not image_path.is_file():
+        raise ValueError(f"atlas image not found: {index.get('image')}")
+
+    sheet_width, sheet_height, rows, masks = _sheet_pixels(image_path)
+    sprites: dict[str, Sprite] = {}
+    for name, value in index["sprites"].items():
+        x, y, w, h = _rect(value)
+        if not (0 < w <= MAX_SPRITE_SIZE and 0 < h <= MAX_SPRITE_SIZE):
+            raise ValueError(f"sprite {name}: size {w}x{h} not supported")
+        if x < 0 or y < 0 or x + w > sheet_width or y + h > sheet_height:
+            raise ValueError(f"sprite {name} lies outside the {sheet_width}x{sheet_height} sheet")
+        sprites[name] = Sprite(
+            name=name,
+            width=w,
+            height=h,
+            planes=tuple((masks[row] >> x) & ((1 << w) - 1) for row in range(y, y + h)),
+            rgb=b"".join(rows[row][x * 3:(x + w) * 3] for row in range(y, y + h)),
+        )
+
+    animations: dict[str, SpriteAnimation] = {}
+    for name, value in (index.get("animations") or {}).items():
+        frames = value.get("frames") if isinstance(value, dict) else value
+        if not isinstance(frames, list) or not frames:
+            raise ValueError(f"animation {name} needs a list of frames")
+        missing = [frame for frame in frames if frame not in sprites]
+        if missing:
+            raise ValueError(f"animation {name} references unknown sprites: {', '.join(map(str, missing))}")
+        frame_ms = value.get("frame_ms", DEFAULT_FRAME_MS) if isinstance(value, dict) else DEFAULT_FRAME_MS
+        if not isinstance(frame_ms, list):
+            frame_ms = [frame_ms] * len(frames)
+        if len(frame_ms) != len(frames):
+            raise ValueError(f"animation {name}: frame_ms must be one value or one per frame")
+        animations[name] = SpriteAnimation(
+            frames=tuple(sprites[frame] for frame in frames),
+            frame_ms=tuple(max(20, int(ms)) for ms in frame_ms),
+        )
+
+    return SpriteAtlas(
+        name=index_path.stem,
+        sprites=sprites,
+        animations=animations,
+        image_path=image_path,
+        version=(index_path.stat().st_mtime, image_path.stat().st_mtime),
+    )
+
+
+class SpriteLibrary:
+    """Lazily loaded, shared atlases; a changed atlas is picked up within ``recheck_s``."""
+
+    def __init__(self, base_dir: Path = SPRITE_DIR, recheck_s: float = RECHECK_S):
+        self._logger = logging.getLogger(__name__)
+        self.base_dir = base_dir.resolve()
+        self.recheck_s = recheck_s
+        self._lock = threading.Lock()
+        self._atlases: dict[str, SpriteAtlas] = {}
+        # Atlas name -> (error, monotonic time of the failed attempt); retried after ``recheck_s``.
+        self._failed: dict[str, tuple[str, float]] = {}
+        self._stats = {"atlas_loads": 0, "load_errors": 0, "lookups": 0, "misses": 0}
+
+    def atlas(self, name: str) -> SpriteAtlas:
+        if not ATLAS_NAME.fullmatch(name):
+            raise ValueError(f"invalid atlas name: {name}")
+        now = time.monotonic()
+        with self._lock:
+            atlas = self._atlases.get(name)
+            if atlas is not None and now - atlas.checked_at < self.recheck_s:
+                return atlas
+            failed = self._failed.get(name)
+            if atlas is None and failed is not None and now - failed[1] < self.recheck_s:
+                raise ValueError(failed[0])
+
+        index_path = self.base_dir / f"{name}.json"
+        if atlas is not None and self._unchanged(atlas, index_path):
+            atlas.checked_at = now
+            return atlas
+        try:
+            if not index_path.is_file():
+                raise ValueError(f"sprite atlas not found: {name}")
+            loaded = load_atlas(index_path)
+        except (ValueError, OSError) as exc:
+            self._logger.warning("Sprite atlas %s could not be loaded: %s", name, exc)
+            with self._lock:
+                self._failed[name] = (str(exc), now)
+                self._stats["load_errors"] += 1
+                if atlas is not None:
+                    # Keep serving the last good version.
+                    atlas.checked_at = now
+                    return atlas
+            raise ValueError(str(exc)) from exc
+        loaded.checked_at = now
+        with self._lock:
+            self._atlases[name] = loaded
+            self._failed.pop(name, None)
+            self._stats["atlas_loads"] += 1
+        return loaded
+
+    @staticmethod
+    def _unchanged(atlas: SpriteAtlas, index_path: Path) -> bool:
+        try:
+            return (index_path.stat().st_mtime, atlas.image_path.stat().st_mtime) == atlas.version
+        except OSError:
+            return False
+
+    def sprite(self, ref: str, t: float = 0.0) -> Sprite:
+        """Sprite for ``"<atlas>:<name>"`` (animations: the frame at time ``t``)."""
+        atlas_name, _, name = ref.partition(":")
+        self._stats["lookups"] += 1
+        try:
+            return self.atlas(atlas_name).resolve(name, t)
+        except ValueError:
+            self._stats["misses"] += 1
+            raise
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                **self._stats,
+                "atlases": {
+                    name: {"sprites": len(atlas.sprites), "animations": len(atlas.animations), "bytes": atlas.nbytes}
+                    for name, atlas in self._atlases.items()
+                },
+                "failed": {name: error for name, (error, _) in self._failed.items()},
+            }
@@ -0,0 +1,233 @@
+"""Compiled playlist timeline.
+
+The enabled module rows are compiled once per configuration change. Schedule
+rules in the module settings decide which rows are eligible when:
+
+- ``schedule_start`` / ``schedule_end`` (``"HH:MM"``, local time): daily
+  window, may wrap past midnight; empty = all day
+- ``schedule_weekdays``: list of weekdays (0 = Monday); empty = every day
+- ``weight``: how many slots the module gets per cycle (spread evenly)
+- ``priority``: only the eligible rows with the highest priority play
+
+Window edges split the week into segments with a fixed eligible set. Each
+segment gets one cycle with cumulative slot offsets, so "which module and
+which phase at time t" is a bisect over the week segments plus a bisect over
+the cycle. With no schedule rules the result matches the old
+``int(t) % total`` playlist exactly.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+WEEK_SECONDS = 7 * 86400
+MAX_WEIGHT = 10
+MAX_PRIORITY = 10
+
+
+def parse_time_of_day(value: object) -> int | None:
+    """``"HH:MM"`` to seconds after midnight; ``None`` for empty or malformed values."""
+    if not isinstance(value, str) or ":" not in value:
+        return None
+    hours, _, minutes = value.strip().partition(":")
+    try:
+        h, m = int(hours), int(minutes)
+    except ValueError:
+        return None
+    if not (0 <= h <= 24 and 0 <= m < 60) or h * 60 + m > 24 * 60:
+        return None
+    return (h * 60 + m) * 60
+
+
+def normalize_weekdays(value: object) -> list[int]:
+    if not isinstance(value, list):
+        return []
+    days = set()
+    for item in value:
+        try:
+            day = int(item)
+        except (TypeError, ValueError):
+            continue
+        if 0 <= day <= 6:
+            days.add(day)
+    return [] if len(days) == 7 else sorted(days)
+
+
+@dataclass(frozen=True)
+class Rule:
+    weekdays: frozenset[int]
+    start: int | None
+    end: int | None
+    weight: int
+    priority: int
+
+    @classmethod
+    def from_settings(cls, settings: dict) -> "Rule":
+        try:
+            weight = int(settings.get("weight", 1))
+        except (TypeError, ValueError):
+            weight = 1
+        try:
+            priority = int(settings.get("priority", 0))
+        except (TypeError, ValueError):
+            priority = 0
+        return cls(
+            weekdays=frozenset(normalize_weekdays(settings.get("schedule_weekdays"))),
+            start=parse_time_of_day(settings.get("schedule_start")),
+            end=parse_time_of_day(settings.get("schedule_end")),
+            weight=max(1, min(MAX_WEIGHT, weight)),
+            priority=max(0, min(MAX_PRIORITY, priority)),
+        )
+
+    @property
+    def has_window(self) -> bool:
+        return self.start is not None and self.end is not None and self.start != self.end
+
+    def edges(self) -> list[int]:
+        """Week seconds where this rule can switch between eligible and not."""
+        edges = []
+        for day in range(7):
+            # Midnight covers weekday filters; start/end cover the daily window.
+            edges.append(day * 86400)
+            if self.has_window:
+                edges.append(day * 86400 + self.start)
+                edges.append(day * 86400 + self.end % 86400)
+        return edges
+
+    def allows(self, week_second: int) -> bool:
+        day, second = divmod(week_second, 86400)
+        if not self.has_window:
+            return not self.weekdays or day in self.weekdays
+        if self.start < self.end:
+            return (not self.weekdays or day in self.weekdays) and self.start <= second < self.end
+        # Window wraps past midnight: the part after midnight belongs to the previous day's window.
+        if second >= self.start:
+            return not self.weekdays or day in self.weekdays
+        if second < self.end:
+            return not self.weekdays or (day - 1) % 7 in self.weekdays
+        return False
+
+
+@dataclass(frozen=True)
+class Slot:
+    row: dict
+    index: int
+    start: int
+    duration: int
+
+
+@dataclass(frozen=True)
+class Position:
+    row: dict
+    index: int
+    # Seconds since the module's slot started and until it ends.
+    phase: float
+    remaining: float
+
+
+class Cycle:
+    def __init__(self, rows: list[tuple[int, dict, Rule]]):
+        self.slots: list[Slot] = []
+        offset = 0
+        for idx, row, _ in _weighted_order(rows):
+            duration = max(1, int(row["duration_seconds"]))
+            self.slots.append(Slot(row=row, index=idx, start=offset, duration=duration))
+            offset += duration
+        self.total = max(offset, 1)
+        self._starts = [slot.start for slot in self.slots]
+
+    def at(self, t: float) -> Position | None:
+        if not self.slots:
+            return None
+        offset = int(t) % self.total
+        slot = self.slots[bisect_right(self._starts, offset) - 1]
+        phase = offset - slot.start + (t - int(t))
+        return Position(row=slot.row, index=slot.index, phase=phase, remaining=slot.duration - phase)
+
+
+def _weighted_order(rows: list[tuple[int, dict, Rule]]) -> list[tuple[int, dict, Rule]]:
+    """Smooth weighted round robin: a weight-3 module gets three slots spread over the cycle."""
+    if all(rule.weight == 1 for _, _, rule in rows):
+        return rows
+    total = sum(rule.weight for _, _, rule in rows)
+    current = [0] * len(rows)
+    order = []
+    for _ in range(total):
+        for pos, (_, _, rule) in enumerate(rows):
+            current[pos] += rule.weight
+        best = max(range(len(rows)), key=lambda pos: current[pos])
+        current[best] -= total
+        order.append(rows[best])
+    return order
+
+
+class PlaylistTimeline:
+    def __init__(self, rows: list[dict], tz: str = "UTC"):
+        self.rows = list(rows)
+        self._tz = ZoneInfo(tz)
+        rules = [(idx, row, Rule.from_settings(row.get("settings") or {})) for idx, row in enumerate(self.rows)]
+        self.scheduled = any(rule.has_window or rule.weekdays or rule.priority for _, _, rule in rules)
+        cycles: dict[tuple[int, ...], Cycle] = {}
+        if not self.scheduled:
+            self._edges = [0]
+            self._cycles = [Cycle(rules)]
+        else:
+            self._edges = sorted({edge % WEEK_SECONDS for _, _, rule in rules for edge in rule.edges()})
+            self._cycles = []
+            for edge in self._edges:
+                eligible = [item for item in rules if item[2].allows(edge)]
+                if eligible:
+                    top = max(rule.priority for _, _, rule in eligible)
+                    eligible = [item for item in eligible if item[2].priority == top]
+                members = tuple(idx for idx, _, _ in eligible)
+                if members not in cycles:
+                    cycles[members] = Cycle(eligible)
+                self._cycles.append(cycles[members])
+        self.cycle_count = len(cycles) or 1
+
+    def _week_second(self, t: float) -> int:
+        local = datetime.fromtimestamp(t, self._tz)
+        return local.weekday() * 86400 + local.hour * 3600 + local.minute * 60 + local.second
+
+    def _cycle(self, t: float) -> Cycle:
+        if not self.scheduled:
+            return self._cycles[0]
+        return self._cycles[bisect_right(self._edges, self._week_second(t)) - 1]
+
+    def at(self, t: float) -> Position | None:
+        """Active row and its phase at time ``t``; ``None`` if no module is scheduled then."""
+        return self._cycle(t).at(t)
+
+    def upcoming(self, t: float, horizon_s: float) -> list[tuple[float, Position]]:
+        """``(start_time, position)`` for every module switch from ``t`` up to ``t + horizon_s``."""
+        result: list[tuple[float, Position]] = []
+        cursor = t
+        end = t + horizon_s
+        while cursor < end and len(result) < 256:
+            position = self.at(cursor)
+            step = self._seconds_to_next_edge(cursor)
+            if position is not None:
+                if not result or result[-1][1].index != position.index:
+                    result.append((cursor, position))
+                step = min(step, position.remaining)
+            cursor += max(step, 1e-3)
+        return result
+
+    def _seconds_to_next_edge(self, t: float) -> float:
+        if not self.scheduled:
+            return float(WEEK_SECONDS)
+        week_second = self._week_second(t)
+        idx = bisect_right(self._edges, week_second)
+        next_edge = self._edges[idx] if idx < len(self._edges) else self._edges[0] + WEEK_SECONDS
+        return next_edge - week_second - (t - int(t))
+
+    def get_stats(self) -> dict:
+        return {
+            "rows": len(self.rows),
+            "scheduled": self.scheduled,
+            "segments": len(self._edges),
+            "cycles": self.cycle_count,
+        }
@@ -0,0 +1,324 @@
+"""Precomputed module transitions.
+
+When a transition starts, the outgoing frame and a snapshot of the incoming
+frame are blended into the complete sequence at the display FPS. Playback is
+then an index lookup, so the incoming module is not rendered at all while the
+transition runs and an expensive animation cannot make it stutter.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from app.services import bitplane
+
+Color = tuple[int, int, int]
+Frame = list[list[int]]
+ColorFrame = list[list[Color | None]]
+
+EFFECTS = {"slide", "slide_left", "slide_right", "wipe", "crossfade", "dissolve"}
+DEFAULT_PIXEL_COLOR = (80, 80, 80)
+
+GAMMA = 2.2
+LINEAR_LEVELS = 1 << 16
+# Gamma tables: blending happens in linear light so a crossfade does not dip in brightness.
+# 16-bit linear keeps dark channels (down to ~2/255) intact through the round trip.
+TO_LINEAR = tuple(round(((value / 255) ** GAMMA) * (LINEAR_LEVELS - 1)) for value in range(256))
+FROM_LINEAR = bytes(round(((value / (LINEAR_LEVELS - 1)) ** (1 / GAMMA)) * 255) for value in range(LINEAR_LEVELS))
+
+
+def slide_vertical(
+    from_frame: Frame,
+    from_colors: ColorFrame,
+    to_frame: Frame,
+    to_colors: ColorFrame,
+    progress: float,
+    direction: str,
+    from_planes: bitplane.Planes | None = None,
+    to_planes: bitplane.Planes | None = None,
+) -> tuple[Frame, ColorFrame]:
+    height, width = len(to_frame), len(to_frame[0])
+    shift = int(round(max(0.0, min(1.0, progress)) * height))
+    if direction == "down":
+        old_shift, new_shift = shift, shift - height
+    else:
+        old_shift, new_shift = -shift, height - shift
+
+    from_planes = from_planes or bitplane.pack(from_frame)
+    to_planes = to_planes or bitplane.pack(to_frame)
+    out_frame: Frame = []
+    out_colors: ColorFrame = []
+    # Whole-row shifts: every output row comes from exactly one source row (or stays empty).
+    for y in range(height):
+        oy = y - old_shift
+        ny = y - new_shift
+        if 0 <= ny < height:
+            bits, colors = to_planes[ny], to_colors[ny]
+        elif 0 <= oy < height:
+            bits, colors = from_planes[oy], from_colors[oy]
+        else:
+            bits, colors = 0, None
+        out_frame.append(list(bitplane.row_bits(bits, width)))
+        out_colors.append(bitplane.masked_colors(colors, bits, width))
+    return out_frame, out_colors
+
+
+def slide_horizontal(
+    from_frame: Frame,
+    from_colors: ColorFrame,
+    to_frame: Frame,
+    to_colors: ColorFrame,
+    progress: float,
+    leftwards: bool,
+) -> tuple[Frame, ColorFrame]:
+    """Both frames side by side on one strip; the strip moves left (new frame enters from the right) or right."""
+    width = len(to_frame[0])
+    shift = int(round(max(0.0, min(1.0, progress)) * width))
+    if leftwards:
+        frame = [old[shift:] + new[:shift] for old, new in zip(from_frame, to_frame)]
+        colors = [old[shift:] + new[:shift] for old, new in zip(from_colors, to_colors)]
+    else:
+        cut = width - shift
+        frame = [new[cut:] + old[:cut] for old, new in zip(from_frame, to_frame)]
+        colors = [new[cut:] + old[:cut] for old, new in zip(from_colors, to_colors)]
+    return frame, colors
+
+
+def wipe(
+    from_frame: Frame,
+    from_colors: ColorFrame,
+    to_frame: Frame,
+    to_colors: ColorFrame,
+    progress: float,
+    leftwards: bool,
+) -> tuple[Frame, ColorFrame]:
+    """A vertical edge sweeps across; columns behind it already show the new frame."""
+    width = len(to_frame[0])
+    edge = int(round(max(0.0, min(1.0, progress)) * width))
+    if leftwards:
+        cut = width - edge
+        return (
+            [old[:cut] + new[cut:] for old, new in zip(from_frame, to_frame)],
+            [old[:cut] + new[cut:] for old, new in zip(from_colors, to_colors)],
+        )
+    return (
+        [new[:edge] + old[edge:] for old, new in zip(from_frame, to_frame)],
+        [new[:edge] + old[edge:] for old, new in zip(from_colors, to_colors)],
+    )
+
+
+def crossfade_sequence(
+    from_frame: Frame,
+    from_colors: ColorFrame,
+    to_frame: Frame,
+    to_colors: ColorFrame,
+    progresses: list[float],
+) -> list[tuple[Frame, ColorFrame]]:
+    """Gamma-correct crossfade: only pixels that differ between both frames are mixed, via gamma LUTs.
+
+    Pixels that look the same in both frames are constant for the whole
+    sequence; every step starts from a copy of those rows. The differing
+    pixels are grouped by their (old, new) color pair, so each step mixes
+    every pair once instead of every pixel.
+    """
+    height, width = len(to_frame), len(to_frame[0])
+    base_frame: Frame = [[0] * width for _ in range(height)]
+    base_colors: ColorFrame = [[None] * width for _ in range(height)]
+    pairs: dict[tuple[Color, Color], list[tuple[int, int]]] = {}
+    for y in range(height):
+        for x in range(width):
+            old = (from_colors[y][x] or DEFAULT_PIXEL_COLOR) if from_frame[y][x] else None
+            new = (to_colors[y][x] or DEFAULT_PIXEL_COLOR) if to_frame[y][x] else None
+            if old == new:
+                if new is not None:
+                    base_frame[y][x] = 1
+                    base_colors[y][x] = new
+                continue
+            pairs.setdefault((old or (0, 0, 0), new or (0, 0, 0)), []).append((x, y))
+    linear = [
+        (tuple(TO_LINEAR[channel] for channel in old), tuple(TO_LINEAR[channel] for channel in new), positions)
+        for (old, new), positions in pairs.items()
+    ]
+
+    frames = []
+    for progress in progresses:
+        amount = max(0.0, min(1.0, progress))
+        if amount == 0.0:
+            frames.append(([row[:] for row in from_frame], [row[:] for row in from_colors]))
+            continue
+        keep = 1.0 - amount
+        frame = [row[:] for row in base_frame]
+        colors = [row[:] for row in base_colors]
+        for (r0, g0, b0), (r1, g1, b1), positions in linear:
+            color = (
+                FROM_LINEAR[int(r0 * keep + r1 * amount)],
+                FROM_LINEAR[int(g0 * keep + g1 * amount)],
+                FROM_LINEAR[int(b0 * keep + b1 * amount)],
+            )
+            if color == (0, 0, 0):
+                continue
+            for x, y in positions:
+                frame[y][x] = 1
+                colors[y][x] = color
+        frames.append((frame, colors))
+    return frames
+
+
+_DISSOLVE_ORDERS: dict[tuple[int, int], list[tuple[int, int]]] = {}
+
+
+def dissolve_order(width: int, height: int) -> list[tuple[int, int]]:
+    """Fixed pseudo-random pixel order per canvas size, shared by all dissolves."""
+    order = _DISSOLVE_ORDERS.get((width, height))
+    if order is None:
+        order = [(x, y) for y in range(height) for x in range(width)]
+        random.Random(width * 7919 + height).shuffle(order)
+        _DISSOLVE_ORDERS[(width, height)] = order
+    return order
+
+
+def dissolve_sequence(
+    from_frame: Frame,
+    from_colors: ColorFrame,
+    to_frame: Frame,
+    to_colors: ColorFrame,
+    progresses: list[float],
+) -> list[tuple[Frame, ColorFrame]]:
+    """Pixels switch to the new frame one by one; each step only copies the pixels added since the last one."""
+    height, width = len(to_frame), len(to_frame[0])
+    order = dissolve_order(width, height)
+    frame = [row[:] for row in from_frame]
+    colors = [row[:] for row in from_colors]
+    switched = 0
+    frames = []
+    for progress in progresses:
+        target = int(round(max(0.0, min(1.0, progress)) * len(order)))
+        for x, y in order[switched:target]:
+            frame[y][x] = to_frame[y][x]
+            colors[y][x] = to_colors[y][x]
+        switched = max(switched, target)
+        frames.append(([row[:] for row in frame], [row[:] for row in colors]))
+    return frames
+
+
+@dataclass
+class Transition:
+    """A running transition; all of its frames are computed when it starts."""
+
+    to_key: str
+    effect: str
+    direction: str
+    duration_ms: int
+    started_at: float
+    frames: list[tuple[Frame, ColorFrame]]
+    precompute_ms: float
+    played: int = 0
+
+    def frame_at(self, now: float) -> tuple[Frame, ColorFrame] | None:
+        """Frame for wall time ``now``, or ``None`` once the transition is over."""
+        elapsed_ms = (now - self.started_at) * 1000.0
+        if elapsed_ms >= self.duration_ms:
+            return None
+        idx = max(0, min(int(elapsed_ms / self.duration_ms * len(self.frames)), len(self.frames) - 1))
+        self.played += 1
+        return self.frames[idx]
+
+    def frame(self, idx: int) -> tuple[Frame, ColorFrame]:
+        return self.frames[idx]
+
+    def cost(self) -> dict:
+        return {
+            "to_key": self.to_key,
+            "effect": self.effect,
+            "duration_ms": self.duration_ms,
+            "frames": len(self.frames),
+            "frames_played": self.played,
+            "precompute_ms": self.precompute_ms,
+        }
+
+
+class TransitionEngine:
+    def __init__(self, fps: int, history: int = 10):
+        self.fps = max(int(fps), 1)
+        self.active: Transition | None = None
+        self._history: deque[dict] = deque(maxlen=history)
+        self.started = 0
+
+    def start(
+        self,
+        from_frame: Frame,
+        from_colors: ColorFrame,
+        to_frame: Frame,
+        to_colors: ColorFrame,
+        to_key: str,
+        effect: str,
+        direction: str,
+        duration_ms: int,
+        now: float | None = None,
+    ) -> Transition:
+        """Prepare the full sequence; the outgoing and incoming frames are copied by the effects."""
+        if effect not in EFFECTS:
+            effect = "slide"
+        started = time.perf_counter()
+        count = max(1, math.ceil(duration_ms * self.fps / 1000))
+        progresses = [idx / count for idx in range(count)]
+        args = (from_frame, from_colors, to_frame, to_colors)
+        if effect == "crossfade":
+            frames = crossfade_sequence(*args, progresses)
+        elif effect == "dissolve":
+            frames = dissolve_sequence(*args, progresses)
+        elif effect == "slide":
+            from_planes, to_planes = bitplane.pack(from_frame), bitplane.pack(to_frame)
+            frames = [
+                slide_vertical(*args, progress, direction, from_planes=from_planes, to_planes=to_planes)
+                for progress in progresses
+            ]
+        elif effect == "wipe":
+            frames = [wipe(*args, progress, leftwards=direction == "up") for progress in progresses]
+        else:
+            leftwards = effect == "slide_left"
+            frames = [slide_horizontal(*args, progress, leftwards) for progress in progresses]
+
+        self._finish_active()
+        self.active = Transition(
+            to_key=to_key,
+            effect=effect,
+            direction=direction,
+            duration_ms=duration_ms,
+            started_at=time.time() if now is None else now,
+            frames=frames,
+            precompute_ms=round((time.perf_counter() - started) * 1000, 3),
+        )
+        self.started += 1
+        return self.active
+
+    def current(self, to_key: str, now: float) -> tuple[Frame, ColorFrame] | None:
+        """Frame of the running transition into ``to_key``; ends it when over or the target changed."""
+        transition = self.active
+        if transition is None:
+            return None
+        if transition.to_key == to_key:
+            frame = transition.frame_at(now)
+            if frame is not None:
+                return frame
+        self._finish_active()
+        return None
+
+    def _finish_active(self) -> None:
+        transition = self.active
+        if transition is None:
+            return
+        self._history.append(transition.cost())
+        self.active = None
+
+    def get_stats(self) -> dict:
+        active = self.active
+        return {
+            "started": self.started,
+            "active": None if active is None else active.cost(),
+            "recent": list(self._history),
+        }
@@ -0,0 +1,214 @@
+"""NumPy backend for the animation presets.
+
+Each preset is evaluated as array expressions over coordinate grids that are
+built once, producing a lit mask plus a ``uint8`` RGB buffer for the whole
+frame. NumPy is optional: ``HAS_NUMPY`` is False when it is not installed and
+``AnimationsModule`` keeps using its pure-Python renderers.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+from app.services.colors import palette_lut, scaled_palette
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency, pure-Python presets are used instead
+    np = None
+
+HAS_NUMPY = np is not None
+
+Color = tuple[int, int, int]
+MIRROR_MODES = {"none", "horizontal", "vertical", "quad"}
+
+
+@lru_cache(maxsize=64)
+def _palette_lut_array(colors: tuple[Color, ...], intensity: float):
+    return np.array(palette_lut(colors, intensity), dtype=np.float64)
+
+
+@lru_cache(maxsize=64)
+def _scaled_palette_array(colors: tuple[Color, ...], intensity: float):
+    return np.array(scaled_palette(colors, intensity), dtype=np.float64)
+
+
+def palette_lut_array(colors, intensity: float = 1.0):
+    """``palette_lut`` as a float array, built from the same cached table as the pure-Python presets."""
+    return _palette_lut_array(tuple(tuple(color) for color in colors), float(intensity))
+
+
+def scaled_palette_array(colors, intensity: float = 1.0):
+    return _scaled_palette_array(tuple(tuple(color) for color in colors), float(intensity))
+
+
+def snake_path(width: int, height: int) -> list[tuple[int, int]]:
+    """Serpentine path over the whole canvas, left-to-right on even rows."""
+    path: list[tuple[int, int]] = []
+    for y in range(height):
+        xs = range(width) if y % 2 == 0 else range(width - 1, -1, -1)
+        path.extend((x, y) for x in xs)
+    return path
+
+
+class VectorPresetRenderer:
+    """Renders animation presets as whole-frame array expressions."""
+
+    def __init__(self, width: int, height: int, sprite: list[str]):
+        if np is None:
+            raise RuntimeError("numpy is required for the vectorized animation backend")
+        self.width = width
+        self.height = height
+        ys, xs = np.mgrid[0:height, 0:width]
+        self.xs = xs.astype(np.float64)
+        self.ys = ys.astype(np.float64)
+        # Row-major source index per pixel; used to resolve overlapping mirror writes.
+        self.linear = (ys * width + xs).astype(np.int32)
+
+        path = snake_path(width, height)
+        self.snake_x = np.array([p[0] for p in path], dtype=np.intp)
+        self.snake_y = np.array([p[1] for p in path], dtype=np.intp)
+
+        self.sprite_mask = np.array([[ch == "1" for ch in row] for row in sprite], dtype=bool)
+        sprite_h, sprite_w = self.sprite_mask.shape
+        sy, sx = np.mgrid[0:sprite_h, 0:sprite_w]
+        self.sprite_color_idx = sx + sy
+
+    def render(self, preset: str, t: float, colors: list[Color], intensity: float):
+        renderer = getattr(self, f"_{preset}")
+        return renderer(float(t), palette_lut_array(colors, intensity), scaled_palette_array(colors, intensity))
+
+    def _blank(self):
+        return np.zeros((self.height, self.width), dtype=bool), np.zeros((self.height, self.width, 3), dtype=np.uint8)
+
+    @staticmethod
+    def _lookup(lut, value):
+        size = len(lut)
+        return lut[(np.mod(value, 1.0) * size).astype(np.intp) % size]
+
+    @staticmethod
+    def _scale(rgb, intensity):
+        factor = np.asarray(intensity, dtype=np.float64)
+        if factor.ndim:
+            factor = factor[..., None]
+        return np.clip(np.rint(rgb * factor), 0, 255).astype(np.uint8)
+
+    def _psychedelic_plasma(self, t, lut, palette):
+        xs, ys = self.xs, self.ys
+        v = np.sin(xs * 0.34 + t) + np.cos(ys * 0.95 - t * 1.2) + np.sin((xs + ys) * 0.22 + t * 0.7)
+        rgb = self._lookup(lut, (v + 3.0) / 6.0).astype(np.uint8)
+        return np.ones((self.height, self.width), dtype=bool), rgb
+
+    def _retro_rainbow_tunnel(self, t, lut, palette):
+        cx, cy = (self.width - 1) / 2, (self.height - 1) / 2
+        dx, dy = (self.xs - cx) / 4.0, self.ys - cy
+        dist = np.sqrt(dx * dx + dy * dy)
+        pulse = (np.sin(dist * 4.2 - t * 3.0) + 1) / 2
+        mask = pulse > 0.18
+        rgb = self._scale(self._lookup(lut, dist * 0.18 - t * 0.08), 0.45 + pulse * 0.55)
+        rgb[~mask] = 0
+        return mask, rgb
+
+    def _bit_invaders(self, t, lut, palette):
+        mask, rgb = self._blank()
+        offset = int(t * 6) % self.width - 7
+        bob = int(t * 0.75) % 2
+        sprite_rgb = palette[self.sprite_color_idx % len(palette)].astype(np.uint8)
+        sprite_h, sprite_w = self.sprite_mask.shape
+        for base_x in (offset - 16, offset, offset + 16):
+            x0, x1 = max(base_x, 0), min(base_x + sprite_w, self.width)
+            y0, y1 = max(bob, 0), min(bob + sprite_h, self.height)
+            if x0 >= x1 or y0 >= y1:
+                continue
+            src = self.sprite_mask[y0 - bob:y1 - bob, x0 - base_x:x1 - base_x]
+            target = rgb[y0:y1, x0:x1]
+            target[src] = sprite_rgb[y0 - bob:y1 - bob, x0 - base_x:x1 - base_x][src]
+            mask[y0:y1, x0:x1] |= src
+        return mask, rgb
+
+    def _neon_equalizer(self, t, lut, palette):
+        columns = np.arange(self.width, dtype=np.float64)
+        wave = np.sin(t * 2.5 + columns * 0.55) + np.sin(t * 1.3 + columns * 1.1) * 0.6
+        heights = np.clip(((wave + 1.6) / 3.2 * self.height).astype(np.intp), 1, self.height)
+        mask = self.ys >= (self.height - heights)[None, :]
+        level = (self.height - self.ys) / self.height
+        rgb = self._scale(self._lookup(lut, self.xs / self.width + level * 0.2), 0.45 + level)
+        rgb[~mask] = 0
+        return mask, rgb
+
+    def _matrix_rain(self, t, lut, palette):
+        columns = np.arange(self.width)
+        speeds = 1.5 + (columns % 5) * 0.28
+        heads = np.floor(np.mod(t * speeds + columns * 3, self.height + 8)).astype(np.intp) - 4
+        trail = heads[None, :] - self.ys.astype(np.intp)
+        mask = (trail >= 0) & (trail < 5)
+        trail = np.clip(trail, 0, 4)
+        color_idx = np.minimum(len(palette) - 1, 3 - np.minimum(trail, 3))
+        rgb = self._scale(palette[color_idx], 1 - trail * 0.16)
+        rgb[~mask] = 0
+        return mask, rgb
+
+    def _lava_lamp(self, t, lut, palette):
+        blobs = (
+            (8 + np.sin(t * 0.55) * 6, 3.5 + np.cos(t * 0.8) * 2.2),
+            (19 + np.cos(t * 0.42) * 7, 3.5 + np.sin(t * 0.65) * 2.0),
+            (27 + np.sin(t * 0.35 + 2) * 4, 3.5 + np.cos(t * 0.5) * 2.5),
+        )
+        energy = np.zeros_like(self.xs)
+        for bx, by in blobs:
+            energy += 6.0 / (((self.xs - bx) / 2.8) ** 2 + (self.ys - by) ** 2 + 1.0)
+        mask = energy > 0.55
+        rgb = self._scale(self._lookup(lut, energy * 0.13 + t * 0.03), np.minimum(1.0, energy / 2.2))
+        rgb[~mask] = 0
+        return mask, rgb
+
+    def _pixel_snake(self, t, lut, palette):
+        mask, rgb = self._blank()
+        length = len(self.snake_x)
+        trail = np.arange(28)
+        idx = (int(t * 10) % length - trail) % length
+        segment = self._scale(self._lookup(lut, trail / 28 + t * 10 / length), 1 - trail / 34)
+        mask[self.snake_y[idx], self.snake_x[idx]] = True
+        rgb[self.snake_y[idx], self.snake_x[idx]] = segment
+        return mask, rgb
+
+    def mirror(self, mask, rgb, mode: str):
+        return mirror(mask, rgb, mode, self.linear)
+
+
+def mirror(mask, rgb, mode: str, linear=None):
+    """Mirror lit pixels via array flips.
+
+    Matches the pure-Python ``mirror_frame``: when several sources land on the
+    same pixel, the one visited last in row-major order wins.
+    """
+    if mode not in MIRROR_MODES or mode == "none":
+        return mask, rgb
+    if linear is None:
+        linear = np.arange(mask.size, dtype=np.int32).reshape(mask.shape)
+    flips = [(slice(None), slice(None))]
+    if mode in {"horizontal", "quad"}:
+        flips.append((slice(None), slice(None, None, -1)))
+    if mode in {"vertical", "quad"}:
+        flips.append((slice(None, None, -1), slice(None)))
+    if mode == "quad":
+        flips.append((slice(None, None, -1), slice(None, None, -1)))
+
+    order = np.stack([np.where(mask[f], linear[f], -1) for f in flips])
+    winner = np.argmax(order, axis=0)
+    out_mask = order.max(axis=0) >= 0
+    candidates = np.stack([rgb[f] for f in flips])
+    out_rgb = np.take_along_axis(candidates, winner[None, ..., None], axis=0)[0]
+    out_rgb[~out_mask] = 0
+    return out_mask, out_rgb
+
+
+def to_frames(mask, rgb) -> tuple[list[list[int]], list[list[Color | None]]]:
+    """Convert a lit mask + RGB buffer to the nested-list frames used by the display loop."""
+    frame = mask.astype(np.uint8).tolist()
+    rows = rgb.tolist()
+    color_frame = [
+        [tuple(px) if lit else None for px, lit in zip(row, lit_row)]
+        for row, lit_row in zip(rows, frame)
+    ]
+    return frame, color_frame
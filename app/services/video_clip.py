@@ -0,0 +1,411 @@
+"""Streaming playback of raw video clips (Y4M, raw RGB) for the video module.
+
+A clip is never loaded as a whole. ``stream_frames`` reads one frame at a
+time into a reused buffer (large frames: only the rows the sampling index
+touches), fits it to 32x8 and yields a 768-byte RGB string (black = off).
+``ClipPlayer`` runs that generator on a worker thread a few frames ahead of
+the render loop and keeps them in a small ring; frames the clock has already
+passed are skipped by seeking instead of being decoded.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import deque
+from collections.abc import Generator
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.services.animated_bitmap import DARK_THRESHOLD, sampling_index
+
+VIDEO_SUFFIXES = {".y4m", ".rgb"}
+Y4M_MAGIC = b"YUV4MPEG2 "
+# Chroma plane subsampling as (x shift, y shift); None = luma only.
+Y4M_CHROMA = {
+    "420": (1, 1),
+    "420jpeg": (1, 1),
+    "420paldv": (1, 1),
+    "420mpeg2": (1, 1),
+    "422": (1, 0),
+    "444": (0, 0),
+    "mono": None,
+}
+MAX_SOURCE_PIXELS = 1920 * 1080
+RING_FRAMES = 8
+# Frames up to this size are read whole; larger ones only in the row spans the sampler needs.
+SPAN_READ_MIN_BYTES = 64 * 1024
+
+
+@dataclass(frozen=True)
+class ClipFormat:
+    kind: str
+    width: int
+    height: int
+    fps: float
+    frame_count: int
+    # Byte offset of the first frame and distance between frames (incl. the Y4M ``FRAME`` line).
+    data_offset: int
+    frame_stride: int
+    frame_header: int = 0
+    chroma: tuple[int, int] | None = None
+    full_range: bool = False
+
+    @property
+    def chroma_size(self) -> tuple[int, int]:
+        if self.chroma is None:
+            return 0, 0
+        shift_x, shift_y = self.chroma
+        return (self.width + (1 << shift_x) - 1) >> shift_x, (self.height + (1 << shift_y) - 1) >> shift_y
+
+
+@dataclass(frozen=True)
+class FrameSampler:
+    """Per output pixel the luma (or RGB) offsets and chroma offsets of its source samples."""
+
+    pixels: list[tuple[tuple[int, ...], tuple[int, ...]]]
+    # Byte ranges of the frame payload that have to be read; None = read everything.
+    spans: list[tuple[int, int]] | None
+
+
+def is_video_file(path: str | Path) -> bool:
+    return Path(path).suffix.lower() in VIDEO_SUFFIXES
+
+
+def _y4m_format(path: Path, file_size: int) -> ClipFormat:
+    with path.open("rb") as handle:
+        head = handle.read(512)
+    end = head.find(b"\n")
+    if not head.startswith(Y4M_MAGIC) or end < 0:
+        raise ValueError("not a Y4M file")
+    width = height = 0
+    fps = 25.0
+    colorspace = "420jpeg"
+    full_range = False
+    for token in head[len(Y4M_MAGIC):end].decode("ascii", "replace").split():
+        tag, value = token[0], token[1:]
+        if tag == "W":
+            width = int(value)
+        elif tag == "H":
+            height = int(value)
+        elif tag == "F":
+            numerator, _, denominator = value.partition(":")
+            fps = int(numerator) / max(1, int(denominator or 1))
+        elif tag == "C":
+            colorspace = value
+        elif token == "XCOLORRANGE=FULL":
+            full_range = True
+    if colorspace not in Y4M_CHROMA:
+        raise ValueError(f"Y4M colorspace {colorspace} not supported (8-bit 420/422/444/mono only)")
+    if not width or not height or width * height > MAX_SOURCE_PIXELS:
+        raise ValueError(f"video size {width}x{height} not supported")
+    if fps <= 0:
+        raise ValueError("Y4M frame rate must be positive")
+
+    data_offset = end + 1
+    frame_end = head.find(b"\n", data_offset)
+    if not head.startswith(b"FRAME", data_offset) or frame_end < 0:
+        raise ValueError("Y4M file contains no frames")
+    frame_header = frame_end + 1 - data_offset
+    clip = ClipFormat("y4m", width, height, fps, 0, data_offset, 0, frame_header, Y4M_CHROMA[colorspace], full_range)
+    chroma_width, chroma_height = clip.chroma_size
+    stride = frame_header + width * height + 2 * chroma_width * chroma_height
+    frame_count = (file_size - data_offset) // stride
+    if not frame_count:
+        raise ValueError("Y4M file contains no complete frame")
+    return ClipFormat("y4m", width, height, fps, frame_count, data_offset, stride, frame_header, clip.chroma, full_range)
+
+
+def probe_clip(path: Path, raw_width: int = 32, raw_height: int = 8, raw_fps: float = 25.0) -> ClipFormat:
+    """Frame geometry of ``path``; raw ``.rgb`` files take their size and rate from the arguments."""
+    file_size = path.stat().st_size
+    if path.suffix.lower() == ".y4m":
+        return _y4m_format(path, file_size)
+    if raw_width <= 0 or raw_height <= 0 or raw_width * raw_height > MAX_SOURCE_PIXELS:
+        raise ValueError(f"video size {raw_width}x{raw_height} not supported")
+    stride = raw_width * raw_height * 3
+    if file_size < stride:
+        raise ValueError("raw RGB file is smaller than one frame")
+    return ClipFormat("rgb", raw_width, raw_height, max(0.1, float(raw_fps)), file_size // stride, 0, stride)
+
+
+def _merge_spans(spans: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    merged: list[tuple[int, int]] = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def build_sampler(clip: ClipFormat, fit_mode: str, width: int = 32, height: int = 8) -> FrameSampler:
+    """Sampling index for one clip geometry and fit mode; built once, used for every frame."""
+    luma_plane = clip.width * clip.height
+    chroma_width, chroma_height = clip.chroma_size
+    pixels = []
+    rows: set[int] = set()
+    for offsets in sampling_index(clip.width, clip.height, fit_mode, width, height):
+        sources = [offset // 4 for offset in offsets]
+        rows.update(source // clip.width for source in sources)
+        if clip.kind == "rgb":
+            pixels.append((tuple(source * 3 for source in sources), ()))
+        elif clip.chroma is None:
+            pixels.append((tuple(sources), ()))
+        else:
+            shift_x, shift_y = clip.chroma
+            chroma = tuple(
+                luma_plane + ((source // clip.width) >> shift_y) * chroma_width + ((source % clip.width) >> shift_x)
+                for source in sources
+            )
+            pixels.append((tuple(sources), chroma))
+
+    payload = clip.frame_stride - clip.frame_header
+    if payload < SPAN_READ_MIN_BYTES:
+        return FrameSampler(pixels, None)
+    row_bytes = clip.width * 3 if clip.kind == "rgb" else clip.width
+    spans = [(row * row_bytes, (row + 1) * row_bytes) for row in rows]
+    if clip.chroma is not None:
+        plane_bytes = chroma_width * chroma_height
+        for row in {row >> clip.chroma[1] for row in rows}:
+            for plane in (luma_plane, luma_plane + plane_bytes):
+                spans.append((plane + row * chroma_width, plane + (row + 1) * chroma_width))
+    return FrameSampler(pixels, _merge_spans(spans))
+
+
+def _clamp_byte(value: float) -> int:
+    return 0 if value < 0 else 255 if value > 255 else int(value)
+
+
+def fit_frame(data: memoryview, clip: ClipFormat, sampler: FrameSampler) -> bytes:
+    """Average the samples per output pixel (YUV averaged before conversion); near-black stays off."""
+    out = bytearray(len(sampler.pixels) * 3)
+    v_plane = clip.chroma_size[0] * clip.chroma_size[1]
+    for pos, (lumas, chromas) in enumerate(sampler.pixels):
+        if not lumas:
+            continue
+        count = len(lumas)
+        if clip.kind == "rgb":
+            color = (
+                sum(data[offset] for offset in lumas) // count,
+                sum(data[offset + 1] for offset in lumas) // count,
+                sum(data[offset + 2] for offset in lumas) // count,
+            )
+        else:
+            luma = sum(data[offset] for offset in lumas) / count
+            if not clip.full_range:
+                luma = (luma - 16) * 1.164
+            if chromas:
+                u = sum(data[offset] for offset in chromas) / count - 128
+                v = sum(data[offset + v_plane] for offset in chromas) / count - 128
+                if not clip.full_range:
+                    u, v = u * 1.138, v * 1.138
+            else:
+                u = v = 0.0
+            # BT.601
+            color = (
+                _clamp_byte(luma + 1.402 * v),
+                _clamp_byte(luma - 0.344 * u - 0.714 * v),
+                _clamp_byte(luma + 1.772 * u),
+            )
+        if max(color) >= DARK_THRESHOLD:
+            out[pos * 3:pos * 3 + 3] = bytes(color)
+    return bytes(out)
+
+
+def stream_frames(path: Path, clip: ClipFormat, sampler: FrameSampler, start: int = 0) -> Generator[tuple[int, bytes], int | None, None]:
+    """Yield ``(frame_index, rgb)`` endlessly from ``start`` on, wrapping at the end of the clip.
+
+    ``send(index)`` jumps to ``index`` (one seek, nothing in between is read).
+    """
+    buffer = bytearray(clip.frame_stride)
+    view = memoryview(buffer)
+    payload = view[clip.frame_header:]
+    index = start % clip.frame_count
+    with path.open("rb") as handle:
+        while True:
+            frame_start = clip.data_offset + index * clip.frame_stride
+            if sampler.spans is None:
+                handle.seek(frame_start)
+                complete = handle.readinto(buffer) == clip.frame_stride
+            else:
+                handle.seek(frame_start)
+                complete = handle.readinto(view[:clip.frame_header]) == clip.frame_header
+                for span_start, span_end in sampler.spans:
+                    handle.seek(frame_start + clip.frame_header + span_start)
+                    complete = complete and handle.readinto(payload[span_start:span_end]) == span_end - span_start
+            if not complete:
+                raise ValueError("clip is truncated")
+            if clip.frame_header and not buffer.startswith(b"FRAME"):
+                raise ValueError("Y4M frame headers with parameters are not supported")
+            requested = yield index, fit_frame(payload, clip, sampler)
+            index = (index + 1 if requested is None else requested) % clip.frame_count
+
+
+class ClipPlayer:
+    """One clip at one fit mode, decoded ahead of the render loop.
+
+    Positions count clip frames since playback start. The render loop asks for
+    the position its frame clock points at; the worker keeps up to
+    ``ring_frames`` positions from there decoded and jumps over positions the
+    clock has already passed.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        clip: ClipFormat,
+        fit_mode: str,
+        loop: bool = True,
+        ring_frames: int = RING_FRAMES,
+        prefetch: bool = True,
+    ):
+        self._logger = logging.getLogger(__name__)
+        self.path = path
+        self.clip = clip
+        self.fit_mode = fit_mode
+        self.loop = loop
+        self.ring_frames = max(1, int(ring_frames))
+        self.sampler = build_sampler(clip, fit_mode)
+        self.error: str | None = None
+        self._frames: Generator[tuple[int, bytes], int | None, None] | None = None
+        self._expected: int | None = None
+        self._ring: deque[tuple[int, bytes]] = deque()
+        self._current: tuple[int, bytes] | None = None
+        self._wanted = 0
+        self._next = 0
+        self._cond = threading.Condition()
+        self._running = True
+        self._stats = {"decoded": 0, "skipped": 0, "dropped": 0, "late": 0}
+        self._thread: threading.Thread | None = None
+        if prefetch:
+            self._thread = threading.Thread(target=self._run, name="PixelDockVideo", daemon=True)
+            self._thread.start()
+
+    @property
+    def position(self) -> int | None:
+        """Position of the frame shown last."""
+        current = self._current
+        return current[0] if current is not None else None
+
+    def clip_index(self, position: int) -> int:
+        if self.loop:
+            return position % self.clip.frame_count
+        return min(position, self.clip.frame_count - 1)
+
+    def _needs_frame(self) -> bool:
+        if self._next >= self._wanted + self.ring_frames:
+            return False
+        return self.loop or self._next < self.clip.frame_count
+
+    def _decode(self, position: int) -> bytes:
+        clip_index = self.clip_index(position)
+        if self._frames is None:
+            self._frames = stream_frames(self.path, self.clip, self.sampler, clip_index)
+            _, rgb = next(self._frames)
+        elif clip_index == self._expected:
+            _, rgb = next(self._frames)
+        else:
+            _, rgb = self._frames.send(clip_index)
+        self._expected = (clip_index + 1) % self.clip.frame_count
+        return rgb
+
+    def _produce(self) -> bool:
+        """Decode the next needed position into the ring; False if nothing is needed."""
+        with self._cond:
+            if not self._needs_frame():
+                return False
+            if self._next < self._wanted:
+                # The clock ran ahead of the worker: never decode what can no longer be shown.
+                self._stats["skipped"] += self._wanted - self._next
+                self._next = self._wanted
+            position = self._next
+        rgb = self._decode(position)
+        with self._cond:
+            # A backwards jump while decoding resets ``_next``; the frame is then useless.
+            if position == self._next:
+                self._ring.append((position, rgb))
+                self._next = position + 1
+                self._stats["decoded"] += 1
+            self._cond.notify_all()
+        return True
+
+    def _run(self) -> None:
+        try:
+            while True:
+                with self._cond:
+                    while self._running and not self._needs_frame():
+                        self._cond.wait()
+                    if not self._running:
+                        return
+                self._produce()
+        except (ValueError, OSError) as exc:
+            self._logger.warning("Video %s stopped: %s", self.path.name, exc)
+            self.error = str(exc)
+        finally:
+            self._close_stream()
+
+    def frame_at(self, position: int) -> bytes | None:
+        """Frame for ``position``; the newest older frame if it is not decoded yet, None before the first."""
+        if not self.loop:
+            # Without looping the clip stops on its last frame.
+            position = min(position, self.clip.frame_count - 1)
+        with self._cond:
+            if position < self._wanted:
+                # Clock jumped backwards (restart, replay): everything prefetched is for the wrong positions.
+                self._ring.clear()
+                self._next = position
+                self._current = None
+            self._wanted = position
+            self._cond.notify_all()
+        if self._thread is None and self.error is None:
+            self._decode_inline(position)
+        with self._cond:
+            while self._ring and self._ring[0][0] <= position:
+                entry = self._ring.popleft()
+                if entry[0] < position:
+                    # Decoded, but the clock passed it before it could be shown.
+                    self._stats["dropped"] += 1
+                self._current = entry
+            current = self._current
+            if current is None or current[0] != position:
+                self._stats["late"] += 1
+        return current[1] if current is not None else None
+
+    def _decode_inline(self, position: int) -> None:
+        with self._cond:
+            ready = (self._current is not None and self._current[0] == position) or any(
+                entry[0] == position for entry in self._ring
+            )
+        if ready:
+            return
+        try:
+            self._produce()
+        except (ValueError, OSError) as exc:
+            self.error = str(exc)
+            self._close_stream()
+
+    def _close_stream(self) -> None:
+        if self._frames is not None:
+            self._frames.close()
+            self._frames = None
+
+    def stop(self) -> None:
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        else:
+            self._close_stream()
+
+    def get_stats(self) -> dict:
+        with self._cond:
+            return {
+                **self._stats,
+                "ring": len(self._ring),
+                "ring_frames": self.ring_frames,
+                "position": self.position,
+                "prefetch": self._thread is not None,
+                "error": self.error,
+            }
@@ -0,0 +1,189 @@
+"""Split-screen zone layouts.
+
+A layout divides the canvas into non-overlapping rectangles. Every zone has
+its own playlist of module keys with durations and its own refresh cadence;
+the module settings come from the regular module configuration. Modules are
+rendered at the zone's size, a zone keeps its last render and is only
+re-rendered when its playlist switches module or its refresh interval
+elapsed, and only zones whose pixels changed are blitted into the display's
+base layer.
+
+The layout is persisted as JSON next to the mapping state. An empty layout
+means the classic full-screen playlist.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from app.services.timeline import PlaylistTimeline
+
+Color = tuple[int, int, int]
+Frame = list[list[int]]
+ColorFrame = list[list[Color | None]]
+
+MAX_ZONES = 4
+MAX_ZONE_MODULES = 8
+DEFAULT_REFRESH_MS = 200
+
+
+def normalize_layout(raw: object, known_keys: set[str], width: int = 32, height: int = 8) -> list[dict]:
+    """Validate a layout payload; raises ``ValueError`` with a readable reason."""
+    if not isinstance(raw, list):
+        raise ValueError("zones must be a list")
+    if len(raw) > MAX_ZONES:
+        raise ValueError(f"at most {MAX_ZONES} zones are supported")
+    zones = []
+    occupied: set[tuple[int, int]] = set()
+    for idx, entry in enumerate(raw):
+        if not isinstance(entry, dict):
+            raise ValueError(f"zone {idx} must be an object")
+        name = str(entry.get("name") or f"zone{idx + 1}").strip()[:24]
+        try:
+            x = int(entry.get("x", 0))
+            y = int(entry.get("y", 0))
+            zone_width = int(entry.get("width", width - x))
+            zone_height = int(entry.get("height", height - y))
+            refresh_ms = int(entry.get("refresh_ms", DEFAULT_REFRESH_MS))
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"zone {name}: geometry must be integers") from exc
+        if x < 0 or y < 0 or zone_width < 1 or zone_height < 1 or x + zone_width > width or y + zone_height > height:
+            raise ValueError(f"zone {name}: rectangle outside the {width}x{height} canvas")
+        cells = {(cx, cy) for cx in range(x, x + zone_width) for cy in range(y, y + zone_height)}
+        if cells & occupied:
+            raise ValueError(f"zone {name}: overlaps another zone")
+        occupied |= cells
+
+        modules = entry.get("modules")
+        if not isinstance(modules, list) or not modules:
+            raise ValueError(f"zone {name}: modules must be a non-empty list")
+        playlist = []
+        for module in modules[:MAX_ZONE_MODULES]:
+            if isinstance(module, str):
+                module = {"key": module}
+            key = str(module.get("key", "")).strip().lower() if isinstance(module, dict) else ""
+            if key not in known_keys:
+                raise ValueError(f"zone {name}: unknown module '{key}'")
+            try:
+                duration = max(1, min(300, int(module.get("duration_seconds", 10))))
+            except (TypeError, ValueError):
+                duration = 10
+            playlist.append({"key": key, "duration_seconds": duration})
+        zones.append({
+            "name": name,
+            "x": x,
+            "y": y,
+            "width": zone_width,
+            "height": zone_height,
+            "refresh_ms": max(20, min(60000, refresh_ms)),
+            "modules": playlist,
+        })
+    return zones
+
+
+@dataclass
+class Zone:
+    name: str
+    x: int
+    y: int
+    width: int
+    height: int
+    refresh_ms: int
+    modules: list[dict]
+    module_key: str | None = None
+    rendered_at: float | None = None
+    frame: Frame | None = None
+    color_frame: ColorFrame | None = None
+    renders: int = 0
+    skipped: int = 0
+    blits: int = 0
+    _timeline: PlaylistTimeline | None = field(default=None, repr=False)
+
+    def __post_init__(self):
+        self._timeline = PlaylistTimeline(self.modules)
+
+    def select(self, now: float) -> str:
+        return self._timeline.at(now).row["key"]
+
+    def is_due(self, module_key: str, now: float) -> bool:
+        if module_key != self.module_key or self.rendered_at is None:
+            return True
+        return (now - self.rendered_at) * 1000 >= self.refresh_ms
+
+    def update(self, module_key: str, now: float, frame: Frame, color_frame: ColorFrame) -> bool:
+        """Store a fresh render; returns whether its pixels differ from the previous one."""
+        self.module_key = module_key
+        self.rendered_at = now
+        self.renders += 1
+        if frame == self.frame and color_frame == self.color_frame:
+            return False
+        self.frame, self.color_frame = frame, color_frame
+        self.blits += 1
+        return True
+
+    def get_stats(self) -> dict:
+        return {
+            "name": self.name,
+            "rect": [self.x, self.y, self.width, self.height],
+            "refresh_ms": self.refresh_ms,
+            "module": self.module_key,
+            "renders": self.renders,
+            "skipped": self.skipped,
+            "blits": self.blits,
+        }
+
+
+class ZoneLayout:
+    def __init__(self, state_file: str | Path | None = None, width: int = 32, height: int = 8):
+        self._logger = logging.getLogger(__name__)
+        self._state_file = Path(state_file) if state_file else None
+        self.width = width
+        self.height = height
+        self.spec: list[dict] = []
+        self.zones: list[Zone] = []
+        self._load()
+
+    @property
+    def active(self) -> bool:
+        return bool(self.zones)
+
+    def set_layout(self, spec: list[dict], persist: bool = True) -> None:
+        """Replace the layout with an already normalized spec; zone render state starts fresh."""
+        self.spec = spec
+        self.zones = [Zone(**zone) for zone in spec]
+        if persist:
+            self._persist()
+
+    def reset(self) -> None:
+        """Forget rendered frames so every zone is rendered and blitted again."""
+        for zone in self.zones:
+            zone.module_key = None
+            zone.rendered_at = None
+            zone.frame = None
+            zone.color_frame = None
+
+    def _load(self) -> None:
+        if self._state_file is None or not self._state_file.exists():
+            return
+        try:
+            raw = json.loads(self._state_file.read_text(encoding="utf-8"))
+            spec = list(raw.get("zones") or [])
+            if any(zone["x"] + zone["width"] > self.width or zone["y"] + zone["height"] > self.height for zone in spec):
+                raise ValueError(f"saved layout does not fit the {self.width}x{self.height} canvas")
+            self.set_layout(spec, persist=False)
+        except Exception:
+            # A broken layout file must not keep the display from starting; fall back to full screen.
+            self._logger.exception("Ignoring unreadable display layout %s", self._state_file)
+            self.set_layout([], persist=False)
+
+    def _persist(self) -> None:
+        if self._state_file is None:
+            return
+        self._state_file.parent.mkdir(parents=True, exist_ok=True)
+        self._state_file.write_text(json.dumps({"zones": self.spec}, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    def get_stats(self) -> dict:
+        return {"active": self.active, "zones": [zone.get_stats() for zone in self.zones]}
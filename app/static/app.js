@@ -612,7 +612,22 @@ function formatApiErrorMessage(detail, status) {
 }
 
 function transitionControls(moduleId, settings) {
+  const effect = settings.transition_effect || 'slide';
+  const effects = [
+    ['slide', 'Slide vertikal'],
+    ['slide_left', 'Slide nach links'],
+    ['slide_right', 'Slide nach rechts'],
+    ['wipe', 'Wipe'],
+    ['crossfade', 'Crossfade'],
+    ['dissolve', 'Dissolve'],
+  ];
   return `
+    <div class="field">
+      <label for="set-trans-effect-${moduleId}">Transition Effekt</label>
+      <select id="set-trans-effect-${moduleId}">
+        ${effects.map(([value, label]) => `<option value="${value}" ${effect === value ? 'selected' : ''}>${label}</option>`).join('')}
+      </select>
+    </div>
     <div class="field">
       <label for="set-trans-dir-${moduleId}">Transition Richtung</label>
       <select id="set-trans-dir-${moduleId}">
@@ -775,6 +790,9 @@ function moduleSettingsHtml(module) {
         <div class="field">
           <label class="check-label"><input type="checkbox" id="set-btc-block-${module.id}" ${s.show_block_height === true ? 'checked' : ''}> Zweiter Screen: Blockhöhe</label>
         </div>
+        <div class="field">
+          <label class="check-label"><input type="checkbox" id="set-btc-icon-${module.id}" ${s.show_icon === true ? 'checked' : ''}> Icons statt „B“/„H“ (Sprite-Atlas)</label>
+        </div>
         <div class="field">
           <label for="set-btc-screen-sec-${module.id}">Screen-Wechsel (Sek.)</label>
           <input id="set-btc-screen-sec-${module.id}" type="number" min="1" max="60" value="${s.screen_seconds ?? 4}" />
@@ -830,6 +848,9 @@ function moduleSettingsHtml(module) {
           <label for="set-weather-screen-sec-${module.id}">Screen-Wechsel (Sek.)</label>
           <input id="set-weather-screen-sec-${module.id}" type="number" min="1" max="60" value="${s.screen_seconds ?? 4}" />
         </div>
+        <div class="field">
+          <label class="check-label"><input type="checkbox" id="set-weather-icons-${module.id}" ${s.show_icons === true ? 'checked' : ''}> Icons statt „Out“/„In“/„H“ (Sprite-Atlas)</label>
+        </div>
         ${transitionControls(module.id, s)}
       </div>
     `;
@@ -915,6 +936,10 @@ function moduleSettingsHtml(module) {
             <option value="matrix_rain" ${s.preset === 'matrix_rain' ? 'selected' : ''}>Matrix Rain</option>
             <option value="lava_lamp" ${s.preset === 'lava_lamp' ? 'selected' : ''}>Lava Lamp</option>
             <option value="pixel_snake" ${s.preset === 'pixel_snake' ? 'selected' : ''}>Pixel Snake</option>
+            <option value="fireworks" ${s.preset === 'fireworks' ? 'selected' : ''}>Fireworks</option>
+            <option value="snow" ${s.preset === 'snow' ? 'selected' : ''}>Snow</option>
+            <option value="sparks" ${s.preset === 'sparks' ? 'selected' : ''}>Sparks</option>
+            <option value="rain" ${s.preset === 'rain' ? 'selected' : ''}>Rain</option>
           </select>
           <small class="subtle">Wählt den Animationsstil für das 32x8 Display.</small>
         </div>
@@ -949,22 +974,120 @@ function moduleSettingsHtml(module) {
   }
 
 
+  if (module.key === 'expression') {
+    const palette = s.palette || 'neon';
+    const mirror = s.mirror_mode || 'none';
+    return `
+      <div class="settings-grid settings-grid-color">
+        <div class="field field-span-2">
+          <label for="set-expr-text-${module.id}">Ausdruck (x, y, t, cx, cy, r, a)</label>
+          <input id="set-expr-text-${module.id}" value="${s.expression || 'sin(x*0.3+t)+cos(y-t)'}" maxlength="240" />
+          <small class="subtle">Funktionen: sin, cos, tan, abs, sqrt, exp, log, floor, fract, tri, min, max, pow, hypot, atan2, clamp, mix.</small>
+        </div>
+        <div class="field">
+          <label for="set-expr-speed-${module.id}">Geschwindigkeit</label>
+          <input id="set-expr-speed-${module.id}" type="number" min="0.1" max="5" step="0.1" value="${s.speed ?? 1}" />
+        </div>
+        <div class="field">
+          <label for="set-expr-intensity-${module.id}">Intensität</label>
+          <input id="set-expr-intensity-${module.id}" type="number" min="0.1" max="1" step="0.05" value="${s.intensity ?? 0.8}" />
+        </div>
+        <div class="field">
+          <label for="set-expr-scale-${module.id}">Farbskala</label>
+          <input id="set-expr-scale-${module.id}" type="number" min="0.01" max="4" step="0.01" value="${s.color_scale ?? 0.25}" />
+          <small class="subtle">Wert × Farbskala läuft einmal pro 1.0 durch die Palette.</small>
+        </div>
+        <div class="field">
+          <label for="set-expr-palette-${module.id}">Palette</label>
+          <select id="set-expr-palette-${module.id}">
+            ${['neon', 'rainbow', 'fire', 'ocean', 'matrix'].map((name) => `<option value="${name}" ${palette === name ? 'selected' : ''}>${name}</option>`).join('')}
+          </select>
+        </div>
+        <div class="field">
+          <label for="set-expr-mirror-${module.id}">Spiegelmodus</label>
+          <select id="set-expr-mirror-${module.id}">
+            ${['none', 'horizontal', 'vertical', 'quad'].map((name) => `<option value="${name}" ${mirror === name ? 'selected' : ''}>${name}</option>`).join('')}
+          </select>
+        </div>
+        ${transitionControls(module.id, s)}
+      </div>
+    `;
+  }
+
+
+  if (module.key === 'automata') {
+    const rule = s.rule || 'life';
+    const palette = s.palette || 'neon';
+    return `
+      <div class="settings-grid settings-grid-color">
+        <div class="field">
+          <label for="set-ca-rule-${module.id}">Regel</label>
+          <select id="set-ca-rule-${module.id}">
+            <option value="life" ${rule === 'life' ? 'selected' : ''}>Game of Life</option>
+            <option value="brians_brain" ${rule === 'brians_brain' ? 'selected' : ''}>Brian's Brain</option>
+            <option value="wolfram" ${rule === 'wolfram' ? 'selected' : ''}>1D Wolfram-Regel</option>
+          </select>
+        </div>
+        <div class="field">
+          <label for="set-ca-wolfram-${module.id}">Wolfram-Regel (0-255)</label>
+          <input id="set-ca-wolfram-${module.id}" type="number" min="0" max="255" value="${s.wolfram_rule ?? 30}" />
+        </div>
+        <div class="field">
+          <label for="set-ca-width-${module.id}">Weltbreite</label>
+          <input id="set-ca-width-${module.id}" type="number" min="32" max="256" value="${s.world_width ?? 32}" />
+        </div>
+        <div class="field">
+          <label for="set-ca-height-${module.id}">Welthöhe</label>
+          <input id="set-ca-height-${module.id}" type="number" min="8" max="64" value="${s.world_height ?? 8}" />
+        </div>
+        <div class="field">
+          <label for="set-ca-density-${module.id}">Startdichte</label>
+          <input id="set-ca-density-${module.id}" type="number" min="0.05" max="0.8" step="0.05" value="${s.density ?? 0.3}" />
+        </div>
+        <div class="field">
+          <label for="set-ca-rate-${module.id}">Generationen / Sekunde</label>
+          <input id="set-ca-rate-${module.id}" type="number" min="1" max="30" value="${s.generations_per_second ?? 8}" />
+        </div>
+        <div class="field">
+          <label for="set-ca-pan-${module.id}">Schwenk (Spalten / Sekunde)</label>
+          <input id="set-ca-pan-${module.id}" type="number" min="-10" max="10" step="0.5" value="${s.pan_speed ?? 0}" />
+          <small class="subtle">Nur sinnvoll, wenn die Welt breiter als 32 ist.</small>
+        </div>
+        <div class="field">
+          <label for="set-ca-palette-${module.id}">Palette (nach Zellalter)</label>
+          <select id="set-ca-palette-${module.id}">
+            ${['neon', 'rainbow', 'fire', 'ocean', 'matrix'].map((name) => `<option value="${name}" ${palette === name ? 'selected' : ''}>${name}</option>`).join('')}
+          </select>
+        </div>
+        <div class="field">
+          <label for="set-ca-intensity-${module.id}">Intensität</label>
+          <input id="set-ca-intensity-${module.id}" type="number" min="0.1" max="1" step="0.05" value="${s.intensity ?? 0.8}" />
+        </div>
+        ${transitionControls(module.id, s)}
+      </div>
+    `;
+  }
+
+
   if (module.key === 'bitmap') {
     return `
       <div class="settings-grid settings-grid-color">
         <div class="field field-span-2">
-          <label for="set-bitmap-file-${module.id}">Bitmap-Datei (unter app/bitmaps, z. B. .txt/.pbm/.ppm)</label>
-          <input id="set-bitmap-file-${module.id}" value="${s.file || 'sample_gradient.ppm'}" placeholder="sample_arrow.txt" />
+          <label for="set-bitmap-file-${module.id}">Bitmap-Datei (unter app/bitmaps, z. B. .txt/.pbm/.ppm/.gif/.png)</label>
+          <input id="set-bitmap-file-${module.id}" list="bitmapLibraryFiles" value="${s.file || 'sample_gradient.ppm'}" placeholder="sample_arrow.txt" />
         </div>
         <div class="field">
           <label for="set-bitmap-dir-${module.id}">Scroll-Richtung</label>
           <select id="set-bitmap-dir-${module.id}">
-            <option value="top_to_bottom" ${s.scroll_direction !== 'bottom_to_top' ? 'selected' : ''}>unten → oben</option>
+            <option value="top_to_bottom" ${!['bottom_to_top', 'left_to_right', 'right_to_left', 'pan'].includes(s.scroll_direction) ? 'selected' : ''}>unten → oben</option>
             <option value="bottom_to_top" ${s.scroll_direction === 'bottom_to_top' ? 'selected' : ''}>oben → unten</option>
+            <option value="left_to_right" ${s.scroll_direction === 'left_to_right' ? 'selected' : ''}>rechts → links (Ticker)</option>
+            <option value="right_to_left" ${s.scroll_direction === 'right_to_left' ? 'selected' : ''}>links → rechts (Ticker)</option>
+            <option value="pan" ${s.scroll_direction === 'pan' ? 'selected' : ''}>Schwenken (2D)</option>
           </select>
         </div>
         <div class="field">
-          <label for="set-bitmap-speed-${module.id}">Scroll-Speed</label>
+          <label for="set-bitmap-speed-${module.id}">Scroll-Speed (Pixel/s)</label>
           <input id="set-bitmap-speed-${module.id}" type="number" min="0.25" max="20" step="0.25" value="${s.scroll_speed ?? 2}" />
         </div>
         <div class="field">
@@ -978,6 +1101,57 @@ function moduleSettingsHtml(module) {
             <option value="solid" ${s.color_mode === 'solid' ? 'selected' : ''}>Alles in Solid-Farbe</option>
           </select>
         </div>
+        <div class="field">
+          <label for="set-bitmap-fit-${module.id}">Einpassen (GIF/PNG)</label>
+          <select id="set-bitmap-fit-${module.id}">
+            <option value="contain" ${!['cover', 'stretch'].includes(s.fit_mode) ? 'selected' : ''}>Ganz zeigen</option>
+            <option value="cover" ${s.fit_mode === 'cover' ? 'selected' : ''}>Füllen (beschneiden)</option>
+            <option value="stretch" ${s.fit_mode === 'stretch' ? 'selected' : ''}>Strecken</option>
+          </select>
+        </div>
+        <div class="field">
+          <label for="set-bitmap-playback-${module.id}">Abspielgeschwindigkeit (GIF/PNG)</label>
+          <input id="set-bitmap-playback-${module.id}" type="number" min="0.25" max="4" step="0.25" value="${s.playback_speed ?? 1}" />
+        </div>
+        ${transitionControls(module.id, s)}
+      </div>
+    `;
+  }
+
+  if (module.key === 'video') {
+    return `
+      <div class="settings-grid settings-grid-color">
+        <div class="field field-span-2">
+          <label for="set-video-file-${module.id}">Video-Datei (unter app/videos, .y4m oder .rgb)</label>
+          <input id="set-video-file-${module.id}" value="${s.file || 'sample_waves.y4m'}" placeholder="sample_waves.y4m" />
+        </div>
+        <div class="field">
+          <label for="set-video-fit-${module.id}">Einpassen</label>
+          <select id="set-video-fit-${module.id}">
+            <option value="contain" ${s.fit_mode === 'contain' ? 'selected' : ''}>Ganz zeigen</option>
+            <option value="cover" ${!['contain', 'stretch'].includes(s.fit_mode) ? 'selected' : ''}>Füllen (beschneiden)</option>
+            <option value="stretch" ${s.fit_mode === 'stretch' ? 'selected' : ''}>Strecken</option>
+          </select>
+        </div>
+        <div class="field">
+          <label for="set-video-playback-${module.id}">Abspielgeschwindigkeit</label>
+          <input id="set-video-playback-${module.id}" type="number" min="0.25" max="4" step="0.25" value="${s.playback_speed ?? 1}" />
+        </div>
+        <div class="field">
+          <label>Wiedergabe</label>
+          <label class="check-label"><input type="checkbox" id="set-video-loop-${module.id}" ${s.loop !== false ? 'checked' : ''}> Endlosschleife</label>
+          <label class="check-label"><input type="checkbox" id="set-video-drop-${module.id}" ${s.drop_frames !== false ? 'checked' : ''}> Frames auslassen, um Schritt zu halten</label>
+        </div>
+        <div class="field">
+          <label for="set-video-raw-width-${module.id}">Raw-RGB Breite / Höhe</label>
+          <input id="set-video-raw-width-${module.id}" type="number" min="1" max="1920" value="${s.raw_width ?? 32}" />
+          <input id="set-video-raw-height-${module.id}" type="number" min="1" max="1080" value="${s.raw_height ?? 8}" />
+          <small class="subtle">Nur für .rgb-Dateien; Y4M bringt Größe und Framerate mit.</small>
+        </div>
+        <div class="field">
+          <label for="set-video-raw-fps-${module.id}">Raw-RGB Framerate</label>
+          <input id="set-video-raw-fps-${module.id}" type="number" min="1" max="60" step="0.5" value="${s.raw_fps ?? 25}" />
+        </div>
         ${transitionControls(module.id, s)}
       </div>
     `;
@@ -987,7 +1161,73 @@ function moduleSettingsHtml(module) {
   return '<p class="subtle">Keine Settings verfügbar.</p>';
 }
 
-function collectModuleSettings({ id: moduleId, key: moduleKey }) {
+function scheduleControls(moduleId, settings) {
+  const weekdays = Array.isArray(settings.schedule_weekdays) ? settings.schedule_weekdays : [];
+  const dayLabels = ['Mo', 'Di', 'Mi', 'Do', 'Fr', 'Sa', 'So'];
+  return `
+    <div class="field">
+      <label for="set-sched-start-${moduleId}">Zeitfenster von / bis (leer = ganztägig)</label>
+      <input id="set-sched-start-${moduleId}" type="time" value="${settings.schedule_start || ''}" />
+      <input id="set-sched-end-${moduleId}" type="time" value="${settings.schedule_end || ''}" />
+    </div>
+    <div class="field">
+      <label>Wochentage (keiner = alle)</label>
+      ${dayLabels.map((label, day) => `<label><input type="checkbox" id="set-sched-day-${day}-${moduleId}" ${weekdays.includes(day) ? 'checked' : ''} /> ${label}</label>`).join(' ')}
+    </div>
+    <div class="field">
+      <label for="set-sched-weight-${moduleId}">Gewicht (Einsätze pro Durchlauf)</label>
+      <input id="set-sched-weight-${moduleId}" type="number" min="1" max="10" value="${settings.weight ?? 1}" />
+    </div>
+    <div class="field">
+      <label for="set-sched-priority-${moduleId}">Priorität (höchste aktive verdrängt andere)</label>
+      <input id="set-sched-priority-${moduleId}" type="number" min="0" max="10" value="${settings.priority ?? 0}" />
+    </div>
+  `;
+}
+
+function collectSchedule(moduleId) {
+  return {
+    schedule_start: document.getElementById(`set-sched-start-${moduleId}`).value,
+    schedule_end: document.getElementById(`set-sched-end-${moduleId}`).value,
+    schedule_weekdays: [0, 1, 2, 3, 4, 5, 6].filter((day) => document.getElementById(`set-sched-day-${day}-${moduleId}`).checked),
+    weight: parseInt(document.getElementById(`set-sched-weight-${moduleId}`).value, 10) || 1,
+    priority: parseInt(document.getElementById(`set-sched-priority-${moduleId}`).value, 10) || 0,
+  };
+}
+
+function effectsControls(moduleId, settings) {
+  const effects = Array.isArray(settings.effects) ? settings.effects : [];
+  const value = effects.length ? JSON.stringify(effects, null, 2) : '';
+  return `
+    <div class="field">
+      <label for="set-effects-${moduleId}">Effekte (JSON-Liste)</label>
+      <textarea id="set-effects-${moduleId}" rows="3" placeholder='[{"type": "mirror", "mode": "horizontal"}, {"type": "fade", "amount": 0.6}]'>${value}</textarea>
+      <p class="subtle">mirror, recolor, invert, hue_shift, fade, scroll, gamma – werden in der angegebenen Reihenfolge angewendet.</p>
+    </div>
+  `;
+}
+
+function collectEffects(moduleId) {
+  const input = document.getElementById(`set-effects-${moduleId}`);
+  const raw = input ? input.value.trim() : '';
+  if (!raw) return [];
+  try {
+    const parsed = JSON.parse(raw);
+    if (Array.isArray(parsed)) return parsed;
+  } catch (err) {
+    // fall through to the error toast
+  }
+  toast('Effekte müssen eine JSON-Liste sein', true);
+  return null;
+}
+
+function collectModuleSettings(module) {
+  const effects = collectEffects(module.id);
+  if (effects === null) return null;
+  return { ...collectModuleFields(module), ...collectSchedule(module.id), effects };
+}
+
+function collectModuleFields({ id: moduleId, key: moduleKey }) {
   if (moduleKey === 'clock') {
     return {
       timezone: document.getElementById(`set-tz-${moduleId}`).value.trim() || 'Europe/Vienna',
@@ -1017,10 +1257,38 @@ function collectModuleSettings({ id: moduleId, key: moduleKey }) {
 
 
   const commonTransition = {
+    transition_effect: document.getElementById(`set-trans-effect-${moduleId}`).value,
     transition_direction: document.getElementById(`set-trans-dir-${moduleId}`).value,
     transition_ms: parseInt(document.getElementById(`set-trans-ms-${moduleId}`).value, 10) || 350,
   };
 
+  if (moduleKey === 'expression') {
+    return {
+      expression: document.getElementById(`set-expr-text-${moduleId}`).value.trim(),
+      speed: parseFloat(document.getElementById(`set-expr-speed-${moduleId}`).value) || 1,
+      intensity: parseFloat(document.getElementById(`set-expr-intensity-${moduleId}`).value) || 0.8,
+      color_scale: parseFloat(document.getElementById(`set-expr-scale-${moduleId}`).value) || 0.25,
+      palette: document.getElementById(`set-expr-palette-${moduleId}`).value,
+      mirror_mode: document.getElementById(`set-expr-mirror-${moduleId}`).value,
+      ...commonTransition,
+    };
+  }
+
+  if (moduleKey === 'automata') {
+    return {
+      rule: document.getElementById(`set-ca-rule-${moduleId}`).value,
+      wolfram_rule: parseInt(document.getElementById(`set-ca-wolfram-${moduleId}`).value, 10) || 30,
+      world_width: parseInt(document.getElementById(`set-ca-width-${moduleId}`).value, 10) || 32,
+      world_height: parseInt(document.getElementById(`set-ca-height-${moduleId}`).value, 10) || 8,
+      density: parseFloat(document.getElementById(`set-ca-density-${moduleId}`).value) || 0.3,
+      generations_per_second: parseFloat(document.getElementById(`set-ca-rate-${moduleId}`).value) || 8,
+      pan_speed: parseFloat(document.getElementById(`set-ca-pan-${moduleId}`).value) || 0,
+      palette: document.getElementById(`set-ca-palette-${moduleId}`).value,
+      intensity: parseFloat(document.getElementById(`set-ca-intensity-${moduleId}`).value) || 0.8,
+      ...commonTransition,
+    };
+  }
+
   if (moduleKey === 'btc') {
     return {
       font_size: document.getElementById(`set-font-${moduleId}`).value,
@@ -1033,6 +1301,7 @@ function collectModuleSettings({ id: moduleId, key: moduleKey }) {
       color_flat: document.getElementById(`set-flat-${moduleId}`).value,
       color_fallback: document.getElementById(`set-fallback-${moduleId}`).value,
       show_block_height: document.getElementById(`set-btc-block-${moduleId}`).checked,
+      show_icon: document.getElementById(`set-btc-icon-${moduleId}`).checked,
       screen_seconds: parseInt(document.getElementById(`set-btc-screen-sec-${moduleId}`).value, 10) || 4,
       ...commonTransition,
     };
@@ -1050,6 +1319,7 @@ function collectModuleSettings({ id: moduleId, key: moduleKey }) {
       color_humidity: document.getElementById(`set-humidity-${moduleId}`).value,
       color_fallback: document.getElementById(`set-fallback-${moduleId}`).value,
       screen_seconds: parseInt(document.getElementById(`set-weather-screen-sec-${moduleId}`).value, 10) || 4,
+      show_icons: document.getElementById(`set-weather-icons-${moduleId}`).checked,
       ...commonTransition,
     };
   }
@@ -1077,6 +1347,22 @@ function collectModuleSettings({ id: moduleId, key: moduleKey }) {
       scroll_speed: parseFloat(document.getElementById(`set-bitmap-speed-${moduleId}`).value) || 2,
       color: document.getElementById(`set-bitmap-color-${moduleId}`).value,
       color_mode: document.getElementById(`set-bitmap-color-mode-${moduleId}`).value,
+      fit_mode: document.getElementById(`set-bitmap-fit-${moduleId}`).value,
+      playback_speed: parseFloat(document.getElementById(`set-bitmap-playback-${moduleId}`).value) || 1,
+      ...commonTransition,
+    };
+  }
+
+  if (moduleKey === 'video') {
+    return {
+      file: document.getElementById(`set-video-file-${moduleId}`).value.trim(),
+      fit_mode: document.getElementById(`set-video-fit-${moduleId}`).value,
+      playback_speed: parseFloat(document.getElementById(`set-video-playback-${moduleId}`).value) || 1,
+      loop: document.getElementById(`set-video-loop-${moduleId}`).checked,
+      drop_frames: document.getElementById(`set-video-drop-${moduleId}`).checked,
+      raw_width: parseInt(document.getElementById(`set-video-raw-width-${moduleId}`).value, 10) || 32,
+      raw_height: parseInt(document.getElementById(`set-video-raw-height-${moduleId}`).value, 10) || 8,
+      raw_fps: parseFloat(document.getElementById(`set-video-raw-fps-${moduleId}`).value) || 25,
       ...commonTransition,
     };
   }
@@ -1200,10 +1486,34 @@ async function loadModules() {
       <div class="module-settings" id="settings-${m.id}">
         <label class="settings-title">Moduleinstellungen</label>
         ${moduleSettingsHtml(m)}
+        ${scheduleControls(m.id, m.settings || {})}
+        ${effectsControls(m.id, m.settings || {})}
       </div>
     `;
     container.appendChild(row);
   });
+  if (modules.some((m) => m.key === 'bitmap')) loadBitmapLibrary();
+}
+
+async function loadBitmapLibrary() {
+  const data = await apiRequest('/api/bitmaps');
+  if (!data) return;
+  let list = document.getElementById('bitmapLibraryFiles');
+  if (!list) {
+    list = document.createElement('datalist');
+    list.id = 'bitmapLibraryFiles';
+    document.body.appendChild(list);
+  }
+  list.innerHTML = '';
+  data.bitmaps.forEach((entry) => {
+    const option = document.createElement('option');
+    const size = entry.width ? `${entry.width}x${entry.height}` : 'nicht geladen';
+    const frames = entry.frames ? ` / ${entry.frames} Frames` : '';
+    const memory = entry.loaded ? ` / ${Math.round((entry.memory_bytes + entry.mapped_bytes) / 1024)} KB` : '';
+    option.value = entry.name;
+    option.label = `${size}${frames}${memory}${entry.in_use ? ' / aktiv' : ''}`;
+    list.appendChild(option);
+  });
 }
 
 function toggleModuleCard(moduleId) {
@@ -1218,12 +1528,17 @@ function toggleModuleCard(moduleId) {
 
 async function toggleModuleEnabled(moduleId, moduleKey) {
   const enabled = document.getElementById(`en-${moduleId}`).checked;
+  const settings = collectModuleSettings({ id: moduleId, key: moduleKey });
+  if (!settings) {
+    document.getElementById(`en-${moduleId}`).checked = !enabled;
+    return;
+  }
 
   const payload = {
     enabled,
     duration_seconds: parseInt(document.getElementById(`dur-${moduleId}`).value, 10) || 8,
     sort_order: parseInt(document.getElementById(`ord-${moduleId}`).value, 10) || 0,
-    settings: collectModuleSettings({ id: moduleId, key: moduleKey }),
+    settings,
   };
 
   const res = await apiRequest(
@@ -1262,11 +1577,14 @@ async function saveModule(moduleId, moduleKey) {
     return;
   }
 
+  const settings = collectModuleSettings({ id: moduleId, key: moduleKey });
+  if (!settings) return;
+
   const payload = {
     enabled: document.getElementById(`en-${moduleId}`).checked,
     duration_seconds: duration,
     sort_order: sortOrder,
-    settings: collectModuleSettings({ id: moduleId, key: moduleKey }),
+    settings,
   };
 
   const res = await apiRequest(
@@ -1396,6 +1714,10 @@ async function refreshStatus() {
   setTextIfExists('statusDebug', display.debug_active
     ? `${display.debug_pattern} bis ${formatTs(display.debug_until)}`
     : 'inaktiv');
+  const bitmaps = display.bitmaps || null;
+  setTextIfExists('statusBitmapCache', bitmaps
+    ? `${bitmaps.bitmaps} Dateien + ${bitmaps.variants} Varianten / ${Math.round((bitmaps.bitmap_bytes + bitmaps.variant_bytes + bitmaps.animation_bytes) / 1024)} KB / Treffer ${bitmaps.variant_hit_rate === null ? '-' : `${Math.round(bitmaps.variant_hit_rate * 100)}%`}`
+    : '-');
   setTextIfExists('statusBtc', shortError(sourceData.btc_error)
     ? `Fehler (${shortError(sourceData.btc_error)})`
     : formatTs(sourceData.btc_updated_at));
@@ -1567,14 +1889,20 @@ async function runLedSerialPing() {
   await refreshLedDebug({ silent: true });
 }
 
-function initPreviewGrid() {
+function initPreviewGrid(width = 32, height = 8) {
   const container = document.getElementById('previewGrid');
-  if (!container || container.childElementCount > 0) return;
-  for (let y = 0; y < 8; y += 1) {
-    for (let x = 0; x < 32; x += 1) {
+  if (!container) return;
+  // Rebuild only when the canvas size changes (panel grids: 32x16, 32x32, 64x64, ...).
+  if (container.dataset.size === `${width}x${height}` && container.childElementCount > 0) return;
+  container.innerHTML = '';
+  container.dataset.size = `${width}x${height}`;
+  container.style.gridTemplateColumns = `repeat(${width}, minmax(${width > 32 ? 6 : 10}px, 14px))`;
+  for (let y = 0; y < height; y += 1) {
+    for (let x = 0; x < width; x += 1) {
       const px = document.createElement('div');
       px.className = 'preview-pixel';
       if (x > 0 && x % 8 === 0) px.classList.add('panel-divider-left');
+      if (y > 0 && y % 8 === 0) px.classList.add('panel-divider-top');
       px.id = `preview-${x}-${y}`;
       container.appendChild(px);
     }
@@ -1583,8 +1911,11 @@ function initPreviewGrid() {
 
 function renderPreviewFrame(frame, colors = null) {
   if (!Array.isArray(frame)) return;
-  for (let y = 0; y < 8; y += 1) {
-    for (let x = 0; x < 32; x += 1) {
+  const height = frame.length;
+  const width = height > 0 && Array.isArray(frame[0]) ? frame[0].length : 0;
+  initPreviewGrid(width, height);
+  for (let y = 0; y < height; y += 1) {
+    for (let x = 0; x < width; x += 1) {
       const el = document.getElementById(`preview-${x}-${y}`);
       if (!el) continue;
       const on = !!(frame[y] && frame[y][x]);
@@ -2211,8 +2542,9 @@ function renderMappingAssistResult(result) {
   }
   const first = solutions[0];
   el.innerText = [
-    `Lösungen gefunden: ${result.solutions_found}`,
-    `Beste Lösung: offset=${first.first_pixel_offset}, data_starts_right=${first.data_starts_right}, serpentine=${first.serpentine}`,
+    `Lösungen gefunden: ${result.solutions_found} (passende Mappings insgesamt: ${result.solution_count ?? result.solutions_found}, ${result.search_ms ?? '-'} ms)`,
+    ...(result.solution_count > 1 ? ['Mehrdeutig: weitere LEDs aus anderen Panels/Zeilen erfassen. Sortiert nach wenigsten Änderungen am aktuellen Mapping.'] : []),
+    `Beste Lösung: offset=${first.first_pixel_offset}, data_starts_right=${first.data_starts_right}, serpentine=${first.serpentine}, Änderungen=${first.changes ?? '-'}`,
     `panel_order=${(first.panel_order || []).join(',')}`,
     `panel_rotations=${(first.panel_rotations || []).join(',')}`,
     'Klicke "Live-Mapping anwenden", um diese Werte zu übernehmen.',
@@ -0,0 +1,37 @@
+"""Per-preset frame-time benchmark for the animation renderers (pure Python vs. NumPy)."""
+
+import argparse
+import time
+
+from app.modules.animations import PALETTES, PRESETS, AnimationsModule, _palette
+
+
+def bench(module: AnimationsModule, preset: str, backend: str, frames: int, palette: str, mirror_mode: str) -> float:
+    colors = _palette(palette)
+    cache: dict = {}
+    started = time.perf_counter()
+    for idx in range(frames):
+        module.render_frame(preset, idx / 20.0, colors, 0.8, mirror_mode, cache, backend=backend)
+    return (time.perf_counter() - started) * 1000 / frames
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--palette", default="neon", choices=sorted(PALETTES))
+    parser.add_argument("--mirror-mode", default="none", choices=["none", "horizontal", "vertical", "quad"])
+    args = parser.parse_args()
+
+    module = AnimationsModule()
+    backends = ["python"] + (["numpy"] if module.backend == "numpy" else [])
+    if len(backends) == 1:
+        print("numpy not installed, benchmarking the pure-Python backend only")
+
+    print(f"{'preset':<24}" + "".join(f"{name + ' ms/frame':>20}" for name in backends))
+    for preset in sorted(PRESETS):
+        timings = [bench(module, preset, backend, args.frames, args.palette, args.mirror_mode) for backend in backends]
+        print(f"{preset:<24}" + "".join(f"{value:>20.3f}" for value in timings))
+
+
+if __name__ == "__main__":
+    main()
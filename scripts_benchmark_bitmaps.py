@@ -0,0 +1,115 @@
+"""Load time and memory of the bitmap parsers on a tall scrolling image (default 32x10000).
+
+Every format is measured in a fresh interpreter so the RSS numbers do not
+include the previous run.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from app.services.bitmap_loader import BitmapLoader
+
+FORMATS = {"P1": "p1.pbm", "P3": "p3.ppm", "P4": "p4.pbm", "P6": "p6.ppm"}
+
+
+def _color(x: int, y: int) -> tuple[int, int, int]:
+    return (x * 8) % 256, y % 256, (x + y) * 3 % 256
+
+
+def write_sample(fmt: str, width: int, height: int, path: Path) -> None:
+    if fmt == "P1":
+        rows = (" ".join("1" if (x ^ y) & 1 else "0" for x in range(width)) for y in range(height))
+        path.write_text(f"P1\n{width} {height}\n" + "\n".join(rows) + "\n", encoding="ascii")
+    elif fmt == "P3":
+        rows = (" ".join("%d %d %d" % _color(x, y) for x in range(width)) for y in range(height))
+        path.write_text(f"P3\n{width} {height}\n255\n" + "\n".join(rows) + "\n", encoding="ascii")
+    elif fmt == "P4":
+        row_bytes = (width + 7) // 8
+        raster = b"".join((b"\x55" if y & 1 else b"\xaa") * row_bytes for y in range(height))
+        path.write_bytes(f"P4\n{width} {height}\n".encode() + raster)
+    else:
+        raster = bytes(channel for y in range(height) for x in range(width) for channel in _color(x, y))
+        path.write_bytes(f"P6\n{width} {height}\n255\n".encode() + raster)
+
+
+def _rss_kb() -> int:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def measure(path: Path, frames: int, direction: str) -> dict:
+    loader = BitmapLoader(path.parent, background_decode=False)
+    rss_before = _rss_kb()
+    started = time.perf_counter()
+    bitmap = loader.load(path.name)
+    load_ms = (time.perf_counter() - started) * 1000
+    rss_after = _rss_kb()
+
+    started = time.perf_counter()
+    for idx in range(frames):
+        loader.render_window(bitmap, direction, 20.0, now=idx / 20)
+    render_ms = (time.perf_counter() - started) * 1000 / frames
+
+    del bitmap
+    loader = BitmapLoader(path.parent, background_decode=False)
+    tracemalloc.start()
+    loader.load(path.name)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "load_ms": load_ms,
+        "rss_kb": rss_after - rss_before,
+        "peak_kb": peak // 1024,
+        "buffer_kb": loader.get_stats()["bitmap_bytes"] // 1024,
+        "mapped_kb": loader.get_stats()["mapped_bytes"] // 1024,
+        "render_ms": render_ms,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--width", type=int, default=32)
+    parser.add_argument("--height", type=int, default=10000)
+    parser.add_argument("--frames", type=int, default=200, help="scroll frames rendered per format")
+    parser.add_argument("--formats", nargs="+", default=list(FORMATS), choices=list(FORMATS))
+    parser.add_argument("--direction", default="top_to_bottom", help="scroll_direction used for the render timing")
+    parser.add_argument("--measure", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(Path(args.measure), args.frames, args.direction)))
+        return
+
+    print(f"{args.width}x{args.height}, {args.frames} frames {args.direction}")
+    print(f"{'format':<8}{'file KB':>10}{'load ms':>10}{'RSS +KB':>10}{'peak KB':>10}{'buffer KB':>11}{'mapped KB':>11}{'ms/frame':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in args.formats:
+            path = Path(tmp) / FORMATS[fmt]
+            write_sample(fmt, args.width, args.height, path)
+            output = subprocess.run(
+                [sys.executable, __file__, "--measure", str(path), "--frames", str(args.frames), "--direction", args.direction],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            result = json.loads(output)
+            print(
+                f"{fmt:<8}{path.stat().st_size // 1024:>10}{result['load_ms']:>10.1f}{result['rss_kb']:>10}"
+                f"{result['peak_kb']:>10}{result['buffer_kb']:>11}{result['mapped_kb']:>11}{result['render_ms']:>10.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Per-frame cost of render + LED mapping + LED write for panel grids up to 64x64 (4096 LEDs).
+
+Every layout runs the real ``DisplayService`` (offline clock) with a real
+``LEDMapper`` and an ``LEDDriver`` recording to a temporary file, once with a
+module playlist and once with the densest debug pattern (every second column
+lit). The report shows ms per frame against the frame budget (1000 / fps)
+and µs per LED; a linear pipeline keeps µs/LED flat while the LED count grows
+16-fold.
+"""
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from app.config import Settings
+from app.services import offline_render
+from app.services.led_driver import LEDDriver
+from app.services.led_mapper import LEDMapper
+
+# name -> (canvas width, canvas height, panel rows); 8x8 panels, snake chain through the grid.
+LAYOUTS = {
+    "1x4": (32, 8, 1),
+    "2x4": (32, 16, 2),
+    "4x4": (32, 32, 4),
+    "8x8": (64, 64, 8),
+}
+PLAYLIST = [
+    {"key": "clock", "duration_seconds": 5, "settings": {}},
+    {"key": "automata", "duration_seconds": 5, "settings": {}},
+]
+
+
+def layout_settings(name: str, workdir: Path) -> Settings:
+    width, height, grid_rows = LAYOUTS[name]
+    panels = (width // 8) * (height // 8)
+    return Settings(
+        panel_columns=width,
+        panel_rows=height,
+        chain_panels=panels,
+        panel_grid_rows=grid_rows,
+        led_count=width * height,
+        led_transport="record",
+        led_record_file=str(workdir / f"{name}.pdrec"),
+        mapping_state_file=str(workdir / f"{name}-mapping.json"),
+    )
+
+
+async def bench(name: str, scenario: str, frames: int, fps: int, workdir: Path, config_path: Path) -> dict:
+    settings = layout_settings(name, workdir)
+    started = time.perf_counter()
+    mapper = LEDMapper(settings)
+    table_ms = (time.perf_counter() - started) * 1000
+    driver = LEDDriver(settings)
+
+    start = time.time()
+    engine = await offline_render.open_config(config_path=config_path)
+    render_ms = write_ms = 0.0
+    try:
+        service = offline_render.build_service(
+            engine,
+            offline_render.load_snapshot(None, start),
+            start,
+            fps=fps,
+            bitmap_dir=Path(__file__).parent / "app" / "bitmaps",
+            width=mapper.width,
+            height=mapper.height,
+        )
+        service.mapper = mapper
+        service.led_driver = driver
+        if scenario == "stripes":
+            service.set_debug_pattern("stripes", seconds=frames, interval_ms=1000 // fps)
+        for index in range(frames):
+            t = start + index / fps
+            service.clock.set(t)
+            frame_started = time.perf_counter()
+            await service.render_at(t)
+            rendered = time.perf_counter()
+            service.write_leds(service.compositor.planes, service.compositor.color_frame)
+            render_ms += (rendered - frame_started) * 1000
+            write_ms += (time.perf_counter() - rendered) * 1000
+    finally:
+        service.frame_cache.shutdown()
+        service.bitmap_loader.shutdown()
+        driver.strip.close()
+        await engine.dispose()
+
+    leds = mapper.width * mapper.height
+    total_ms = (render_ms + write_ms) / frames
+    return {
+        "layout": name,
+        "scenario": scenario,
+        "canvas": f"{mapper.width}x{mapper.height}",
+        "leds": leds,
+        "table_ms": table_ms,
+        "render_ms": render_ms / frames,
+        "write_ms": write_ms / frames,
+        "total_ms": total_ms,
+        "us_per_led": total_ms * 1000 / leds,
+    }
+
+
+async def run(args: argparse.Namespace) -> list[dict]:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        config_path = workdir / "modules.json"
+        config_path.write_text(json.dumps(PLAYLIST), encoding="utf-8")
+        for scenario in args.scenarios:
+            for name in args.layouts:
+                results.append(await bench(name, scenario, args.frames, args.fps, workdir, config_path))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--fps", type=int, default=20, help="frame rate that sets the budget")
+    parser.add_argument("--layouts", nargs="+", default=list(LAYOUTS), choices=list(LAYOUTS))
+    parser.add_argument("--scenarios", nargs="+", default=["playlist", "stripes"], choices=["playlist", "stripes"])
+    args = parser.parse_args()
+
+    budget_ms = 1000 / args.fps
+    results = asyncio.run(run(args))
+    print(
+        f"{'scenario':<10}{'layout':<8}{'canvas':>8}{'LEDs':>7}{'table ms':>10}"
+        f"{'render ms':>11}{'map+write ms':>14}{'total ms':>10}{'us/LED':>9}{'vs 1x4':>8}  budget {budget_ms:.1f} ms"
+    )
+    for scenario in args.scenarios:
+        rows = [row for row in results if row["scenario"] == scenario]
+        base = rows[0]
+        for row in rows:
+            growth = row["total_ms"] / base["total_ms"] if base["total_ms"] else 0.0
+            verdict = "ok" if row["total_ms"] <= budget_ms else "over budget"
+            print(
+                f"{scenario:<10}{row['layout']:<8}{row['canvas']:>8}{row['leds']:>7}{row['table_ms']:>10.2f}"
+                f"{row['render_ms']:>11.3f}{row['write_ms']:>14.3f}{row['total_ms']:>10.3f}"
+                f"{row['us_per_led']:>9.3f}{growth:>7.1f}x  {verdict}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Render a time range of the playlist offline (no web server, no LEDs), as fast as possible.
+
+Examples:
+    python scripts_render_offline.py --db pixeldock32.db --start 2026-10-19T07:00 --duration 600 --format report
+    python scripts_render_offline.py --config modules.json --data status.json --duration 30 --format gif --output preview.gif
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from app.config import get_settings
+from app.services import offline_render
+
+
+def parse_start(value: str | None, tz: str) -> float:
+    """Unix timestamp or ISO date/time (local time of ``TZ`` unless it has an offset); default now."""
+    if not value:
+        return datetime.now(ZoneInfo(tz)).timestamp()
+    try:
+        return float(value)
+    except ValueError:
+        parsed = datetime.fromisoformat(value)
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=ZoneInfo(tz))
+        return parsed.timestamp()
+
+
+async def run(args: argparse.Namespace) -> None:
+    settings = get_settings()
+    start = parse_start(args.start, settings.tz)
+    snapshot = offline_render.load_snapshot(args.data, start)
+    engine = await offline_render.open_config(db_path=args.db, config_path=args.config)
+    try:
+        service = offline_render.build_service(
+            engine,
+            snapshot,
+            start,
+            fps=args.fps or settings.render_fps,
+            bitmap_dir=Path(__file__).parent / "app" / "bitmaps",
+            layout_file=args.layout,
+            width=settings.panel_columns,
+            height=settings.panel_rows,
+        )
+        result = await offline_render.render_range(service, start, args.duration, keep_frames=args.format != "report")
+    finally:
+        await engine.dispose()
+
+    output = Path(args.output) if args.output else None
+    if args.format == "raw":
+        size = offline_render.write_raw(result, output or Path("frames.rgb"))
+        print(f"{len(result.frames)} frames ({settings.panel_columns}x{settings.panel_rows} RGB, {size} bytes) -> {output or 'frames.rgb'}", file=sys.stderr)
+    elif args.format == "gif":
+        size = offline_render.write_gif(result, output or Path("preview.gif"), scale=args.scale)
+        print(f"GIF ({size} bytes) -> {output or 'preview.gif'}", file=sys.stderr)
+    else:
+        offline_render.write_report(result, output)
+    print(json.dumps(result.summary(), indent=2), file=sys.stderr)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--db", help="SQLite database file (default: the one from DATABASE_URL)")
+    source.add_argument("--config", help="JSON export of GET /api/modules")
+    parser.add_argument("--data", help="external data snapshot (JSON of GET /api/debug/status or its live_data); default synthetic")
+    parser.add_argument("--layout", help="zone layout file (DISPLAY_LAYOUT_FILE format)")
+    parser.add_argument("--start", help="start time: unix timestamp or ISO date/time (default: now)")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds to render")
+    parser.add_argument("--fps", type=int, default=0, help="frame rate (default: RENDER_FPS)")
+    parser.add_argument("--format", choices=["raw", "gif", "report"], default="report")
+    parser.add_argument("--output", help="output file (report: default stdout)")
+    parser.add_argument("--scale", type=int, default=8, help="GIF pixel size")
+    args = parser.parse_args()
+
+    if not args.db and not args.config:
+        database_url = get_settings().database_url
+        if not database_url.startswith("sqlite"):
+            parser.error("--db or --config is required for non-SQLite DATABASE_URL")
+        args.db = database_url.split("///", 1)[-1]
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
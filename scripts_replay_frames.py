@@ -0,0 +1,60 @@
+"""Inspect, compare or replay a binary frame recording (LED_TRANSPORT=record).
+
+Examples:
+    python scripts_replay_frames.py frames.pdrec --info
+    python scripts_replay_frames.py frames.pdrec --speed 0          # as fast as the transport allows
+    python scripts_replay_frames.py new.pdrec --diff old.pdrec
+"""
+
+import argparse
+import json
+from collections import Counter
+from pathlib import Path
+
+from app.config import get_settings
+from app.services.frame_recorder import FrameRecording, replay
+from app.services.led_driver import LEDDriver
+
+
+def info(recording: FrameRecording) -> dict:
+    if not len(recording):
+        return {"frames": 0, "led_count": recording.led_count}
+    first, last = recording[0], recording[-1]
+    return {
+        "frames": len(recording),
+        "led_count": recording.led_count,
+        "seq": [first.seq, last.seq],
+        "duration_seconds": round(last.timestamp - first.timestamp, 3),
+        "sources": dict(Counter(frame.source for frame in recording).most_common()),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("recording")
+    parser.add_argument("--info", action="store_true", help="print frame count, duration and sources")
+    parser.add_argument("--diff", metavar="OTHER", help="list frames whose pixels differ from another recording")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed (1 = recorded timing, 0 = as fast as possible)")
+    parser.add_argument("--start", type=int, default=0, help="first frame position")
+    parser.add_argument("--stop", type=int, default=None, help="stop before this frame position")
+    args = parser.parse_args()
+
+    with FrameRecording(args.recording) as recording:
+        if args.info:
+            print(json.dumps(info(recording), indent=2))
+            return
+        if args.diff:
+            with FrameRecording(args.diff) as other:
+                changed = recording.diff(other)
+            print(json.dumps({"frames": [len(recording), len(other)], "differing": len(changed), "first": changed[:20]}, indent=2))
+            return
+
+        settings = get_settings()
+        if settings.led_transport == "record" and Path(settings.led_record_file).resolve() == Path(args.recording).resolve():
+            parser.error("LED_RECORD_FILE points at the recording being replayed")
+        driver = LEDDriver(settings)
+        print(json.dumps({"transport": driver.transport, **replay(recording, driver, args.speed, args.start, args.stop)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Quick regression check for zone output reaching the composed frame."""
+
+import asyncio
+
+from app.modules.btc import BTCModule
+from app.modules.clock import ClockModule
+from app.services.compositor import Compositor
+from app.services.rendering import measure_text_width
+
+
+async def zone_text(module, settings: dict, cache: dict, width: int) -> str:
+    payload = await module.render(settings, {**cache, "zone_size": (width, 8)})
+    assert measure_text_width(payload.text, payload.font_size, payload.char_spacing) <= width, (
+        f"{module.key} text {payload.text!r} does not fit a {width}-column zone"
+    )
+    return payload.text
+
+
+def main() -> None:
+    # Zones blit into the base layer in place; a color-only change (fixed mask,
+    # e.g. a price turning from green to red) must still count as new output,
+    # otherwise LEDs, recorder and preview keep the old colors.
+    compositor = Compositor(32, 8)
+    compositor.add_layer("base", 0)
+    mask = [[1] * 12 for _ in range(8)]
+    for color in [(0, 255, 0), (255, 0, 0), (0, 255, 0)]:
+        before = compositor.version
+        compositor.blit("base", 20, 0, mask, [[color] * 12 for _ in range(8)])
+        _, color_frame = compositor.compose()
+        assert compositor.version > before, f"color change to {color} did not bump the output version"
+        assert color_frame[0][20] == color, f"composed frame still shows {color_frame[0][20]}"
+
+    # Same pixels again: no new output.
+    before = compositor.version
+    compositor.blit("base", 20, 0, mask, [[(0, 255, 0)] * 12 for _ in range(8)])
+    compositor.compose()
+    assert compositor.version == before, "unchanged zone bumped the output version"
+
+    # Modules lay out inside their zone instead of being cut off ("17:0", "B5").
+    cache = {"now": 1_700_000_000.0, "btc_eur": 67_400.0, "btc_trend": "up"}
+    assert len(asyncio.run(zone_text(ClockModule(), {"timezone": "UTC"}, cache, 20))) == 5
+    assert asyncio.run(zone_text(BTCModule(), {}, cache, 12)) == "67k"
+    assert asyncio.run(zone_text(BTCModule(), {}, cache, 24)) == "B67k"
+
+    print("zone-regression-ok")
+
+
+if __name__ == "__main__":
+    main()